@@ -5,6 +5,7 @@ from account.models import CustomUser
 from conf.models import *
 
 from conf.baseModelAdmin import register_all_models, BaseModelAdmin, BaseTabularInLine
+from filestore.thumbnails import thumbnail_tag
 
 
 @admin.register(CustomUser)
@@ -19,6 +20,7 @@ class CustomUserAdmin(UserAdmin):
         "department_head",
         "is_active",
         "is_staff",
+        "signature_thumbnail",
         "date_joined",
     )
     list_filter = (
@@ -36,6 +38,10 @@ class CustomUserAdmin(UserAdmin):
     ordering = ("email",)
     readonly_fields = ("date_joined",)
 
+    @admin.display(description="Signature")
+    def signature_thumbnail(self, obj):
+        return thumbnail_tag(obj.signature)
+
     # Group fields logically in the admin form
     fieldsets = (
         (None, {"fields": ("email", "full_name", "phone_number", "password")}),
@@ -0,0 +1,62 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+PERMISSION_VERSION_KEY = "account:perm_version"
+USER_PERMISSION_VERSION_KEY = "account:perm_version:user:%s"
+
+
+def _version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version
+        cache.add(key, time.time_ns())
+        version = cache.get(key)
+    return version
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns())
+
+
+def invalidate_all_permissions():
+    """Invalidate every cached permission set, e.g. after a group's permissions change."""
+    _bump(PERMISSION_VERSION_KEY)
+
+
+def invalidate_user_permissions(user_ids):
+    """Invalidate the cached permission sets of the given users only."""
+    for user_id in user_ids:
+        _bump(USER_PERMISSION_VERSION_KEY % user_id)
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend that keeps each user's permission set in the shared cache.
+
+    Entries are keyed by a global and a per-user version number which are
+    bumped by the signals in account.signals, so every worker process sees
+    group and permission changes on its next lookup.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            key = "account:perms:%s:%s:%s:%d" % (
+                user_obj.pk,
+                _version(PERMISSION_VERSION_KEY),
+                _version(USER_PERMISSION_VERSION_KEY % user_obj.pk),
+                user_obj.is_superuser,
+            )
+            perms = cache.get(key)
+            if perms is None:
+                perms = super().get_all_permissions(user_obj)
+                cache.set(key, perms, getattr(settings, "PERMISSION_CACHE_TIMEOUT", 3600))
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
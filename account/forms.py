@@ -1,6 +1,4 @@
 # forms.py
-import random
-import string
 import traceback
 
 from django import forms
@@ -8,11 +6,12 @@ from django.conf import settings
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Submit, Layout, Row, Column
 from django.contrib.auth.models import Group
-from django.core.mail import send_mail
 from django.db import transaction
 from django.forms import inlineformset_factory
 
 from account.models import CustomUser
+from account.provisioning import set_password_url
+from notification.outbox import enqueue_email
 from system.models.organisation import Organisation
 
 class RegistrationForm(forms.Form):
@@ -58,31 +57,27 @@ class RegistrationForm(forms.Form):
         return data
 
 
-    def send_password_email(self, password):
-        subject = 'Your Password for Registration'
-        message = f'Hello {self.cleaned_data["full_name"]}, your password is: {password}'
+    def send_password_email(self, user, base_url):
+        subject = 'Set your CYBUS password'
+        message = (f'Hello {self.cleaned_data["full_name"]}, set your password at {set_password_url(user, base_url)} '
+                   f'to finish signing up.')
         from_email = settings.DEFAULT_FROM_EMAIL
         recipient_list = [self.cleaned_data["email"]]
-        # Sample data for the SMS
-        sms_data = {
-            'recipient': self.cleaned_data["phone_number"],  # Phone number of the recipient
-            'message': message,  # Content of the message
-        }
-        # Call the send_sms function with the sample data
-        # sent_message = send_sms(sms_data)
-        send_mail(subject, message, from_email, recipient_list, fail_silently=False)
-
-    def register_user(self):
-        # Generate a random password
-        password = ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(12))
+        # Queued in the registration transaction and delivered by run_outbox_worker. Only
+        # a set-password link is sent, the outbox keeps message bodies
+        # enqueue_sms(self.cleaned_data["phone_number"], message)
+        enqueue_email(subject, message, recipient_list, from_email=from_email)
+
+    def register_user(self, base_url):
         try:
             with transaction.atomic():
                 # Create a new user with the provided information
                 user = CustomUser.objects.create(email=self.cleaned_data['email'], phone_number=self.cleaned_data.get('phone_number'), is_active=True, is_staff=True, account_type=CustomUser.AccountType.CUSTOMER)
                 user.full_name= f"{self.cleaned_data['full_name']} "
-                user.set_password(password)
+                # The user chooses a password through the emailed link
+                user.set_unusable_password()
 
-                self.send_password_email(password)
+                self.send_password_email(user, base_url)
 
                 # Create or get the "SMS users" group
                 sms_users_group, created = Group.objects.get_or_create(name=CustomUser.AccountType.CUSTOMER)
@@ -95,4 +90,13 @@ class RegistrationForm(forms.Form):
             print("Exception occurred:")
             traceback.print_exc()  # <-- This prints full traceback to the console
             # raise forms.ValidationError(e)
-            return None
\ No newline at end of file
+            return None
+
+class ProvisionUsersForm(forms.Form):
+    csv_file = forms.FileField(label='Users CSV')
+    send_links = forms.BooleanField(label='Email the new users a link to set their password', required=False, initial=True)
+    is_staff = forms.BooleanField(label='Allow the new users to sign in to the admin site', required=False)
+
+
+class OTPVerificationForm(forms.Form):
+    code = forms.CharField(label='Verification Code', max_length=10)
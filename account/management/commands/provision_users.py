@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from account.provisioning import provision_users, read_users_csv
+from system.models.organisation import Organisation
+
+
+class Command(BaseCommand):
+    help = "Create users for an organisation from a CSV file (email, full_name, phone_number, role, groups, password)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("organisation_id", type=int)
+        parser.add_argument("csv_file")
+        parser.add_argument("--processes", type=int, default=None, help="Password hashing processes (default: CPU count)")
+        parser.add_argument("--base-url", help="Site address, e.g. https://qms.example.com; each user is emailed a "
+                                               "link to set their password. Without it no emails are queued")
+        parser.add_argument("--staff", action="store_true", help="Allow the new users to sign in to the admin site")
+
+    def handle(self, *args, **options):
+        try:
+            organisation = Organisation.objects.get(pk=options["organisation_id"])
+        except Organisation.DoesNotExist:
+            raise CommandError(f"Organisation {options['organisation_id']} does not exist")
+
+        with open(options["csv_file"], newline="", encoding="utf-8-sig") as fileobj:
+            rows = read_users_csv(fileobj)
+
+        result = provision_users(
+            organisation, rows, base_url=options["base_url"], processes=options["processes"], is_staff=options["staff"],
+        )
+        for line, error in result.errors:
+            self.stderr.write(f"Line {line}: {error}")
+        self.stdout.write(self.style.SUCCESS(str(result)))
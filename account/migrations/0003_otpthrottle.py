@@ -0,0 +1,28 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_alter_customuser_signature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OTPThrottle',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='otp_throttle', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('issues', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('window_ends', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'OTP Throttle',
+                'verbose_name_plural': 'OTP Throttles',
+            },
+        ),
+    ]
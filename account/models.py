@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from filestore.paths import ShardedUploadTo
 
 
 class CustomUserManager(BaseUserManager):
@@ -40,7 +41,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     use_two_factor_authentication = models.BooleanField(default=True, verbose_name="Two Factor Authentication")
     account_type = models.CharField(max_length=32, choices=AccountType.choices, default=AccountType.CUSTOMER , verbose_name="Account Type")
-    signature = models.ImageField(upload_to="signatures/", null=True, blank=True)
+    signature = models.ImageField(upload_to=ShardedUploadTo("signatures"), null=True, blank=True)
     role = models.CharField(max_length=35, choices=Role.choices, null=True, blank=True)
     department_head = models.BooleanField(default=False, verbose_name="Department Head")
     date_joined = models.DateTimeField(auto_now_add=True)
@@ -52,3 +53,22 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return f"{self.full_name} - {self.email}"
+
+
+class OTPThrottle(models.Model):
+    """
+    Codes sent and wrong codes tried by a user in the current OTP issue
+    window. Kept in the database so the counts are updated under a row lock
+    and the window keeps its own end time.
+    """
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="otp_throttle")
+    issues = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    window_ends = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "OTP Throttle"
+        verbose_name_plural = "OTP Throttles"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.issues} codes, {self.attempts} attempts"
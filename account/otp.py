@@ -0,0 +1,96 @@
+import hashlib
+import hmac
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from account.models import OTPThrottle
+from notification.outbox import enqueue_email, enqueue_sms
+
+OTP_CODE_KEY = "account:otp:code:%s"
+
+
+def _digest(user, code):
+    # Codes are stored as keyed digests so a cache dump does not reveal them
+    return hmac.new(settings.SECRET_KEY.encode(), f"{user.pk}:{code}".encode(), hashlib.sha256).hexdigest()
+
+
+def has_pending_otp(user):
+    return cache.get(OTP_CODE_KEY % user.pk) is not None
+
+
+def is_locked_out(user):
+    """True once OTP_MAX_ATTEMPTS wrong codes were tried in the current OTP_ISSUE_WINDOW."""
+    return OTPThrottle.objects.filter(
+        user=user, attempts__gte=settings.OTP_MAX_ATTEMPTS, window_ends__gt=timezone.now(),
+    ).exists()
+
+
+def _count(user, field):
+    """
+    Add one to a throttle counter and return it. The row is locked so
+    concurrent requests each count, and an ended window starts over.
+    Call inside a transaction.
+    """
+    now = timezone.now()
+    throttle, created = OTPThrottle.objects.select_for_update().get_or_create(
+        user=user, defaults={"window_ends": now + timedelta(seconds=settings.OTP_ISSUE_WINDOW)},
+    )
+    if not created and throttle.window_ends <= now:
+        throttle.issues, throttle.attempts = 0, 0
+        throttle.window_ends = now + timedelta(seconds=settings.OTP_ISSUE_WINDOW)
+        throttle.save()
+    OTPThrottle.objects.filter(pk=throttle.pk).update(**{field: F(field) + 1})
+    throttle.refresh_from_db(fields=[field])
+    return throttle
+
+
+def issue_otp(user):
+    """
+    Create a new one-time code for the user and queue it for delivery.
+
+    Returns False without sending anything when the user is locked out or
+    has had OTP_MAX_ISSUES codes in the current OTP_ISSUE_WINDOW. Wrong
+    attempts are counted across the window, so asking for a new code does
+    not reset them.
+    """
+    code = f"{secrets.randbelow(10 ** settings.OTP_DIGITS):0{settings.OTP_DIGITS}d}"
+    message = f"Your CYBUS verification code is {code}. It expires in {settings.OTP_TIMEOUT // 60} minutes."
+    with transaction.atomic():
+        throttle = _count(user, "issues")
+        if throttle.attempts >= settings.OTP_MAX_ATTEMPTS or throttle.issues > settings.OTP_MAX_ISSUES:
+            return False
+        cache.set(OTP_CODE_KEY % user.pk, _digest(user, code), settings.OTP_TIMEOUT)
+        enqueue_email("Your verification code", message, [user.email])
+        if user.phone_number:
+            enqueue_sms(user.phone_number, message)
+    return True
+
+
+def verify_otp(user, code):
+    """
+    Check a submitted code in constant time. The code is discarded after a
+    successful check or once OTP_MAX_ATTEMPTS wrong codes have been tried;
+    the attempt count outlives it until the issue window ends.
+    """
+    code_key = OTP_CODE_KEY % user.pk
+    expected = cache.get(code_key)
+    if expected is None:
+        return False
+    with transaction.atomic():
+        attempts = _count(user, "attempts").attempts
+    if attempts > settings.OTP_MAX_ATTEMPTS:
+        cache.delete(code_key)
+        return False
+    if hmac.compare_digest(expected, _digest(user, (code or "").strip())):
+        cache.delete(code_key)
+        OTPThrottle.objects.filter(user=user).delete()
+        return True
+    if attempts == settings.OTP_MAX_ATTEMPTS:
+        cache.delete(code_key)
+    return False
@@ -0,0 +1,195 @@
+import csv
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.contrib.auth.tokens import default_token_generator
+from django.core.validators import validate_email
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from account.models import CustomUser
+from notification.outbox import enqueue_emails
+from system.models.organisation import OrganisationUser
+
+CSV_COLUMNS = ["email", "full_name", "phone_number", "role", "groups", "password"]
+
+
+def set_password_url(user, base_url):
+    """
+    Absolute link to the password reset confirmation page for `user`. The
+    token stops working once the password is set or PASSWORD_RESET_TIMEOUT
+    passes, so emails never need to carry a password.
+    """
+    path = reverse("password_reset_confirm", kwargs={
+        "uidb64": urlsafe_base64_encode(force_bytes(user.pk)),
+        "token": default_token_generator.make_token(user),
+    })
+    return base_url.rstrip("/") + path
+
+
+def _hash_password(password):
+    # Module level so it can be pickled into the worker processes
+    return make_password(password)
+
+
+def hash_passwords(passwords, processes=None):
+    """
+    Hash passwords in parallel; each one is a full PBKDF2 run. None gives
+    an unusable password and costs nothing.
+    """
+    passwords = list(passwords)
+    if None in passwords:
+        given = iter(hash_passwords([password for password in passwords if password is not None], processes))
+        return [make_password(None) if password is None else next(given) for password in passwords]
+    if len(passwords) < 2 or processes == 1:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_hash_password, passwords, chunksize=8))
+
+
+def read_users_csv(fileobj):
+    """
+    Read rows from a CSV with an `email` and `full_name` header and optional
+    `phone_number`, `role`, `groups` (separated by ';') and `password` columns.
+    """
+    if isinstance(fileobj.read(0), bytes):
+        fileobj = io.TextIOWrapper(fileobj, encoding="utf-8-sig")
+    return [
+        {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+        for row in csv.DictReader(fileobj)
+    ]
+
+
+class ProvisionResult:
+    def __init__(self):
+        self.created = []
+        self.errors = []
+
+    def __str__(self):
+        return f"{len(self.created)} user(s) created, {len(self.errors)} row(s) skipped"
+
+
+def _clean_rows(rows, result):
+    roles = set(CustomUser.Role.values)
+    # Only existing groups can be joined, a CSV must not be able to create them
+    groups = set(Group.objects.values_list("name", flat=True))
+    seen_emails, seen_phones, valid = set(), set(), []
+    for line, row in enumerate(rows, start=2):
+        email = CustomUser.objects.normalize_email(row.get("email", ""))
+        phone_number = row.get("phone_number") or None
+        role = (row.get("role") or "").upper() or None
+        try:
+            validate_email(email)
+        except ValidationError:
+            result.errors.append((line, f"Invalid email '{email}'"))
+            continue
+        if not row.get("full_name"):
+            result.errors.append((line, "Missing full_name"))
+            continue
+        if role and role not in roles:
+            result.errors.append((line, f"Unknown role '{role}'"))
+            continue
+        group_names = [name.strip() for name in row.get("groups", "").split(";") if name.strip()]
+        unknown = sorted(set(group_names) - groups)
+        if unknown:
+            result.errors.append((line, f"Unknown group(s) {', '.join(repr(name) for name in unknown)}"))
+            continue
+        if email.lower() in seen_emails or (phone_number and phone_number in seen_phones):
+            result.errors.append((line, "Duplicate email or phone number in file"))
+            continue
+        seen_emails.add(email.lower())
+        if phone_number:
+            seen_phones.add(phone_number)
+        valid.append((line, {
+            "email": email,
+            "full_name": row["full_name"],
+            "phone_number": phone_number,
+            "role": role,
+            "groups": group_names,
+            "password": row.get("password") or None,
+        }))
+
+    # One query for all rows instead of the per-row uniqueness checks RegistrationForm does
+    emails = [row["email"] for _, row in valid]
+    phones = [row["phone_number"] for _, row in valid if row["phone_number"]]
+    taken_emails, taken_phones = set(), set()
+    for email, phone_number in CustomUser.objects.filter(
+            Q(email__in=emails) | Q(phone_number__in=phones)).values_list("email", "phone_number"):
+        taken_emails.add(email.lower())
+        taken_phones.add(phone_number)
+
+    clean = []
+    for line, row in valid:
+        if row["email"].lower() in taken_emails or (row["phone_number"] and row["phone_number"] in taken_phones):
+            result.errors.append((line, f"User {row['email']} already exists"))
+        else:
+            clean.append(row)
+    return clean
+
+
+def provision_users(organisation, rows, base_url=None, processes=None, is_staff=False, batch_size=500):
+    """
+    Create users for an organisation from parsed CSV rows.
+
+    Passwords given in the file are hashed across a process pool before the
+    transaction is opened; users without one get an unusable password.
+    Users, organisation links and memberships of existing groups are then
+    written with bulk_create. When `base_url` is given each user is emailed
+    a link to set their password through the outbox.
+    """
+    result = ProvisionResult()
+    rows = _clean_rows(rows, result)
+    if not rows:
+        return result
+
+    hashes = hash_passwords([row["password"] for row in rows], processes=processes)
+
+    with transaction.atomic():
+        CustomUser.objects.bulk_create([
+            CustomUser(
+                email=row["email"],
+                full_name=row["full_name"],
+                phone_number=row["phone_number"],
+                role=row["role"],
+                password=password_hash,
+                is_active=True,
+                is_staff=is_staff,
+                account_type=CustomUser.AccountType.CUSTOMER,
+            )
+            for row, password_hash in zip(rows, hashes)
+        ], batch_size=batch_size)
+        # MySQL does not return primary keys from bulk_create
+        users = {user.email: user for user in CustomUser.objects.filter(email__in=[row["email"] for row in rows])}
+
+        OrganisationUser.objects.bulk_create(
+            [OrganisationUser(organisation=organisation, user=user) for user in users.values()],
+            batch_size=batch_size,
+        )
+
+        groups = {group.name: group for group in Group.objects.filter(name__in={name for row in rows for name in row["groups"]})}
+        Membership = CustomUser.groups.through
+        Membership.objects.bulk_create([
+            Membership(customuser_id=users[row["email"]].pk, group_id=groups[name].pk)
+            for row in rows for name in row["groups"]
+        ], batch_size=batch_size)
+
+        if base_url:
+            enqueue_emails([
+                (
+                    'Your CYBUS account',
+                    f'Hello {row["full_name"]}, an account has been created for you at {organisation.name}. '
+                    f'Login with {row["email"]} after setting your password at '
+                    f'{set_password_url(users[row["email"]], base_url)}',
+                    row["email"],
+                )
+                for row in rows
+            ])
+
+    result.created = [users[row["email"]] for row in rows]
+    return result
@@ -0,0 +1,98 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+_local_buckets = {}
+_local_lock = threading.Lock()
+_local_stats = Counter()
+
+
+def parse_rate(rate):
+    """'10/m' -> (capacity 10, refill 10 tokens per 60 seconds)."""
+    count, period = rate.split("/")
+    return int(count), int(count) / PERIODS[period[-1]] / int(period[:-1] or 1)
+
+
+def _refill(state, capacity, refill_rate, now):
+    tokens, updated = state if state else (capacity, now)
+    return min(capacity, tokens + (now - updated) * refill_rate)
+
+
+def take_token(key, rate):
+    """
+    Take one token from the bucket `key`. Returns 0 when allowed, otherwise
+    the number of seconds until a token is available.
+
+    Buckets live in the shared cache when RATELIMIT_USE_CACHE is set so all
+    worker processes share a limit; the read-modify-write is not atomic,
+    which at worst lets a few extra requests through under contention.
+    """
+    capacity, refill_rate = parse_rate(rate)
+    now = time.time()
+    timeout = int(capacity / refill_rate) + 1
+
+    if settings.RATELIMIT_USE_CACHE:
+        tokens = _refill(cache.get(key), capacity, refill_rate, now)
+        allowed = tokens >= 1
+        cache.set(key, (tokens - 1 if allowed else tokens, now), timeout)
+    else:
+        with _local_lock:
+            tokens = _refill(_local_buckets.get(key), capacity, refill_rate, now)
+            allowed = tokens >= 1
+            _local_buckets[key] = (tokens - 1 if allowed else tokens, now)
+    return 0 if allowed else (1 - tokens) / refill_rate
+
+
+def record(scope, outcome):
+    _local_stats[(scope, outcome)] += 1
+    if settings.RATELIMIT_USE_CACHE:
+        key = f"ratelimit:stats:{scope}:{outcome}"
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+
+def get_stats():
+    """Allowed/rejected counters per scope, for this process and across workers."""
+    scopes = [rule["scope"] for rule in settings.RATELIMIT_RULES]
+    shared = {}
+    if settings.RATELIMIT_USE_CACHE:
+        shared = cache.get_many([f"ratelimit:stats:{scope}:{outcome}" for scope in scopes for outcome in ("allowed", "rejected")])
+    return {
+        scope: {
+            "allowed": shared.get(f"ratelimit:stats:{scope}:allowed", _local_stats[(scope, "allowed")]),
+            "rejected": shared.get(f"ratelimit:stats:{scope}:rejected", _local_stats[(scope, "rejected")]),
+            "process_allowed": _local_stats[(scope, "allowed")],
+            "process_rejected": _local_stats[(scope, "rejected")],
+        }
+        for scope in scopes
+    }
+
+
+def client_ip(request):
+    header = getattr(settings, "RATELIMIT_IP_HEADER", None)
+    if header and request.META.get(header):
+        return request.META[header].split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def check_request(request, rule):
+    """Return seconds to wait if the request exceeds the rule's IP or account bucket, else 0."""
+    keys = [("ip", client_ip(request), rule["ip_rate"])]
+    account = request.POST.get(rule.get("account_field", ""), "").strip().lower()
+    if account:
+        keys.append(("account", account, rule["account_rate"]))
+    wait = 0
+    for kind, value, rate in keys:
+        digest = hashlib.md5(value.encode()).hexdigest()
+        wait = max(wait, take_token(f"ratelimit:{rule['scope']}:{kind}:{digest}", rate))
+    record(rule["scope"], "rejected" if wait else "allowed")
+    return wait
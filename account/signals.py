@@ -0,0 +1,35 @@
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from account.backends import invalidate_all_permissions, invalidate_user_permissions
+from account.models import CustomUser
+
+M2M_ACTIONS = ("post_add", "post_remove", "post_clear")
+
+
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+@receiver(m2m_changed, sender=CustomUser.user_permissions.through)
+def user_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in M2M_ACTIONS:
+        return
+    if not reverse:
+        invalidate_user_permissions([instance.pk])
+    elif action == "post_clear" or not pk_set:
+        # group.user_set.clear() / permission.user_set.clear() do not report the users
+        invalidate_all_permissions()
+    else:
+        invalidate_user_permissions(pk_set)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, action, **kwargs):
+    if action in M2M_ACTIONS:
+        invalidate_all_permissions()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def permission_objects_changed(sender, **kwargs):
+    invalidate_all_permissions()
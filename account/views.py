@@ -8,13 +8,25 @@ from django.views import View
 from django.contrib import admin, messages
 from django.contrib.auth import login
 from django.contrib.auth.views import LoginView
+from django.views.generic.edit import FormView
+from django.http import JsonResponse, HttpResponseForbidden
 from django.views.generic import TemplateView, DetailView
 
 from system.models import Organisation
-from .forms import RegistrationForm
+from .forms import RegistrationForm, OTPVerificationForm
+from .otp import has_pending_otp, issue_otp, verify_otp
+from .ratelimit import get_stats
 
 logger = logging.getLogger(__name__)
 
+OTP_THROTTLED_MESSAGE = "Too many verification codes or attempts. Please wait a few minutes and try again."
+
+def home_url(user):
+    if user.is_superuser:
+        return reverse_lazy('admin:index')
+    return reverse_lazy('home')
+
+
 class CustomLoginView(LoginView):
     template_name = "admin/login.html"
 
@@ -22,16 +34,17 @@ class CustomLoginView(LoginView):
         # Call the parent class's form_valid method to perform standard login
         self.request.session['otp_verified'] = False
         response = super().form_valid(form)
+        if self.request.user.use_two_factor_authentication:
+            issue_otp(self.request.user)
         return response  # Redirect to the default success URL
 
     def get_success_url(self):
         # Define the custom success URL where you want to redirect the user
-        # return reverse_lazy('otp-verification')  # Replace 'custom_dashboard' with your desired URL name
         # if Subscription.objects.filter(organisation=self.request.user):
         #     pass
-        if self.request.user.is_superuser:
-            return reverse_lazy('admin:index')
-        return reverse_lazy('home')
+        if self.request.user.use_two_factor_authentication:
+            return reverse_lazy('otp-verification')
+        return home_url(self.request.user)
 
     def get_context_data(self, **kwargs):
         # Get the parent context data
@@ -43,6 +56,43 @@ class CustomLoginView(LoginView):
         return context
 
 
+class OTPVerificationView(FormView):
+    template_name = "admin/otp_verification.html"
+    form_class = OTPVerificationForm
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.session.get('otp_verified') is True:
+            return redirect(home_url(request.user))
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        if not has_pending_otp(request.user) and not issue_otp(request.user):
+            messages.error(request, OTP_THROTTLED_MESSAGE)
+        return super().get(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        if not verify_otp(self.request.user, form.cleaned_data['code']):
+            form.add_error('code', 'Invalid or expired code.')
+            return self.form_invalid(form)
+        self.request.session['otp_verified'] = True
+        return redirect(home_url(self.request.user))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['title'] = 'Verification'
+        return context
+
+
+class OTPResendView(View):
+
+    def post(self, request):
+        if issue_otp(request.user):
+            messages.info(request, "A new verification code has been sent.")
+        else:
+            messages.error(request, OTP_THROTTLED_MESSAGE)
+        return redirect('otp-verification')
+
+
 class RegisterView(View):
     template_name = 'registration/register.html'
     title = "Sign Up"
@@ -66,7 +116,7 @@ class RegisterView(View):
         try:
             with transaction.atomic():
                 # Register the user
-                user = form.register_user()
+                user = form.register_user(base_url=request.build_absolute_uri("/"))
                 print(user)
                 # Create organisation linked to user
                 Organisation.objects.create(
@@ -76,7 +126,7 @@ class RegisterView(View):
 
             messages.success(
                 request,
-                "Sign Up successful. Your password has been sent to your email."
+                "Sign Up successful. A link to set your password has been sent to your email."
             )
             return redirect(reverse_lazy("login"))
 
@@ -85,4 +135,13 @@ class RegisterView(View):
             logger.error("Registration error: %s", str(e))
             logger.debug(traceback.format_exc())
             form.add_error(None, f"Sorry, something went wrong during registration. {e}")
-            return render(request, self.template_name, {'form': form, 'title': self.title})
\ No newline at end of file
+            return render(request, self.template_name, {'form': form, 'title': self.title})
+
+
+class RateLimitStatsView(View):
+    """Allowed/rejected counters of the rate limiter, for monitoring."""
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return HttpResponseForbidden()
+        return JsonResponse(get_stats())
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.conf import settings
-from django.utils.html import format_html
+
+from filestore.thumbnails import thumbnail_tag
 
 class BaseModelAdmin(admin.ModelAdmin):
     actions_on_bottom = True
@@ -8,9 +9,7 @@ class BaseModelAdmin(admin.ModelAdmin):
 
     def image_tag(self, obj, field_name):
         if hasattr(obj, field_name):
-            image_field = getattr(obj, field_name)
-            if image_field:
-                return format_html('<img src="{}" style="max-width:80px;max-height:80px"/>'.format(image_field.url))
+            return thumbnail_tag(getattr(obj, field_name))
         return ""
 
     def created_date(self, obj):
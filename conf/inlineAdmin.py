@@ -0,0 +1,145 @@
+from django.contrib import admin
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.forms.formsets import INITIAL_FORM_COUNT, TOTAL_FORM_COUNT
+from django.forms.models import BaseInlineFormSet
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    """
+    Inline formset that never materialises every child.
+
+    Unbound it renders one page of children, optionally narrowed by a
+    search term. A lazy formset on the change form is deferred: no rows are
+    queried and the page only shows a placeholder that fetches a page on
+    demand. A bound formset only builds forms for the rows that were
+    posted, and a change form posted without this formset's management data
+    (the section was never opened) validates as empty and leaves the
+    children untouched.
+    """
+    per_page = 20
+    lazy = True
+    search_fields = ()
+
+    def __init__(self, data=None, files=None, instance=None, save_as_new=False, prefix=None, queryset=None,
+                 page=None, search="", **kwargs):
+        super().__init__(data, files, instance=instance, save_as_new=save_as_new, prefix=prefix, queryset=queryset, **kwargs)
+        queryset = self.queryset if self.queryset.ordered else self.queryset.order_by(self.model._meta.pk.name)
+        self.page_obj = None
+        self.deferred = False
+        self.search = search.strip()
+        if self.is_bound:
+            if self.add_prefix(TOTAL_FORM_COUNT) not in self.data:
+                self.deferred = True
+                self.data = {self.add_prefix(TOTAL_FORM_COUNT): "0", self.add_prefix(INITIAL_FORM_COUNT): "0"}
+                self.queryset = queryset.none()
+            else:
+                self.queryset = queryset.filter(pk__in=self.posted_pks())
+        elif self.lazy and page is None and self.instance.pk is not None:
+            self.deferred = True
+            self.queryset = queryset.none()
+        else:
+            if self.search:
+                queryset = self.filter_search(queryset, self.search)
+            self.page_obj = Paginator(queryset, self.per_page).get_page(page)
+            self.queryset = self.page_obj.object_list
+
+    def filter_search(self, queryset, term):
+        """Rows where every word of `term` appears in one of search_fields, as the changelist search does."""
+        for word in term.split():
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{f"{field}__icontains": word})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def posted_pks(self):
+        try:
+            initial = int(self.data.get(self.add_prefix(INITIAL_FORM_COUNT), 0))
+        except (TypeError, ValueError):
+            return []
+        pk_name = self.model._meta.pk.name
+        pks = (self.data.get(f"{self.add_prefix(i)}-{pk_name}") for i in range(min(initial, self.absolute_max)))
+        return [pk for pk in pks if pk]
+
+
+class PaginatedInlineMixin:
+    """
+    Mixin for InlineModelAdmin classes: the change form shows the first page
+    of children and further pages (and search results, when search_fields is
+    set) come from PaginatedInlineAdminMixin's inline/<prefix>/ endpoint.
+    """
+    formset = PaginatedInlineFormSet
+    per_page = 20
+    lazy = False
+    search_fields = ()
+    template = "admin/edit_inline/paginated.html"
+
+    class Media:
+        js = ["assets/js/paginated_inlines.js"]
+
+    @property
+    def inline_template(self):
+        """The stacked/tabular template the loaded page is rendered with."""
+        for cls in type(self).__mro__:
+            if cls in (admin.StackedInline, admin.TabularInline):
+                return cls.template
+        return admin.StackedInline.template
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.per_page = self.per_page
+        formset.lazy = self.lazy
+        formset.search_fields = self.search_fields
+        return formset
+
+
+class LazyInlineMixin(PaginatedInlineMixin):
+    """PaginatedInlineMixin that loads nothing until the section is opened."""
+    lazy = True
+
+
+class PaginatedInlineAdminMixin:
+    """Mixin for ModelAdmin classes whose inlines use PaginatedInlineMixin or LazyInlineMixin."""
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path("<path:object_id>/inline/<str:prefix>/", self.admin_site.admin_view(self.inline_page_view),
+                 name="%s_%s_inline" % info),
+        ] + super().get_urls()
+
+    def get_inline_for_prefix(self, request, obj, prefix):
+        """Return (FormSet, inline) for a formset prefix, numbered the way the change form numbers them."""
+        prefixes = {}
+        for FormSet, inline in self.get_formsets_with_inlines(request, obj):
+            candidate = FormSet.get_default_prefix()
+            prefixes[candidate] = prefixes.get(candidate, 0) + 1
+            if prefixes[candidate] != 1 or not candidate:
+                candidate = "%s-%s" % (candidate, prefixes[candidate])
+            if candidate == prefix:
+                return FormSet, inline
+        raise Http404("Unknown inline")
+
+    def inline_page_view(self, request, object_id, prefix):
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404
+        if not self.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+        FormSet, inline = self.get_inline_for_prefix(request, obj, prefix)
+        if not issubclass(FormSet, PaginatedInlineFormSet):
+            raise Http404("Inline is not paginated")
+        formset = FormSet(instance=obj, prefix=prefix, queryset=inline.get_queryset(request),
+                          page=request.GET.get("page") or 1, search=request.GET.get("q", ""))
+        inline_admin_formset = self.get_inline_formsets(request, [formset], [inline], obj)[0]
+        return TemplateResponse(request, "admin/edit_inline/paginated_page.html", {
+            "opts": self.model._meta,
+            "original": obj,
+            "inline_admin_formset": inline_admin_formset,
+        })
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:07
+
+from django.db import migrations, models
+import filestore.paths
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conf', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='standardoperatingprocedure',
+            name='sop_file',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('sop')),
+        ),
+    ]
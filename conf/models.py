@@ -1,5 +1,6 @@
 from django.db import models
 from system.models.modelmixin import TimeStampMixin
+from filestore.paths import ShardedUploadTo
 
 
 class Region(TimeStampMixin):
@@ -86,7 +87,7 @@ class StandardOperatingProcedure(TimeStampMixin):
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
     name = models.CharField(max_length=255, unique=True)
     code = models.CharField(max_length=255, unique=True, null=True)
-    sop_file = models.FileField(upload_to="sop", null=True, blank=True)
+    sop_file = models.FileField(upload_to=ShardedUploadTo("sop"), null=True, blank=True)
 
     def __str__(self):
         return F"{self.name}"
@@ -0,0 +1,94 @@
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.db import models
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from filestore.bundle import bundle_filename, bundle_path
+from filestore.models import AuditBundle, Blob, IntegrityCheckRun, StoredFile
+from filestore.responses import serve_file
+from filestore.uploads import release_uploads
+from filestore.widgets import ChunkedFileInput
+
+
+class ChunkedUploadAdminMixin:
+    """
+    Upload the admin's file fields in resumable chunks instead of one
+    multipart POST. A ModelAdmin whose inlines use it needs it too: the
+    uploads are released after the inlines are saved.
+    """
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        if isinstance(db_field, models.FileField):
+            kwargs["widget"] = ChunkedFileInput(user=request.user)
+        return super().formfield_for_dbfield(db_field, request, **kwargs)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        release_uploads([form, *(inline_form for formset in formsets for inline_form in formset.forms)])
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ("digest", "size", "ref_count", "integrity_status", "verified_at", "created_at")
+    list_filter = ("integrity_status",)
+    search_fields = ("digest", "files__name")
+    readonly_fields = ("digest", "size", "ref_count", "integrity_status", "verified_at", "created_at")
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ("name", "blob", "created_at")
+    search_fields = ("name", "blob__digest")
+    readonly_fields = ("name", "blob", "created_at")
+
+
+@admin.register(IntegrityCheckRun)
+class IntegrityCheckRunAdmin(admin.ModelAdmin):
+    list_display = ("started_at", "status", "checked", "mismatched", "missing", "unreadable", "bytes_read", "updated_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = ("status", "last_blob_id", "checked", "mismatched", "missing", "unreadable", "bytes_read",
+                       "started_at", "updated_at", "finished_at")
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(AuditBundle)
+class AuditBundleAdmin(admin.ModelAdmin):
+    list_display = ("organisation", "status", "file_count", "size", "requested_by", "created_at", "completed_at", "download")
+    list_filter = ("status",)
+    search_fields = ("organisation__name",)
+    date_hierarchy = "created_at"
+    readonly_fields = ("organisation", "requested_by", "status", "file_count", "size", "error", "created_at", "completed_at")
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request).select_related("organisation", "requested_by")
+        if not request.user.is_superuser:
+            qs = qs.filter(requested_by=request.user)
+        return qs
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        return [
+            path("<uuid:pk>/download/", self.admin_site.admin_view(self.download_view), name="filestore_auditbundle_download"),
+        ] + super().get_urls()
+
+    @admin.display(description="Download")
+    def download(self, obj):
+        if obj.status != AuditBundle.Status.DONE:
+            return "-"
+        return format_html('<a href="{}">ZIP</a>', reverse("admin:filestore_auditbundle_download", args=[obj.pk]))
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        bundle = get_object_or_404(self.get_queryset(request), pk=pk, status=AuditBundle.Status.DONE)
+        try:
+            return serve_file(request, bundle_path(bundle), bundle_filename(bundle.organisation), as_attachment=True)
+        except FileNotFoundError:
+            raise Http404("Bundle file not found")
@@ -0,0 +1,144 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import posixpath
+import zipfile
+
+from django.conf import settings
+from django.utils import timezone
+
+from filestore.registry import file_fields, organisation_lookup
+from filestore.storage import EXPORT_DIR
+
+MANIFEST_COLUMNS = ["path", "model", "record_id", "record", "field", "original_name", "size", "sha256", "status"]
+
+
+class _ZipBuffer:
+    """Unseekable sink for ZipFile; the written bytes are drained after each chunk."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def organisation_files(organisation):
+    """Yield (instance, field) for every stored file of the organisation's records."""
+    for model, field in file_fields():
+        lookup = organisation_lookup(model)
+        if lookup is None:
+            continue
+        queryset = (
+            model._default_manager.filter(**{lookup: organisation})
+            .exclude(**{field.name: ""}).exclude(**{f"{field.name}__isnull": True})
+            .distinct().order_by("pk")
+        )
+        for instance in queryset.iterator(chunk_size=500):
+            yield instance, field
+
+
+def _manifest_files(rows):
+    csv_file = io.StringIO()
+    writer = csv.DictWriter(csv_file, fieldnames=MANIFEST_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+    records = {}
+    for row in rows:
+        record = records.setdefault((row["model"], row["record_id"]), {
+            "model": row["model"], "record_id": row["record_id"], "record": row["record"], "files": [],
+        })
+        record["files"].append({key: row[key] for key in ("field", "path", "original_name", "size", "sha256", "status")})
+    return csv_file.getvalue(), json.dumps(list(records.values()), indent=2)
+
+
+def iter_bundle(organisation, stats=None):
+    """
+    Yield the bytes of a ZIP holding every file of the organisation plus
+    manifest.csv and manifest.json. Files are copied in storage-sized chunks,
+    so nothing is buffered beyond one chunk and the manifest rows.
+    """
+    buffer = _ZipBuffer()
+    rows = []
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for instance, field in organisation_files(organisation):
+            fieldfile = getattr(instance, field.name)
+            model = instance._meta.label
+            path = posixpath.join(model, str(instance.pk), field.name, posixpath.basename(fieldfile.name))
+            row = {
+                "path": path, "model": model, "record_id": instance.pk, "record": str(instance),
+                "field": field.name, "original_name": fieldfile.name, "size": 0, "sha256": "", "status": "included",
+            }
+            try:
+                source = fieldfile.storage.open(fieldfile.name, "rb")
+            except FileNotFoundError:
+                row["status"] = "missing"
+                rows.append(row)
+                continue
+            sha256 = hashlib.sha256()
+            with source, archive.open(path, "w", force_zip64=True) as target:
+                for chunk in source.chunks():
+                    target.write(chunk)
+                    sha256.update(chunk)
+                    row["size"] += len(chunk)
+                    yield buffer.drain()
+            row["sha256"] = sha256.hexdigest()
+            rows.append(row)
+            yield buffer.drain()
+
+        manifest_csv, manifest_json = _manifest_files(rows)
+        archive.writestr("manifest.csv", manifest_csv, compress_type=zipfile.ZIP_DEFLATED)
+        archive.writestr("manifest.json", manifest_json, compress_type=zipfile.ZIP_DEFLATED)
+    yield buffer.drain()
+
+    if stats is not None:
+        stats["file_count"] = sum(row["status"] == "included" for row in rows)
+
+
+def bundle_filename(organisation):
+    return f"audit-bundle-{organisation.pk}-{timezone.now():%Y%m%d}.zip"
+
+
+def bundle_path(bundle):
+    return os.path.join(settings.MEDIA_ROOT, EXPORT_DIR, f"{bundle.pk}.zip")
+
+
+def write_bundle(organisation, path):
+    """Write the bundle for `organisation` to `path`. Returns (file count, size in bytes)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    stats, size = {}, 0
+    with open(path, "wb") as output:
+        for data in iter_bundle(organisation, stats):
+            output.write(data)
+            size += len(data)
+    return stats["file_count"], size
+
+
+def run_bundle(bundle):
+    """Build a queued AuditBundle into MEDIA_ROOT/exports. Returns False if another worker took it."""
+    from filestore.models import AuditBundle
+
+    if not AuditBundle.objects.filter(pk=bundle.pk, status=AuditBundle.Status.PENDING).update(
+            status=AuditBundle.Status.RUNNING):
+        return False
+    try:
+        file_count, size = write_bundle(bundle.organisation, bundle_path(bundle))
+    except Exception as e:
+        AuditBundle.objects.filter(pk=bundle.pk).update(status=AuditBundle.Status.FAILED, error=str(e))
+        raise
+    AuditBundle.objects.filter(pk=bundle.pk).update(
+        status=AuditBundle.Status.DONE, file_count=file_count, size=size, completed_at=timezone.now(),
+    )
+    return True
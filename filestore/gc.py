@@ -0,0 +1,133 @@
+import heapq
+import os
+import tempfile
+import time
+
+from django.conf import settings
+
+from filestore.models import StoredFile
+from filestore.registry import file_fields
+from filestore.storage import RESERVED_DIRS
+
+
+def path_key(line):
+    """
+    Sort key shared by both sides of the merge: compare names component by
+    component so the order matches a depth-first directory walk.
+    """
+    return line.split("\t", 1)[0].split("/")
+
+
+def _keyset(queryset, fields, batch_size):
+    """Yield value tuples from a queryset in primary key batches, without a long running cursor."""
+    last = None
+    while True:
+        page = queryset.order_by("pk")
+        if last is not None:
+            page = page.filter(pk__gt=last)
+        rows = list(page.values_list("pk", *fields)[:batch_size])
+        if not rows:
+            return
+        for row in rows:
+            yield row[1:]
+        last = rows[-1][0]
+
+
+class ExternalSorter:
+    """Sort an arbitrarily long stream of lines using sorted runs spilled to temporary files."""
+
+    def __init__(self, run_size):
+        self.run_size = run_size
+        self.runs = []
+
+    def sort(self, lines):
+        run = []
+        for line in lines:
+            run.append(line)
+            if len(run) >= self.run_size:
+                self._spill(run)
+                run = []
+        run.sort(key=path_key)
+        runs = [self._read(path) for path in self.runs]
+        return heapq.merge(iter(run), *runs, key=path_key)
+
+    def _spill(self, run):
+        run.sort(key=path_key)
+        fd, path = tempfile.mkstemp(prefix="filestore-gc-", suffix=".run")
+        with os.fdopen(fd, "w", encoding="utf-8") as fileobj:
+            fileobj.writelines(f"{line}\n" for line in run)
+        self.runs.append(path)
+
+    @staticmethod
+    def _read(path):
+        with open(path, encoding="utf-8") as fileobj:
+            for line in fileobj:
+                yield line.rstrip("\n")
+
+    def close(self):
+        for path in self.runs:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.runs = []
+
+
+def referenced_names(batch_size):
+    """Every name held by a file field, in batches per model."""
+    for model, field in file_fields():
+        queryset = model._default_manager.exclude(**{field.name: ""}).exclude(**{f"{field.name}__isnull": True})
+        for name, in _keyset(queryset, [field.name], batch_size):
+            if "\n" not in name:
+                yield name
+
+
+def _walk(root, prefix=""):
+    """Depth-first walk yielding 'name\\tmtime' in path_key order."""
+    try:
+        entries = sorted(os.scandir(root), key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        name = prefix + entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if prefix or entry.name not in RESERVED_DIRS:
+                yield from _walk(entry.path, name + "/")
+        elif "\n" not in name:
+            yield f"{name}\t{entry.stat(follow_symlinks=False).st_mtime}"
+
+
+def stored_names(batch_size):
+    """Names mapped to deduplicated blobs, as 'name\\tcreated'."""
+    for name, created_at in _keyset(StoredFile.objects.all(), ["name", "created_at"], batch_size):
+        if "\n" not in name and name.split("/")[0] not in RESERVED_DIRS:
+            yield f"{name}\t{created_at.timestamp()}"
+
+
+def find_orphans(min_age, batch_size=5000, run_size=200000):
+    """
+    Yield (name, mtime) for stored files no file field refers to.
+
+    The referenced names and the StoredFile names are sorted externally and
+    merged with the directory walk, so memory stays bounded by run_size no
+    matter how many files there are. Files younger than min_age seconds are
+    skipped, they may belong to a form that is still being saved.
+    """
+    cutoff = time.time() - min_age
+    referenced, stored = ExternalSorter(run_size), ExternalSorter(run_size)
+    try:
+        refs = referenced.sort(referenced_names(batch_size))
+        listing = heapq.merge(_walk(str(settings.MEDIA_ROOT)), stored.sort(stored_names(batch_size)), key=path_key)
+        current_ref = next(refs, None)
+        for line in listing:
+            name, _, mtime = line.partition("\t")
+            key = path_key(name)
+            while current_ref is not None and path_key(current_ref) < key:
+                current_ref = next(refs, None)
+            if current_ref == name:
+                continue
+            if float(mtime) < cutoff:
+                yield name, float(mtime)
+    finally:
+        referenced.close()
+        stored.close()
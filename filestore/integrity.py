@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from filestore.models import Blob, IntegrityCheckRun
+
+READ_SIZE = 1024 * 1024
+
+
+class Throttle:
+    """Limit the combined read rate of all worker threads to `rate` bytes per second."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.start = time.monotonic()
+        self.consumed = 0
+
+    def wait(self, size):
+        if not self.rate:
+            return
+        with self.lock:
+            self.consumed += size
+            delay = self.start + self.consumed / self.rate - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def hash_file(path, throttle):
+    """
+    Re-hash a blob body from disk and return (status, bytes read, digest).
+    The digest is None when the file is missing or cannot be read.
+    """
+    sha256, size = hashlib.sha256(), 0
+    try:
+        with open(path, "rb") as fileobj:
+            while True:
+                data = fileobj.read(READ_SIZE)
+                if not data:
+                    break
+                throttle.wait(len(data))
+                sha256.update(data)
+                size += len(data)
+    except FileNotFoundError:
+        return Blob.Integrity.MISSING, size, None
+    except OSError:
+        # Permissions, a directory in the blob's place or an I/O error: report it and carry on
+        return Blob.Integrity.UNREADABLE, size, None
+    return Blob.Integrity.OK, size, sha256.hexdigest()
+
+
+def check_blob(storage, blob, throttle):
+    status, size, digest = hash_file(storage.blob_path(blob.digest), throttle)
+    if status == Blob.Integrity.OK and (digest != blob.digest or size != blob.size):
+        status = Blob.Integrity.MISMATCH
+    return blob.pk, status, size
+
+
+def verify_blobs(storage, run, workers=4, rate=None, batch_size=200, older_than=None, on_problem=None):
+    """
+    Re-hash every blob after run.last_blob_id with a bounded thread pool,
+    saving statuses and the run's progress after each batch.
+    """
+    throttle = Throttle(rate)
+    blobs = Blob.objects.order_by("pk")
+    if older_than is not None:
+        blobs = blobs.exclude(verified_at__gte=older_than)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            batch = list(blobs.filter(pk__gt=run.last_blob_id).only("pk", "digest", "size")[:batch_size])
+            if not batch:
+                break
+            results = list(executor.map(lambda blob: check_blob(storage, blob, throttle), batch))
+
+            by_status = {}
+            for pk, status, _ in results:
+                by_status.setdefault(status, []).append(pk)
+            now = timezone.now()
+            with transaction.atomic():
+                for status, pks in by_status.items():
+                    Blob.objects.filter(pk__in=pks).update(integrity_status=status, verified_at=now)
+                IntegrityCheckRun.objects.filter(pk=run.pk).update(
+                    last_blob_id=batch[-1].pk,
+                    checked=F("checked") + len(results),
+                    mismatched=F("mismatched") + len(by_status.get(Blob.Integrity.MISMATCH, [])),
+                    missing=F("missing") + len(by_status.get(Blob.Integrity.MISSING, [])),
+                    unreadable=F("unreadable") + len(by_status.get(Blob.Integrity.UNREADABLE, [])),
+                    bytes_read=F("bytes_read") + sum(size for _, _, size in results),
+                    updated_at=now,
+                )
+            run.last_blob_id = batch[-1].pk
+            if on_problem:
+                for pk, status, _ in results:
+                    if status != Blob.Integrity.OK:
+                        on_problem(pk, status)
+
+    IntegrityCheckRun.objects.filter(pk=run.pk).update(
+        status=IntegrityCheckRun.Status.DONE, finished_at=timezone.now(),
+    )
+    run.refresh_from_db()
+    return run
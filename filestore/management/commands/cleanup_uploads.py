@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from filestore.uploads import discard, expired_sessions
+
+
+class Command(BaseCommand):
+    help = "Delete chunked upload sessions (and their part files) idle for longer than CHUNKED_UPLOAD_EXPIRY."
+
+    def handle(self, *args, **options):
+        count = 0
+        for session in expired_sessions().iterator():
+            discard(session)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count} expired upload session(s) removed"))
@@ -0,0 +1,59 @@
+import csv
+import sys
+from datetime import datetime
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from filestore.gc import find_orphans
+from filestore.storage import QUARANTINE_DIR
+
+
+class Command(BaseCommand):
+    help = (
+        "Find stored files that no file field refers to. Reports only, unless "
+        "--delete or --quarantine is given."
+    )
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group()
+        action.add_argument("--delete", action="store_true", help="Delete orphaned files.")
+        action.add_argument("--quarantine", action="store_true",
+                            help=f"Move orphaned files under MEDIA_ROOT/{QUARANTINE_DIR}/<timestamp>/.")
+        parser.add_argument("--min-age", type=float, default=24, help="Ignore files newer than this many hours.")
+        parser.add_argument("--report", help="Write a CSV report of orphaned files to this path ('-' for stdout).")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options["delete"] or options["quarantine"]:
+            if not hasattr(default_storage, "move"):
+                raise CommandError("The default storage is not a DedupFileSystemStorage")
+        quarantine_root = f"{QUARANTINE_DIR}/{timezone.now():%Y%m%d%H%M%S}"
+
+        report = writer = None
+        if options["report"]:
+            report = sys.stdout if options["report"] == "-" else open(options["report"], "w", newline="")
+            writer = csv.writer(report)
+            writer.writerow(["name", "modified", "action"])
+
+        count = 0
+        try:
+            for name, mtime in find_orphans(options["min_age"] * 3600, batch_size=options["batch_size"]):
+                if options["delete"]:
+                    default_storage.delete(name)
+                    action = "deleted"
+                elif options["quarantine"]:
+                    default_storage.move(name, f"{quarantine_root}/{name}")
+                    action = "quarantined"
+                else:
+                    action = "dry-run"
+                count += 1
+                if writer:
+                    writer.writerow([name, datetime.fromtimestamp(mtime).isoformat(timespec="seconds"), action])
+        finally:
+            if report and report is not sys.stdout:
+                report.close()
+
+        verb = "deleted" if options["delete"] else "quarantined" if options["quarantine"] else "found (dry run)"
+        self.stdout.write(self.style.SUCCESS(f"{count} orphaned file(s) {verb}"))
@@ -0,0 +1,25 @@
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from filestore.storage import RESERVED_DIRS
+
+
+class Command(BaseCommand):
+    help = "Move files saved before deduplication into the content addressed blob store."
+
+    def handle(self, *args, **options):
+        if not hasattr(default_storage, "adopt"):
+            raise CommandError("The default storage is not a DedupFileSystemStorage")
+
+        adopted = 0
+        for root, dirs, files in os.walk(settings.MEDIA_ROOT):
+            if root == str(settings.MEDIA_ROOT):
+                dirs[:] = [d for d in dirs if d not in RESERVED_DIRS]
+            for filename in files:
+                name = os.path.relpath(os.path.join(root, filename), settings.MEDIA_ROOT).replace(os.sep, "/")
+                if default_storage.adopt(name):
+                    adopted += 1
+        self.stdout.write(self.style.SUCCESS(f"{adopted} file(s) moved into the blob store"))
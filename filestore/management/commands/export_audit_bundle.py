@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from filestore.bundle import run_bundle, write_bundle
+from filestore.models import AuditBundle
+from system.models.organisation import Organisation
+
+
+class Command(BaseCommand):
+    help = "Write an organisation's audit bundle ZIP to a file, or build bundles queued from the admin."
+
+    def add_arguments(self, parser):
+        parser.add_argument("organisation_id", nargs="?", type=int)
+        parser.add_argument("--output", help="Destination path for a single organisation's bundle.")
+        parser.add_argument("--pending", action="store_true", help="Build queued bundles and keep polling for more.")
+        parser.add_argument("--once", action="store_true", help="With --pending, exit when the queue is empty.")
+        parser.add_argument("--poll-interval", type=float, default=10)
+
+    def handle(self, *args, **options):
+        if options["pending"]:
+            return self.run_queue(options["poll_interval"], options["once"])
+
+        if not options["organisation_id"] or not options["output"]:
+            raise CommandError("Give an organisation id and --output, or use --pending")
+        try:
+            organisation = Organisation.objects.get(pk=options["organisation_id"])
+        except Organisation.DoesNotExist:
+            raise CommandError(f"Organisation {options['organisation_id']} does not exist")
+        file_count, size = write_bundle(organisation, options["output"])
+        self.stdout.write(self.style.SUCCESS(f"{file_count} file(s), {size} bytes written to {options['output']}"))
+
+    def run_queue(self, poll_interval, once):
+        while True:
+            bundle = AuditBundle.objects.filter(status=AuditBundle.Status.PENDING).order_by("created_at").first()
+            if bundle is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            try:
+                if run_bundle(bundle):
+                    self.stdout.write(f"Built {bundle}")
+            except Exception as e:
+                self.stderr.write(f"{bundle.pk} failed: {e}")
@@ -0,0 +1,97 @@
+import posixpath
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from django import db
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from filestore.models import StoredFile
+from filestore.paths import ShardedUploadTo, sharded_name
+from filestore.registry import file_fields, organisation_lookup
+
+
+def _organisation_ids(model, pks):
+    lookup = organisation_lookup(model)
+    if lookup is None:
+        return {}
+    ids = {}
+    for pk, organisation_id in model._default_manager.filter(pk__in=pks).values_list("pk", lookup):
+        # Users in several organisations go under the first one found
+        if organisation_id is not None:
+            ids.setdefault(pk, organisation_id)
+    return ids
+
+
+def shard_batch(label, field_name, rows):
+    """
+    Move one batch of (pk, name) files to their sharded paths and save the new
+    names with a single bulk_update. Safe to re-run: files already in place
+    are skipped and a file moved before an interrupted update is picked up.
+    """
+    model = apps.get_model(label)
+    field = model._meta.get_field(field_name)
+    storage = field.storage
+    organisation_ids = _organisation_ids(model, [pk for pk, _ in rows])
+    blob_backed = set(StoredFile.objects.filter(name__in=[name for _, name in rows]).values_list("name", flat=True))
+
+    updates, missing = [], 0
+    for pk, name in rows:
+        organisation_id = organisation_ids.get(pk)
+        # Sharded by the record rather than at random so a re-run finds the same path
+        key = f"{label}:{field_name}:{pk}"
+        target = sharded_name(field.upload_to.prefix, organisation_id, name, key=key)
+        if name == target:
+            continue
+        # Name clashes get the primary key appended
+        stem, ext = posixpath.splitext(posixpath.basename(name))
+        fallback = sharded_name(field.upload_to.prefix, organisation_id, f"{stem}_{pk}{ext}", key=key)
+        if name in blob_backed or storage.exists(name):
+            if storage.exists(target):
+                target = fallback
+            storage.move(name, target)
+        elif storage.exists(fallback):
+            target = fallback
+        elif not storage.exists(target):
+            missing += 1
+            continue
+        updates.append(model(pk=pk, **{field_name: target}))
+    model._default_manager.bulk_update(updates, [field_name])
+    return len(updates), missing
+
+
+class Command(BaseCommand):
+    help = "Move existing uploads into the sharded prefix/org-<id>/ab/cd/ layout and update their paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        tasks = []
+        for model, field in file_fields():
+            if not isinstance(field.upload_to, ShardedUploadTo):
+                continue
+            prefix = field.upload_to.prefix
+            rows = list(
+                model._default_manager.exclude(**{field.name: ""}).exclude(**{f"{field.name}__isnull": True})
+                .exclude(**{f"{field.name}__regex": rf"^{re.escape(prefix)}(org-[0-9]+|shared)/[0-9a-f]{{2}}/[0-9a-f]{{2}}/[^/]+$"})
+                .order_by("pk").values_list("pk", field.name)
+            )
+            for start in range(0, len(rows), batch_size):
+                tasks.append((model._meta.label, field.name, rows[start:start + batch_size]))
+            if rows:
+                self.stdout.write(f"{model._meta.label}.{field.name}: {len(rows)} file(s) to move")
+
+        if not tasks:
+            return
+
+        # Children must open their own database connections
+        db.connections.close_all()
+        moved = missing = 0
+        with ProcessPoolExecutor(max_workers=options["processes"]) as executor:
+            for batch_moved, batch_missing in executor.map(shard_batch, *zip(*tasks)):
+                moved += batch_moved
+                missing += batch_missing
+        self.stdout.write(self.style.SUCCESS(f"{moved} file(s) moved, {missing} missing file(s) left unchanged"))
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from filestore.integrity import verify_blobs
+from filestore.models import IntegrityCheckRun, StoredFile
+
+
+class Command(BaseCommand):
+    help = "Re-hash stored files and compare them with the SHA-256 recorded at upload."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Files read concurrently.")
+        parser.add_argument("--max-rate", type=float, default=0, help="Read limit in MB/s across all workers (0 = no limit).")
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--skip-verified-within", type=float, metavar="DAYS",
+                            help="Skip blobs already verified in the last DAYS days.")
+        parser.add_argument("--restart", action="store_true", help="Start a new run instead of resuming an unfinished one.")
+
+    def handle(self, *args, **options):
+        if not hasattr(default_storage, "blob_path"):
+            raise CommandError("The default storage is not a DedupFileSystemStorage")
+
+        run = None
+        if not options["restart"]:
+            run = IntegrityCheckRun.objects.filter(status=IntegrityCheckRun.Status.RUNNING).order_by("-started_at").first()
+        if run is None:
+            run = IntegrityCheckRun.objects.create()
+        else:
+            self.stdout.write(f"Resuming {run} after blob {run.last_blob_id}")
+
+        older_than = None
+        if options["skip_verified_within"]:
+            older_than = timezone.now() - timedelta(days=options["skip_verified_within"])
+
+        def report(pk, status):
+            names = ", ".join(StoredFile.objects.filter(blob_id=pk).values_list("name", flat=True)[:5])
+            self.stderr.write(f"{status}: blob {pk} ({names})")
+
+        run = verify_blobs(
+            default_storage, run,
+            workers=options["workers"],
+            rate=options["max_rate"] * 1024 * 1024,
+            batch_size=options["batch_size"],
+            older_than=older_than,
+            on_problem=report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{run.checked} file(s) checked, {run.mismatched} changed, {run.missing} missing, {run.unreadable} unreadable"
+        ))
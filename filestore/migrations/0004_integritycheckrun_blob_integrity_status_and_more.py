@@ -0,0 +1,43 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filestore', '0003_auditbundle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntegrityCheckRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('DONE', 'Finished')], default='RUNNING', max_length=10)),
+                ('last_blob_id', models.BigIntegerField(default=0)),
+                ('checked', models.PositiveIntegerField(default=0)),
+                ('mismatched', models.PositiveIntegerField(default=0)),
+                ('missing', models.PositiveIntegerField(default=0)),
+                ('bytes_read', models.BigIntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Integrity Check Run',
+                'verbose_name_plural': 'Integrity Check Runs',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='blob',
+            name='integrity_status',
+            field=models.CharField(choices=[('UNCHECKED', 'Not checked'), ('OK', 'OK'), ('MISMATCH', 'Content changed'), ('MISSING', 'File missing')], default='UNCHECKED', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='blob',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
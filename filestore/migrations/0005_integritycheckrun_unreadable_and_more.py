@@ -0,0 +1,23 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filestore', '0004_integritycheckrun_blob_integrity_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='integritycheckrun',
+            name='unreadable',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='blob',
+            name='integrity_status',
+            field=models.CharField(choices=[('UNCHECKED', 'Not checked'), ('OK', 'OK'), ('MISMATCH', 'Content changed'), ('MISSING', 'File missing'), ('UNREADABLE', 'File unreadable')], default='UNCHECKED', max_length=10),
+        ),
+    ]
@@ -0,0 +1,132 @@
+import uuid
+
+from django.db import models
+
+
+class Blob(models.Model):
+    """
+    A unique file body stored once under its SHA-256 digest. ref_count is
+    the number of StoredFile names pointing at it; the body is deleted when
+    it drops to zero. The digest is computed while the upload is streamed
+    and re-checked by `verify_file_integrity`.
+    """
+
+    class Integrity(models.TextChoices):
+        UNCHECKED = 'UNCHECKED', 'Not checked'
+        OK = 'OK', 'OK'
+        MISMATCH = 'MISMATCH', 'Content changed'
+        MISSING = 'MISSING', 'File missing'
+        UNREADABLE = 'UNREADABLE', 'File unreadable'
+
+    digest = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    integrity_status = models.CharField(max_length=10, choices=Integrity.choices, default=Integrity.UNCHECKED)
+    verified_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Blob"
+        verbose_name_plural = "Blobs"
+
+    def __str__(self):
+        return self.digest
+
+
+class StoredFile(models.Model):
+    """A file name as saved in a FileField, mapped to the blob holding its content."""
+    name = models.CharField(max_length=255, unique=True)
+    blob = models.ForeignKey(Blob, on_delete=models.PROTECT, related_name="files")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Stored File"
+        verbose_name_plural = "Stored Files"
+
+    def __str__(self):
+        return self.name
+
+
+class UploadSession(models.Model):
+    """
+    A resumable chunked upload. Chunks are written in order to a part file
+    under MEDIA_ROOT/tmp/uploads; `received` is the number of bytes accepted
+    so far and is where the client resumes after an interruption.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey("account.CustomUser", on_delete=models.CASCADE, related_name="upload_sessions")
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Upload Session"
+        verbose_name_plural = "Upload Sessions"
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+    @property
+    def is_complete(self):
+        return self.received >= self.size
+
+
+class AuditBundle(models.Model):
+    """A ZIP of every file held for an organisation, built by `export_audit_bundle`."""
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        RUNNING = 'RUNNING', 'Running'
+        DONE = 'DONE', 'Ready'
+        FAILED = 'FAILED', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organisation = models.ForeignKey("system.Organisation", on_delete=models.CASCADE, related_name="audit_bundles")
+    requested_by = models.ForeignKey("account.CustomUser", on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    file_count = models.PositiveIntegerField(default=0)
+    size = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Audit Bundle"
+        verbose_name_plural = "Audit Bundles"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.organisation} audit bundle ({self.get_status_display()})"
+
+
+class IntegrityCheckRun(models.Model):
+    """
+    Progress of one `verify_file_integrity` pass over the blob store. Blobs
+    are checked in primary key order and last_blob_id is saved after every
+    batch so an interrupted run can resume where it stopped.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = 'RUNNING', 'Running'
+        DONE = 'DONE', 'Finished'
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.RUNNING)
+    last_blob_id = models.BigIntegerField(default=0)
+    checked = models.PositiveIntegerField(default=0)
+    mismatched = models.PositiveIntegerField(default=0)
+    missing = models.PositiveIntegerField(default=0)
+    unreadable = models.PositiveIntegerField(default=0)
+    bytes_read = models.BigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Integrity Check Run"
+        verbose_name_plural = "Integrity Check Runs"
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Integrity check {self.started_at:%Y-%m-%d %H:%M} ({self.get_status_display()})"
@@ -0,0 +1,54 @@
+import hashlib
+import posixpath
+import uuid
+
+from django.utils.deconstruct import deconstructible
+
+from filestore.registry import organisation_lookup
+
+
+def organisation_id_for(instance):
+    """Follow the registry lookup from a model instance to its organisation id."""
+    lookup = organisation_lookup(type(instance))
+    if lookup is None:
+        return None
+    *path, last = lookup.split("__")
+    obj = instance
+    for attr in path:
+        if obj.pk is None and attr not in {field.name for field in obj._meta.concrete_fields}:
+            # Reverse relations of an unsaved instance cannot be read yet
+            return None
+        obj = getattr(obj, attr, None)
+        if hasattr(obj, "all"):
+            # Reverse foreign key, e.g. a user's organisation memberships
+            obj = obj.first()
+        if obj is None:
+            return None
+    return getattr(obj, f"{last}_id", None)
+
+
+def sharded_name(prefix, organisation_id, filename, key=None):
+    """
+    prefix/org-<id>/ab/cd/filename, where ab/cd come from a hash of `key` so
+    each organisation's files spread over 65536 directories. The key is
+    random unless given: hashing the file name would put every "scan.pdf"
+    in the same directory.
+    """
+    filename = posixpath.basename(filename)
+    digest = hashlib.md5((uuid.uuid4().hex if key is None else str(key)).encode()).hexdigest()
+    tenant = f"org-{organisation_id}" if organisation_id else "shared"
+    return f"{prefix}{tenant}/{digest[:2]}/{digest[2:4]}/{filename}"
+
+
+@deconstructible
+class ShardedUploadTo:
+    """upload_to callable that places files with sharded_name()."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix.rstrip("/") + "/"
+
+    def __call__(self, instance, filename):
+        return sharded_name(self.prefix, organisation_id_for(instance), filename)
+
+    def __eq__(self, other):
+        return isinstance(other, ShardedUploadTo) and self.prefix == other.prefix
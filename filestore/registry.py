@@ -0,0 +1,57 @@
+from functools import lru_cache
+
+from django.apps import apps
+from django.db import models
+
+# How to reach the owning Organisation from models without an `organisation` field
+ORGANISATION_LOOKUPS = {
+    "account.customuser": "organisation_user__organisation",
+    "system.commitmentattachment": "commitment__organisation",
+    "system.qualitypolicycommunication": "policy__organisation",
+    "system.qualitypolicyevidence": "policy__organisation",
+    "system.jobdescription": "role__organisation",
+    "system.changecontrolrecord": "change__organisation",
+    "system.designrecord": "project__organisation",
+}
+
+
+@lru_cache(maxsize=None)
+def file_fields():
+    """Every (model, FileField/ImageField) pair in the project."""
+    return tuple(
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    )
+
+
+def organisation_lookup(model):
+    """ORM path from `model` to its Organisation, or None for global models."""
+    lookup = ORGANISATION_LOOKUPS.get(model._meta.label_lower)
+    if lookup:
+        return lookup
+    if any(field.name == "organisation" for field in model._meta.concrete_fields):
+        return "organisation"
+    return None
+
+
+def upload_prefix(field):
+    """The fixed directory a field uploads into, e.g. 'qms/document_registers/'."""
+    upload_to = field.upload_to
+    if callable(upload_to):
+        return getattr(upload_to, "prefix", "")
+    return upload_to.split("%")[0]
+
+
+def find_owner(name):
+    """Return (model, pk) of the record whose file field holds `name`, or None."""
+    candidates = sorted(
+        (pair for pair in file_fields() if name.startswith(upload_prefix(pair[1]))),
+        key=lambda pair: -len(upload_prefix(pair[1])),
+    )
+    for model, field in candidates:
+        pk = model._default_manager.filter(**{field.name: name}).values_list("pk", flat=True).first()
+        if pk is not None:
+            return model, pk
+    return None
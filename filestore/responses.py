@@ -0,0 +1,128 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeFile:
+    """Read-only view of bytes start..end of an open file, for FileResponse."""
+
+    def __init__(self, fileobj, start, end):
+        self.fileobj = fileobj
+        self.fileobj.seek(start)
+        self.remaining = end - start + 1
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fileobj.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fileobj.close()
+
+
+def file_etag(digest, stat):
+    """Blob-backed files are tagged by content hash, plain files by mtime and size."""
+    return quote_etag(digest or f"{int(stat.st_mtime):x}-{stat.st_size:x}")
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) for a single satisfiable byte range, None when the
+    header is absent or cannot be honoured (the whole file is sent), or
+    False when the range lies outside the file.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match[1] == match[2] == "":
+        return None
+    if match[1] == "":
+        # Suffix range: the last N bytes
+        length = int(match[2])
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(match[1])
+    end = min(int(match[2]), size - 1) if match[2] else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _sendfile_response(full_path, filename, as_attachment):
+    backend = settings.SENDFILE_BACKEND
+    response = HttpResponse()
+    if backend == "xsendfile":
+        response["X-Sendfile"] = full_path
+    elif backend == "nginx":
+        relative = os.path.relpath(full_path, settings.MEDIA_ROOT).replace(os.sep, "/")
+        response["X-Accel-Redirect"] = settings.SENDFILE_URL_PREFIX.rstrip("/") + "/" + relative
+    else:
+        raise ValueError(f"Unknown SENDFILE_BACKEND '{backend}'")
+    # Let the web server work out the content type and ranges from the file itself
+    del response["Content-Type"]
+    response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def serve_file(request, full_path, filename, digest=None, as_attachment=False, max_age=None):
+    """
+    Respond with a file from disk.
+
+    Conditional requests are answered with 304 from the ETag and modification
+    time alone. When SENDFILE_BACKEND is set the transfer is handed to the
+    web server, otherwise the file is streamed with support for a single
+    byte range so interrupted downloads can resume. Without max_age browsers
+    revalidate on every use.
+    """
+    stat = os.stat(full_path)
+    etag = file_etag(digest, stat)
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        if settings.SENDFILE_BACKEND:
+            response = _sendfile_response(full_path, filename, as_attachment)
+        else:
+            response = _stream_response(request, full_path, filename, etag, stat.st_size, as_attachment)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    if max_age:
+        patch_cache_control(response, private=True, max_age=max_age)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _stream_response(request, full_path, filename, etag, size, as_attachment):
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    byte_range = parse_range(request.headers.get("Range"), size)
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range != etag:
+        # The client holds a different version; send it the whole file
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    fileobj = open(full_path, "rb")
+    if byte_range is None:
+        response = FileResponse(fileobj, content_type=content_type, filename=filename, as_attachment=as_attachment)
+    else:
+        start, end = byte_range
+        response = FileResponse(RangeFile(fileobj, start, end), status=206, content_type=content_type,
+                                filename=filename, as_attachment=as_attachment)
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    return response
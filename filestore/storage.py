@@ -0,0 +1,174 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from filestore.models import Blob, StoredFile
+
+BLOB_DIR = "blobs"
+TMP_DIR = "tmp"
+EXPORT_DIR = "exports"
+QUARANTINE_DIR = "quarantine"
+THUMBNAIL_DIR = "thumbnails"
+
+# Directories under MEDIA_ROOT that hold storage internals, not FileField values
+RESERVED_DIRS = {BLOB_DIR, TMP_DIR, EXPORT_DIR, QUARANTINE_DIR, THUMBNAIL_DIR}
+
+
+def blob_name(digest):
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+class DedupFileSystemStorage(FileSystemStorage):
+    """
+    Content addressed storage: each upload is hashed while it is streamed to
+    disk and its body is kept once under blobs/<digest>. The name the
+    FileField records is mapped to the blob by a StoredFile row, so models,
+    URLs and downloads keep using the original file name.
+
+    Files saved before this storage was enabled have no StoredFile row and
+    are read from their plain path.
+    """
+
+    def resolve(self, name):
+        """Return the blob digest behind a name, or None for a plain file."""
+        return StoredFile.objects.filter(name=name).values_list("blob__digest", flat=True).first()
+
+    def path(self, name):
+        return self.locate(name)[0]
+
+    def locate(self, name):
+        """Return (full path on disk, blob digest or None) with a single query."""
+        digest = self.resolve(name)
+        return super().path(blob_name(digest) if digest else name), digest
+
+    def _stream_to_tmp(self, content):
+        tmp_dir = super().path(TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        sha256, size = hashlib.sha256(), 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in content.chunks():
+                    sha256.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path, sha256.hexdigest(), size
+
+    def blob_path(self, digest):
+        return super().path(blob_name(digest))
+
+    def _store_blob(self, tmp_path, digest):
+        full_path = self.blob_path(digest)
+        if os.path.exists(full_path):
+            # Identical content is already stored
+            os.remove(tmp_path)
+            return
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        os.replace(tmp_path, full_path)
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+
+    def _link(self, name, tmp_path, digest, size):
+        """
+        Point `name` at the blob for `digest`, moving the temporary file into
+        place if the blob is new. The blob row stays locked until commit so a
+        concurrent delete() cannot remove the body being referenced.
+        """
+        blob, _ = Blob.objects.select_for_update().get_or_create(digest=digest, defaults={"size": size})
+        StoredFile.objects.create(name=name, blob=blob)
+        Blob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+        self._store_blob(tmp_path, digest)
+
+    def _save(self, name, content):
+        tmp_path, digest, size = self._stream_to_tmp(content)
+        try:
+            while True:
+                try:
+                    with transaction.atomic():
+                        self._link(name, tmp_path, digest, size)
+                    return name
+                except IntegrityError:
+                    # Another request took the name since get_available_name() checked it
+                    name = self.get_available_name(name)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def exists(self, name):
+        return StoredFile.objects.filter(name=name).exists() or os.path.lexists(super().path(name))
+
+    def delete(self, name):
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            if stored is None:
+                return super().delete(name)
+            stored.delete()
+            blob = Blob.objects.select_for_update().get(pk=stored.blob_id)
+            if blob.ref_count > 1:
+                Blob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+            else:
+                blob.delete()
+                # Only remove the body once the row is gone for good: a rollback
+                # restores the row and must find the file still there
+                transaction.on_commit(lambda: self._delete_orphan_blob(blob.digest))
+
+    def _delete_orphan_blob(self, digest):
+        """
+        Remove the body of a deleted blob unless the same content was stored
+        again. A placeholder row claims the digest while the file is removed:
+        its unique index makes a concurrent _link() either win (the body is
+        kept) or wait until the body is gone and store it afresh.
+        """
+        with transaction.atomic():
+            blob, created = Blob.objects.select_for_update().get_or_create(digest=digest, defaults={"size": 0})
+            if created:
+                super().delete(blob_name(digest))
+                blob.delete()
+
+    def listdir(self, path):
+        try:
+            directories, files = super().listdir(path)
+        except FileNotFoundError:
+            directories, files = [], []
+        if not path.strip("/"):
+            directories = [d for d in directories if d not in RESERVED_DIRS]
+        prefix = path.strip("/") + "/" if path.strip("/") else ""
+        for name in StoredFile.objects.filter(name__startswith=prefix).values_list("name", flat=True).iterator():
+            head, _, tail = name[len(prefix):].partition("/")
+            if tail:
+                if head not in directories:
+                    directories.append(head)
+            elif head not in files:
+                files.append(head)
+        return directories, files
+
+    def move(self, old_name, new_name):
+        """Rename a stored file. Blob-backed files only change their mapping row."""
+        if StoredFile.objects.filter(name=old_name).update(name=new_name):
+            return new_name
+        old_path, new_path = super().path(old_name), super().path(new_name)
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        os.replace(old_path, new_path)
+        return new_name
+
+    def adopt(self, name):
+        """Move a plain file saved before deduplication into the blob store."""
+        if StoredFile.objects.filter(name=name).exists():
+            return False
+        full_path = super().path(name)
+        with open(full_path, "rb") as fileobj:
+            tmp_path, digest, size = self._stream_to_tmp(File(fileobj))
+        with transaction.atomic():
+            self._link(name, tmp_path, digest, size)
+            transaction.on_commit(lambda: os.remove(full_path))
+        return True
@@ -0,0 +1,40 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from filestore.models import Blob
+from filestore.storage import DedupFileSystemStorage
+
+
+class DedupStorageDeleteTests(TestCase):
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.storage = DedupFileSystemStorage(location=self.location)
+
+    def read(self, name):
+        with self.storage.open(name) as fileobj:
+            return fileobj.read()
+
+    def test_reupload_after_delete(self):
+        name = self.storage.save("a.txt", ContentFile(b"same body"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(name)
+        self.assertFalse(Blob.objects.exists())
+
+        name = self.storage.save("b.txt", ContentFile(b"same body"))
+        self.assertEqual(self.read(name), b"same body")
+
+    def test_reupload_before_orphan_delete_keeps_body(self):
+        name = self.storage.save("a.txt", ContentFile(b"same body"))
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.storage.delete(name)
+        name = self.storage.save("b.txt", ContentFile(b"same body"))
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(self.read(name), b"same body")
+        self.assertEqual(Blob.objects.get().ref_count, 1)
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import posixpath
+import tempfile
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import ImageField
+from django.db.models.signals import post_init, post_save
+from django.urls import reverse
+from django.utils.html import format_html
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from filestore.registry import file_fields
+from filestore.storage import THUMBNAIL_DIR
+
+ALPHA_MODES = ("RGBA", "LA", "P")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp")
+
+logger = logging.getLogger(__name__)
+
+
+def is_image(name):
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def thumbnail_path(storage, name, size):
+    """
+    Return (source path, thumbnail path under MEDIA_ROOT/thumbnails).
+    Deduplicated files are keyed by content digest so identical images
+    share one thumbnail; plain files by name, modification time and size.
+    """
+    full_path, digest = storage.locate(name) if hasattr(storage, "locate") else (storage.path(name), None)
+    if digest is None:
+        stat = os.stat(full_path)
+        digest = hashlib.sha256(f"{name}:{stat.st_mtime}:{stat.st_size}".encode()).hexdigest()
+    return full_path, os.path.join(settings.MEDIA_ROOT, THUMBNAIL_DIR, size, digest[:2], f"{digest}.png")
+
+
+def make_thumbnail(source_path, target_path, size):
+    """Write a thumbnail fitting in THUMBNAIL_SIZES[size] to target_path."""
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(settings.THUMBNAIL_SIZES[size])
+        if image.mode not in ALPHA_MODES + ("RGB", "L"):
+            image = image.convert("RGB")
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_path))
+        try:
+            with os.fdopen(fd, "wb") as output:
+                image.save(output, format="PNG", optimize=True)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def get_thumbnail(storage, name, size):
+    """Return the path of the thumbnail for a stored image, generating it on a miss."""
+    source_path, target_path = thumbnail_path(storage, name, size)
+    if not os.path.exists(target_path):
+        make_thumbnail(source_path, target_path, size)
+    return target_path
+
+
+def thumbnail_url(fieldfile, size="small"):
+    return reverse("thumbnail", args=[size, fieldfile.name])
+
+
+def thumbnail_tag(fieldfile, size="small"):
+    """<img> for a changelist column; falls back to a link for files that are not images."""
+    if not fieldfile:
+        return ""
+    if not is_image(fieldfile.name):
+        return format_html('<a href="{}">{}</a>', fieldfile.url, posixpath.basename(fieldfile.name))
+    width, height = settings.THUMBNAIL_SIZES[size]
+    return format_html(
+        '<img src="{}" loading="lazy" style="max-width:{}px;max-height:{}px"/>',
+        thumbnail_url(fieldfile, size), width, height,
+    )
+
+
+@lru_cache(maxsize=None)
+def image_fields(model):
+    """Names of the model's fields holding images."""
+    return tuple(
+        field.name for field_model, field in file_fields()
+        if field_model is model and (isinstance(field, ImageField) or field.name in settings.IMAGE_FIELDS)
+    )
+
+
+def _generate_all(fieldfile):
+    # Runs after the commit: a failure here must not turn the saved request into an error
+    for size in settings.THUMBNAIL_SIZES:
+        try:
+            get_thumbnail(fieldfile.storage, fieldfile.name, size)
+        except (OSError, UnidentifiedImageError):
+            # Not readable as an image; the view will answer 404 for it
+            return
+        except Exception:
+            logger.exception("Could not generate %s thumbnails for %s", size, fieldfile.name)
+            return
+
+
+def remember_images(sender, instance, **kwargs):
+    deferred = instance.get_deferred_fields()
+    instance._thumbnail_names = {
+        name: getattr(instance, name).name for name in image_fields(sender) if name not in deferred
+    }
+
+
+def image_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    remembered = getattr(instance, "_thumbnail_names", {})
+    for name in image_fields(sender):
+        fieldfile = getattr(instance, name)
+        # Only a new file needs thumbnails; other saves of the record leave them as they are
+        if fieldfile and is_image(fieldfile.name) and remembered.get(name) != fieldfile.name:
+            transaction.on_commit(lambda fieldfile=fieldfile: _generate_all(fieldfile))
+        remembered[name] = fieldfile.name
+    instance._thumbnail_names = remembered
+
+
+def connect_signals():
+    """Generate thumbnails when a record's image field gets a new file."""
+    for model in {model for model, field in file_fields() if image_fields(model)}:
+        post_init.connect(remember_images, sender=model, dispatch_uid=f"thumbnail_init_{model._meta.label_lower}")
+        post_save.connect(image_saved, sender=model, dispatch_uid=f"thumbnail_{model._meta.label_lower}")
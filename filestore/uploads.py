@@ -0,0 +1,109 @@
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.utils import timezone
+
+from filestore.models import UploadSession
+from filestore.storage import TMP_DIR
+
+
+class UploadError(Exception):
+    pass
+
+
+def part_path(session):
+    return os.path.join(settings.MEDIA_ROOT, TMP_DIR, "uploads", f"{session.pk}.part")
+
+
+def write_chunk(session, start, stream, length, checksum=None):
+    """
+    Write `length` bytes from `stream` at offset `start` of the part file.
+
+    Chunks must arrive in order; a chunk the server already has is accepted
+    again without effect so clients can retry blindly. When `checksum` (hex
+    SHA-256 of the chunk) is given the offset only advances if it matches,
+    the next attempt simply overwrites the bad bytes.
+    """
+    if length > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError("Chunk too large")
+    if start + length > session.size:
+        raise UploadError("Chunk exceeds the declared file size")
+    if start + length <= session.received:
+        return session.received
+    if start != session.received:
+        raise UploadError(f"Expected chunk at offset {session.received}")
+
+    path = part_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sha256, written = hashlib.sha256(), 0
+    with open(path, "r+b" if os.path.exists(path) else "wb") as part:
+        part.seek(start)
+        while written < length:
+            data = stream.read(min(64 * 1024, length - written))
+            if not data:
+                break
+            sha256.update(data)
+            part.write(data)
+            written += len(data)
+    if written != length:
+        raise UploadError("Incomplete chunk")
+    if checksum and checksum.lower() != sha256.hexdigest():
+        raise UploadError("Chunk checksum mismatch")
+
+    # Guard against two requests racing for the same offset
+    if not UploadSession.objects.filter(pk=session.pk, received=start).update(
+            received=start + length, updated_at=timezone.now()):
+        session.refresh_from_db()
+        raise UploadError(f"Expected chunk at offset {session.received}")
+    session.received = start + length
+    return session.received
+
+
+def open_upload(session_id, user=None):
+    """Return the assembled upload as a File ready for FieldFile.save(), or None."""
+    try:
+        sessions = UploadSession.objects.filter(pk=session_id)
+        if user is not None:
+            sessions = sessions.filter(user=user)
+        session = sessions.first()
+    except ValidationError:
+        return None
+    if session is None or not session.is_complete:
+        return None
+    try:
+        fileobj = File(open(part_path(session), "rb"), name=session.filename)
+    except FileNotFoundError:
+        return None
+    fileobj.upload_session = session
+    return fileobj
+
+
+def release_uploads(forms):
+    """
+    Close the assembled uploads the forms' file fields received and drop
+    their sessions and part files; call once the models holding them are saved.
+    """
+    for form in forms:
+        for value in getattr(form, "cleaned_data", {}).values():
+            session = getattr(value, "upload_session", None)
+            if session is not None:
+                value.close()
+                discard(session)
+
+
+def discard(session):
+    try:
+        os.remove(part_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
+
+
+def expired_sessions():
+    return UploadSession.objects.filter(
+        updated_at__lt=timezone.now() - timedelta(seconds=settings.CHUNKED_UPLOAD_EXPIRY)
+    )
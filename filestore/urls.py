@@ -0,0 +1,8 @@
+from django.urls import path
+
+from filestore.views import UploadSessionCreateView, UploadSessionView
+
+urlpatterns = [
+    path("", UploadSessionCreateView.as_view(), name="chunked-upload-create"),
+    path("<uuid:pk>/", UploadSessionView.as_view(), name="chunked-upload"),
+]
@@ -0,0 +1,132 @@
+import os
+import re
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied
+from django.core.files.storage import default_storage
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+from PIL import Image, UnidentifiedImageError
+
+from account.models import CustomUser
+from filestore.models import UploadSession
+from filestore.registry import find_owner, organisation_lookup
+from filestore.responses import serve_file
+from filestore.storage import RESERVED_DIRS
+from filestore.thumbnails import get_thumbnail, is_image
+from filestore.uploads import UploadError, write_chunk
+from system.models.organisation import Organisation
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+def can_view_file(user, name):
+    """
+    Superusers see every file. Other users need the view permission on the
+    model the file belongs to and, for organisation data, membership of the
+    owning organisation. Users may always see their own signature.
+    """
+    if user.is_superuser:
+        return True
+    owner = find_owner(name)
+    if owner is None:
+        return False
+    model, pk = owner
+    if model is CustomUser and pk == user.pk:
+        return True
+    if not user.has_perm(f"{model._meta.app_label}.view_{model._meta.model_name}"):
+        return False
+    lookup = organisation_lookup(model)
+    if lookup is None:
+        return True
+    return model._default_manager.filter(
+        pk=pk, **{f"{lookup}__in": Organisation.objects.for_user(user).values("pk")}
+    ).exists()
+
+
+def serve_media(request, path):
+    """Serve a MEDIA_ROOT file to a user allowed to see it."""
+    if not request.user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if path.split("/")[0] in RESERVED_DIRS or not default_storage.exists(path):
+        raise Http404("File not found")
+    if not can_view_file(request.user, path):
+        raise PermissionDenied
+    full_path, digest = default_storage.locate(path)
+    try:
+        return serve_file(request, full_path, os.path.basename(path), digest=digest)
+    except FileNotFoundError:
+        raise Http404("File not found")
+
+
+def serve_thumbnail(request, size, path):
+    """Serve a cached thumbnail of an image the user may see, generating it on first use."""
+    if not request.user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if size not in settings.THUMBNAIL_SIZES or not is_image(path) or path.split("/")[0] in RESERVED_DIRS:
+        raise Http404("File not found")
+    if not default_storage.exists(path):
+        raise Http404("File not found")
+    if not can_view_file(request.user, path):
+        raise PermissionDenied
+    try:
+        thumbnail = get_thumbnail(default_storage, path, size)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError, ValueError):
+        raise Http404("File not found")
+    name = os.path.splitext(os.path.basename(path))[0] + ".png"
+    return serve_file(request, thumbnail, name, digest=os.path.basename(thumbnail)[:-4], max_age=settings.THUMBNAIL_MAX_AGE)
+
+
+def _session_state(session):
+    return {
+        "id": str(session.pk),
+        "filename": session.filename,
+        "size": session.size,
+        "offset": session.received,
+        "complete": session.is_complete,
+        "chunk_size": settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+    }
+
+
+class UploadSessionCreateView(View):
+    """Start a resumable upload: POST filename and size, get back the session id."""
+
+    def post(self, request):
+        filename = os.path.basename(request.POST.get("filename", "").strip())
+        try:
+            size = int(request.POST.get("size", ""))
+        except ValueError:
+            size = -1
+        if not filename or size < 0:
+            return JsonResponse({"error": "filename and size are required"}, status=400)
+        if size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            return JsonResponse({"error": "File too large"}, status=413)
+        session = UploadSession.objects.create(user=request.user, filename=filename, size=size)
+        return JsonResponse(_session_state(session), status=201)
+
+
+class UploadSessionView(View):
+    """
+    GET reports how many bytes have been received (the resume offset).
+    PUT appends one chunk, described by a Content-Range header and checked
+    against an optional X-Chunk-SHA256 header.
+    """
+
+    def get(self, request, pk):
+        return JsonResponse(_session_state(get_object_or_404(UploadSession, pk=pk, user=request.user)))
+
+    def put(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+        match = CONTENT_RANGE_RE.match(request.headers.get("Content-Range", ""))
+        if not match or int(match[3]) != session.size:
+            return JsonResponse({"error": "A valid Content-Range header is required"}, status=400)
+        start, end = int(match[1]), int(match[2])
+        try:
+            write_chunk(session, start, request, end - start + 1, request.headers.get("X-Chunk-SHA256"))
+        except UploadError as e:
+            state = _session_state(session)
+            state["error"] = str(e)
+            return JsonResponse(state, status=409)
+        return JsonResponse(_session_state(session))
@@ -0,0 +1,40 @@
+from django import forms
+from django.urls import reverse
+
+from filestore.uploads import open_upload
+
+
+class ChunkedFileInput(forms.ClearableFileInput):
+    """
+    File input that uploads in resumable chunks (static/assets/js/chunked_upload.js)
+    before the form is submitted. The form then only posts the upload session
+    id in a hidden `<name>__upload` field; only sessions of `user` are accepted.
+    """
+    template_name = "filestore/widgets/chunked_file_input.html"
+
+    def __init__(self, attrs=None, user=None):
+        super().__init__(attrs)
+        self.user = user
+
+    class Media:
+        js = ["assets/js/chunked_upload.js"]
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-chunked-upload"] = reverse("chunked-upload-create")
+        context["widget"]["upload_name"] = f"{name}__upload"
+        return context
+
+    def value_from_datadict(self, data, files, name):
+        session_id = data.get(f"{name}__upload")
+        if session_id and self.user is not None and self.user.is_authenticated:
+            # The form reads the value more than once; open the part file only once
+            uploads = self.__dict__.setdefault("_uploads", {})
+            if session_id not in uploads:
+                uploads[session_id] = open_upload(session_id, user=self.user)
+            if uploads[session_id] is not None:
+                return uploads[session_id]
+        return super().value_from_datadict(data, files, name)
+
+    def value_omitted_from_data(self, data, files, name):
+        return not data.get(f"{name}__upload") and super().value_omitted_from_data(data, files, name)
@@ -0,0 +1,39 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from notification.models import OutboxMessage, ReminderLog
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ("recipient", "channel", "subject", "status", "attempts", "next_attempt_at", "sent_at", "created_at")
+    list_filter = ("channel", "status")
+    search_fields = ("recipient", "subject")
+    date_hierarchy = "created_at"
+    # Messages are written by the code that queued them; the body may hold a
+    # set-password link or verification code and is not for editing
+    readonly_fields = ("channel", "recipient", "from_email", "subject", "body", "attempts", "locked_at", "last_error",
+                       "sent_at", "created_at")
+    actions = ["retry_now"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Retry selected messages now")
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=OutboxMessage.Status.SENT).update(
+            status=OutboxMessage.Status.PENDING, next_attempt_at=timezone.now(), attempts=0, locked_at=None,
+        )
+        self.message_user(request, f"{updated} message(s) queued for delivery.")
+
+
+@admin.register(ReminderLog)
+class ReminderLogAdmin(admin.ModelAdmin):
+    list_display = ("content_type", "object_id", "field_name", "due_date", "stage", "user", "sent_at")
+    list_filter = ("stage", "content_type")
+    date_hierarchy = "sent_at"
+    list_select_related = ("content_type", "user")
+    readonly_fields = ("content_type", "object_id", "field_name", "due_date", "stage", "user", "sent_at")
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class NotificationConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'notification'
+
+    def ready(self):
+        from notification.signals import connect_signals
+        connect_signals()
@@ -0,0 +1,63 @@
+import multiprocessing
+import signal
+import time
+
+from django import db
+from django.core.management.base import BaseCommand
+
+from notification.outbox import OutboxDeliverer, claim_batch
+
+
+def run_worker(batch_size, poll_interval, once=False):
+    deliverer = OutboxDeliverer()
+    try:
+        while True:
+            messages = claim_batch(batch_size)
+            if messages:
+                deliverer.deliver(messages)
+                continue
+            if once:
+                break
+            # Nothing due: hang up rather than hold an idle SMTP session
+            deliverer.close()
+            time.sleep(poll_interval)
+    finally:
+        deliverer.close()
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails and SMS messages using a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=2)
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--poll-interval", type=float, default=5)
+        parser.add_argument("--once", action="store_true", help="Drain due messages in this process and exit.")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            run_worker(options["batch_size"], options["poll_interval"], once=True)
+            return
+
+        # Children must open their own database connections
+        db.connections.close_all()
+        workers = [
+            multiprocessing.Process(
+                target=run_worker, args=(options["batch_size"], options["poll_interval"]), daemon=True,
+            )
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} outbox workers")
+
+        def stop(signum, frame):
+            for worker in workers:
+                worker.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            stop(None, None)
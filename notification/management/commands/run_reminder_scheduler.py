@@ -0,0 +1,37 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from notification.reminders import is_dirty, next_wakeup, run_scan
+
+
+class Command(BaseCommand):
+    help = "Queue due-date reminder digests, sleeping until the next date that can trigger one."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--poll-interval", type=float, default=30,
+                            help="Seconds between checks for edited records while asleep.")
+        parser.add_argument("--once", action="store_true", help="Run one scan and exit.")
+
+    def handle(self, *args, **options):
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        while not stopping:
+            today = timezone.localdate()
+            items, emails = run_scan(today, batch_size=options["batch_size"])
+            if items:
+                self.stdout.write(f"{items} reminder(s) in {emails} digest(s) queued")
+            if options["once"]:
+                return
+            # Nothing can enter a window before this unless a record is edited, which sets the dirty flag
+            wakeup = next_wakeup(today)
+            while not stopping and (wakeup is None or timezone.now() < wakeup) and not is_dirty():
+                time.sleep(options["poll_interval"])
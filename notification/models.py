@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """
+    An email or SMS waiting to be delivered by the outbox worker.
+
+    Rows are written inside the caller's transaction so a message is only
+    sent when the change that produced it has been committed.
+    """
+
+    class Channel(models.TextChoices):
+        EMAIL = 'EMAIL', 'Email'
+        SMS = 'SMS', 'SMS'
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        SENDING = 'SENDING', 'Sending'
+        SENT = 'SENT', 'Sent'
+        FAILED = 'FAILED', 'Failed'
+
+    channel = models.CharField(max_length=10, choices=Channel.choices, default=Channel.EMAIL)
+    recipient = models.CharField(max_length=255)
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255, blank=True)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Outbox Message"
+        verbose_name_plural = "Outbox"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_channel_display()} to {self.recipient} ({self.get_status_display()})"
+
+
+class ReminderLog(models.Model):
+    """
+    One reminder stage sent for one dated item (see notification.reminders).
+    The unique constraint is what keeps the scheduler from reminding twice;
+    moving the date makes the item eligible again.
+    """
+
+    class Stage(models.TextChoices):
+        UPCOMING = 'UPCOMING', 'Upcoming'
+        OVERDUE = 'OVERDUE', 'Overdue'
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    item = GenericForeignKey("content_type", "object_id")
+    field_name = models.CharField(max_length=100)
+    due_date = models.DateField()
+    stage = models.CharField(max_length=10, choices=Stage.choices)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Reminder"
+        verbose_name_plural = "Reminders sent"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "field_name", "due_date", "stage"], name="reminder_once",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_stage_display()} reminder for {self.content_type} {self.object_id} ({self.due_date})"
@@ -0,0 +1,127 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notification.models import OutboxMessage
+from notification.sms import get_sms_backend
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, body, recipient_list, from_email=None):
+    """Queue one email per recipient. Call inside the transaction that produced it."""
+    return enqueue_emails([(subject, body, recipient) for recipient in recipient_list], from_email=from_email)
+
+
+def enqueue_emails(messages, from_email=None, batch_size=500):
+    """Queue (subject, body, recipient) tuples with a single bulk insert."""
+    return OutboxMessage.objects.bulk_create([
+        OutboxMessage(
+            channel=OutboxMessage.Channel.EMAIL,
+            recipient=recipient,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            subject=subject,
+            body=body,
+        )
+        for subject, body, recipient in messages
+    ], batch_size=batch_size)
+
+
+def enqueue_sms(recipient, message):
+    return OutboxMessage.objects.create(channel=OutboxMessage.Channel.SMS, recipient=recipient, body=message)
+
+
+def claim_batch(batch_size):
+    """
+    Mark up to batch_size due messages as SENDING and return them.
+
+    Rows left in SENDING by a crashed worker are reclaimed once
+    OUTBOX_LOCK_TIMEOUT seconds have passed.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.OUTBOX_LOCK_TIMEOUT)
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=OutboxMessage.Status.PENDING, next_attempt_at__lte=now)
+                | Q(status=OutboxMessage.Status.SENDING, locked_at__lt=stale)
+            )
+            .order_by("next_attempt_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(status=OutboxMessage.Status.SENDING, locked_at=now)
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by("next_attempt_at"))
+
+
+class OutboxDeliverer:
+    """
+    Delivers claimed messages, keeping the SMTP connection and SMS gateway
+    open across batches so a worker does not reconnect per message.
+    """
+
+    def __init__(self):
+        self.email_connection = None
+        self.sms_backend = None
+
+    def close(self):
+        for backend in (self.email_connection, self.sms_backend):
+            if backend is not None:
+                try:
+                    backend.close()
+                except Exception:
+                    logger.exception("Error closing outbox backend")
+        self.email_connection = self.sms_backend = None
+
+    def _send(self, message):
+        if message.channel == OutboxMessage.Channel.SMS:
+            if self.sms_backend is None:
+                self.sms_backend = get_sms_backend()
+                self.sms_backend.open()
+            self.sms_backend.send(message.recipient, message.body)
+            return
+        if self.email_connection is None:
+            self.email_connection = get_connection(fail_silently=False)
+            self.email_connection.open()
+        EmailMessage(
+            message.subject, message.body, message.from_email or settings.DEFAULT_FROM_EMAIL,
+            [message.recipient], connection=self.email_connection,
+        ).send()
+
+    def deliver(self, messages):
+        sent, failed = [], []
+        for message in messages:
+            try:
+                self._send(message)
+            except Exception as e:
+                logger.warning("Outbox delivery of %s failed: %s", message.pk, e)
+                # Drop the connections, they may be in a broken state
+                self.close()
+                message.last_error = str(e)
+                failed.append(message)
+            else:
+                sent.append(message.pk)
+
+        now = timezone.now()
+        if sent:
+            OutboxMessage.objects.filter(pk__in=sent).update(
+                status=OutboxMessage.Status.SENT, sent_at=now, locked_at=None, last_error="",
+            )
+        for message in failed:
+            message.attempts += 1
+            if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                message.status = OutboxMessage.Status.FAILED
+            else:
+                message.status = OutboxMessage.Status.PENDING
+                backoff = settings.OUTBOX_RETRY_BACKOFF * 2 ** (message.attempts - 1)
+                message.next_attempt_at = now + timedelta(seconds=min(backoff, settings.OUTBOX_MAX_BACKOFF))
+            message.locked_at = None
+        OutboxMessage.objects.bulk_update(
+            failed, ["status", "attempts", "next_attempt_at", "locked_at", "last_error"]
+        )
+        return len(sent), len(failed)
@@ -0,0 +1,189 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from notification.models import ReminderLog
+from notification.outbox import enqueue_emails
+
+logger = logging.getLogger(__name__)
+
+# Set by signals when a dated record changes so the worker rescans before its next wake-up
+DIRTY_KEY = "notification:reminders:dirty"
+
+
+class ReminderSource:
+    """A dated field to remind about, the user responsible for it and which rows are finished."""
+
+    def __init__(self, model, date_field, user_field, label, exclude=None, current=None, select_related=()):
+        self.model_label = model
+        self.date_field = date_field
+        self.user_field = user_field
+        self.label = label
+        self.exclude = exclude or {}
+        self.current = current
+        # Relations the model's __str__ reads, so describing a batch stays one query
+        self.select_related = select_related
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def pending(self):
+        queryset = self.model._default_manager.filter(**{f"{self.user_field}__isnull": False})
+        if self.exclude:
+            queryset = queryset.exclude(**self.exclude)
+        if self.current:
+            queryset = self.current(queryset)
+        return queryset
+
+
+def _latest_review(queryset):
+    # Only the newest review's next_review_date is still an appointment
+    newer = queryset.model._default_manager.filter(commitment=OuterRef("commitment"), review_date__gt=OuterRef("review_date"))
+    return queryset.filter(~Exists(newer))
+
+
+SOURCES = [
+    ReminderSource("system.CommitmentAction", "due_date", "owner", "Commitment action due", exclude={"status": "done"}),
+    ReminderSource("system.CommitmentReview", "next_review_date", "reviewer", "Commitment review due",
+                   current=_latest_review, select_related=("commitment",)),
+    ReminderSource("system.StakeholderRequirement", "next_review_date", "responsible_person", "Stakeholder requirement review",
+                   exclude={"status": "closed"}, select_related=("stakeholder",)),
+    ReminderSource("system.QualityPolicy", "review_date", "developed_by", "Quality policy review", exclude={"is_active": False}),
+    ReminderSource("system.SOP", "review_date", "created_by", "SOP review", exclude={"is_active": False}),
+    ReminderSource("system.RiskOpportunityResponse", "due_date", "owner", "Risk/opportunity response due",
+                   exclude={"status__in": ["done", "closed", "completed"]}),
+    ReminderSource("system.ResourcePlan", "review_date", "responsible", "Resource plan review"),
+]
+
+
+def windows(today):
+    """(stage, first date, last date) ranges a due date must fall in to be reminded about today."""
+    return [
+        (ReminderLog.Stage.UPCOMING, today, today + timedelta(days=settings.REMINDER_LEAD_DAYS)),
+        (ReminderLog.Stage.OVERDUE, today - timedelta(days=settings.REMINDER_OVERDUE_DAYS), today - timedelta(days=1)),
+    ]
+
+
+def due_items(source, stage, start, end, batch_size):
+    """
+    Yield batches of (pk, due date, user id, label) in the window, in primary
+    key order, skipping items that already had this reminder for this date.
+    The date range is answered from the field's index.
+    """
+    date_field = source.date_field
+    content_type = ContentType.objects.get_for_model(source.model)
+    sent = ReminderLog.objects.filter(
+        content_type=content_type, object_id=OuterRef("pk"), field_name=date_field,
+        due_date=OuterRef(date_field), stage=stage,
+    )
+    queryset = (
+        source.pending()
+        .filter(**{f"{date_field}__gte": start, f"{date_field}__lte": end})
+        .filter(~Exists(sent))
+        .select_related(*source.select_related)
+        .order_by("pk")
+    )
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+        yield [(obj.pk, getattr(obj, date_field), getattr(obj, f"{source.user_field}_id"), str(obj)) for obj in batch]
+
+
+def _line(source, stage, due, description, today):
+    if stage == ReminderLog.Stage.OVERDUE:
+        when = f"overdue since {due:%d %b %Y}"
+    elif due == today:
+        when = "due today"
+    else:
+        when = f"due {due:%d %b %Y}"
+    return f"- {source.label}: {description} ({when})"
+
+
+def send_digests(entries):
+    """Write the logs and queue one email per user in one transaction. Returns the number of emails."""
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    by_user = defaultdict(list)
+    for log, line in entries:
+        by_user[log.user_id].append(line)
+    emails = dict(User.objects.filter(pk__in=by_user, is_active=True).exclude(email="").values_list("pk", "email"))
+    with transaction.atomic():
+        ReminderLog.objects.bulk_create([log for log, _ in entries])
+        enqueue_emails([
+            (
+                f"QMS reminders: {len(lines)} item(s) need attention",
+                "The following items are due or overdue:\n\n" + "\n".join(sorted(lines)),
+                emails[user_id],
+            )
+            for user_id, lines in by_user.items() if user_id in emails
+        ])
+    return sum(1 for user_id in by_user if user_id in emails)
+
+
+def run_scan(today=None, batch_size=500):
+    """
+    Find every item entering a reminder window and send per-user digests.
+    Returns (items reminded, emails queued).
+    """
+    today = today or timezone.localdate()
+    cache.delete(DIRTY_KEY)
+    entries = []
+    for source in SOURCES:
+        content_type = ContentType.objects.get_for_model(source.model)
+        for stage, start, end in windows(today):
+            for batch in due_items(source, stage, start, end, batch_size):
+                for pk, due, user_id, description in batch:
+                    log = ReminderLog(content_type=content_type, object_id=pk, field_name=source.date_field,
+                                      due_date=due, stage=stage, user_id=user_id)
+                    entries.append((log, _line(source, stage, due, description, today)))
+    if not entries:
+        return 0, 0
+    try:
+        return len(entries), send_digests(entries)
+    except IntegrityError:
+        # Another scheduler logged some of these first; the next pass picks up the rest
+        logger.warning("Reminder scan raced with another scheduler, retrying on the next pass")
+        mark_dirty()
+        return 0, 0
+
+
+def next_wakeup(today=None):
+    """
+    The next time an item can enter a window without being edited: a date
+    coming into the lead period or an open item turning overdue. Each
+    source costs two ORDER BY date LIMIT 1 lookups on the date index.
+    """
+    today = today or timezone.localdate()
+    lead = timedelta(days=settings.REMINDER_LEAD_DAYS)
+    candidates = []
+    for source in SOURCES:
+        date_field = source.date_field
+        dates = source.pending().order_by(date_field).values_list(date_field, flat=True)
+        entering = dates.filter(**{f"{date_field}__gt": today + lead}).first()
+        if entering:
+            candidates.append(entering - lead)
+        turning_overdue = dates.filter(**{f"{date_field}__gte": today}).first()
+        if turning_overdue:
+            candidates.append(turning_overdue + timedelta(days=1))
+    if not candidates:
+        return None
+    return timezone.make_aware(datetime.combine(min(candidates), time.min))
+
+
+def mark_dirty():
+    cache.set(DIRTY_KEY, True, None)
+
+
+def is_dirty():
+    return bool(cache.get(DIRTY_KEY))
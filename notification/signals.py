@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+
+from notification.reminders import SOURCES, mark_dirty
+
+
+def dated_item_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_dirty()
+
+
+def connect_signals():
+    for source in SOURCES:
+        post_save.connect(dated_item_saved, sender=source.model, dispatch_uid=f"reminders:{source.model_label}")
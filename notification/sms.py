@@ -0,0 +1,47 @@
+import sys
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseSMSBackend:
+    """Interface for SMS gateways, modelled on Django's email backends."""
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, recipient, message):
+        raise NotImplementedError("SMS backends must implement send()")
+
+
+class ConsoleSMSBackend(BaseSMSBackend):
+    """Writes messages to stdout; for development."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.RLock()
+
+    def send(self, recipient, message):
+        with self._lock:
+            self.stream.write(f"SMS to {recipient}:\n{message}\n{'-' * 79}\n")
+            self.stream.flush()
+
+
+class FileSMSBackend(ConsoleSMSBackend):
+    """Appends messages to settings.SMS_FILE_PATH; for testing."""
+
+    def __init__(self):
+        super().__init__()
+        self.stream = None
+
+    def send(self, recipient, message):
+        with self._lock, open(settings.SMS_FILE_PATH, "a", encoding="utf-8") as stream:
+            stream.write(f"SMS to {recipient}:\n{message}\n{'-' * 79}\n")
+
+
+def get_sms_backend():
+    return import_string(settings.SMS_BACKEND)()
@@ -1,13 +1,19 @@
 # your_project/middleware.py
+import math
+
+from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.conf import settings
 from django.urls import resolve
 
+from account.ratelimit import check_request
+
 EXEMPT_URLS = [
     '/register/',
     '/login/',
     '/admin/',  # optional
     '/password_reset/',
+    '/reset/',
     '/password_reset_done/'
     '/password_reset_confirm/'
     '/password_reset_complete/'
@@ -22,3 +28,53 @@ class LoginRequiredMiddleware:
         if not request.user.is_authenticated and not any(path.startswith(url) for url in EXEMPT_URLS):
             return redirect(settings.LOGIN_URL)
         return self.get_response(request)
+
+
+OTP_EXEMPT_URLS = [
+    '/otp/',
+    '/login/',
+    '/account/logout/',
+    '/admin/logout/',
+    '/static/',
+]
+
+
+class OTPRequiredMiddleware:
+    """
+    Sends users with two factor authentication to the OTP form until the
+    session has been verified. The flag lives in the session, so the check
+    costs no more than the session lookup the request already made.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = request.user
+        if (user.is_authenticated and user.use_two_factor_authentication
+                and request.session.get('otp_verified') is not True
+                and not any(request.path_info.startswith(url) for url in OTP_EXEMPT_URLS)):
+            return redirect('otp-verification')
+        return self.get_response(request)
+
+
+class RateLimitMiddleware:
+    """
+    Token bucket limits for the login, registration and password reset
+    endpoints (settings.RATELIMIT_RULES). Installed before the session and
+    auth middleware so a rejected request costs no database work.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method == 'POST':
+            path = request.path_info
+            for rule in settings.RATELIMIT_RULES:
+                if path in rule['paths']:
+                    wait = check_request(request, rule)
+                    if wait:
+                        response = HttpResponse('Too many requests. Please try again later.', status=429)
+                        response['Retry-After'] = str(math.ceil(wait))
+                        return response
+                    break
+        return self.get_response(request)
@@ -45,11 +45,15 @@ INSTALLED_APPS = [
     'crispy_bootstrap5',
     'account',
     'conf',
-    'system'
+    'system',
+    'notification',
+    'filestore',
+    'search',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'qms.middleware.RateLimitMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -57,6 +61,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'qms.middleware.LoginRequiredMiddleware',
+    'qms.middleware.OTPRequiredMiddleware',
 ]
 
 ROOT_URLCONF = 'qms.urls'
@@ -138,6 +143,41 @@ if DEBUG:
         BASE_DIR / "static",
     )
 
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Uploaded files are deduplicated by content (see filestore.storage)
+STORAGES = {
+    "default": {
+        "BACKEND": "filestore.storage.DedupFileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Resumable chunked uploads (see filestore.uploads)
+CHUNKED_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+CHUNKED_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+CHUNKED_UPLOAD_EXPIRY = 24 * 60 * 60
+
+# Hand media downloads to the web server after the permission check:
+# None streams from Django, 'xsendfile' (Apache mod_xsendfile) or 'nginx' (X-Accel-Redirect)
+SENDFILE_BACKEND = None
+# nginx `internal` location aliased to MEDIA_ROOT, used with the 'nginx' backend
+SENDFILE_URL_PREFIX = '/protected-media/'
+
+# Files whose text is extracted for search by `run_text_extraction` ('app.Model.field')
+TEXT_EXTRACTION_FIELDS = [
+    'system.SOP.file',
+    'system.DocumentRegister.file',
+    'system.QualityPolicyEvidence.file',
+    'conf.StandardOperatingProcedure.sop_file',
+]
+TEXT_EXTRACTION_MAX_CHARS = 1000000
+TEXT_EXTRACTION_LOCK_TIMEOUT = 600
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -145,12 +185,107 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = "account.CustomUser"
 
+AUTHENTICATION_BACKENDS = ['account.backends.CachedPermissionBackend']
+
+# Seconds a user's permission set stays in the cache (entries are also versioned by signals)
+PERMISSION_CACHE_TIMEOUT = 60 * 60
+
 IMAGE_FIELDS = ["image", "picture", 'icon', 'flag', 'cover_image', 'cover']
 
+# Thumbnails shown in changelists, generated on upload and on first request (see filestore.thumbnails)
+THUMBNAIL_SIZES = {
+    'small': (80, 80),
+    'medium': (240, 240),
+}
+THUMBNAIL_MAX_AGE = 7 * 24 * 60 * 60
+
+# Cached risk/opportunity heat maps; saves invalidate them, bulk updates wait for the timeout
+HEATMAP_CACHE_TIMEOUT = 5 * 60
+# Most dates one /heatmap/<kind>/trend/ request may ask for, each is one as-of query
+RISK_TREND_MAX_POINTS = 24
+
+# Generated organisation charts (see system.orgchart); role saves invalidate them
+ORG_CHART_CACHE_TIMEOUT = 24 * 60 * 60
+# Roles listed per page under the chart
+ORG_CHART_PAGE_SIZE = 100
+
+# Monte Carlo risk exposure (see system.simulation): annual probability per likelihood level,
+# median loss per impact level, lognormal spread, and (probability, loss) factors per response type
+RISK_LIKELIHOOD_PROBABILITIES = {1: 0.05, 2: 0.15, 3: 0.35, 4: 0.6, 5: 0.85}
+RISK_IMPACT_LOSSES = {1: 1000, 2: 10000, 3: 50000, 4: 250000, 5: 1000000}
+RISK_LOSS_SIGMA = 0.8
+RISK_RESPONSE_EFFECTS = {
+    'mitigate': (0.5, 1.0),
+    'transfer': (1.0, 0.4),
+    'avoid': (0.1, 1.0),
+    'share': (1.0, 0.6),
+    'accept': (1.0, 1.0),
+}
+RISK_SIMULATION_TRIALS = 20000
+RISK_SIMULATION_MAX_TRIALS = 100000
+RISK_SIMULATION_CACHE_TIMEOUT = 24 * 60 * 60
+
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'          # After successful login
 LOGOUT_REDIRECT_URL = '/login/'  # After logout
 
+# Outbox delivery (see notification.outbox)
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BACKOFF = 60  # seconds, doubled on every failed attempt
+OUTBOX_MAX_BACKOFF = 60 * 60
+OUTBOX_LOCK_TIMEOUT = 10 * 60
+
+# Due-date reminder digests (see notification.reminders): days of notice before a date,
+# and how long after it an overdue item still gets its one overdue reminder
+REMINDER_LEAD_DAYS = 7
+REMINDER_OVERDUE_DAYS = 30
+
+# Unified timeline (see system.timeline): events per page and the widest range one calendar request may ask for
+TIMELINE_PAGE_SIZE = 50
+TIMELINE_CALENDAR_MAX_DAYS = 92
+
+SMS_BACKEND = 'notification.sms.ConsoleSMSBackend'
+SMS_FILE_PATH = os.path.join(BASE_DIR, 'sent_sms.log')
+
+# Two factor login codes (see account.otp)
+OTP_DIGITS = 6
+OTP_TIMEOUT = 5 * 60
+OTP_MAX_ATTEMPTS = 5
+# Codes one user may be sent per window; wrong attempts are also counted over the window
+OTP_MAX_ISSUES = 5
+OTP_ISSUE_WINDOW = 15 * 60
+
+# Token bucket limits per client IP and per submitted account (see account.ratelimit)
+RATELIMIT_USE_CACHE = True
+RATELIMIT_RULES = [
+    {
+        'scope': 'login',
+        'paths': ['/login/', '/account/login/', '/admin/login/'],
+        'account_field': 'username',
+        'ip_rate': '20/m',
+        'account_rate': '10/m',
+    },
+    {
+        'scope': 'register',
+        'paths': ['/register/'],
+        'account_field': 'email',
+        'ip_rate': '10/h',
+        'account_rate': '3/h',
+    },
+    {
+        'scope': 'password_reset',
+        'paths': ['/password_reset/', '/account/password_reset/'],
+        'account_field': 'email',
+        'ip_rate': '10/h',
+        'account_rate': '3/h',
+    },
+    {
+        'scope': 'otp',
+        'paths': ['/otp/', '/otp/resend/'],
+        'ip_rate': '20/m',
+    },
+]
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = ["bootstrap5"]
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
@@ -18,8 +18,9 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from django.conf.urls.static import static
-from account.views import CustomLoginView, RegisterView
+from account.views import CustomLoginView, RegisterView, OTPVerificationView, OTPResendView, RateLimitStatsView
 from system.views import HomeView
+from filestore.views import serve_media, serve_thumbnail
 from django.contrib.auth import views as auth_views
 
 urlpatterns = [
@@ -27,16 +28,19 @@ urlpatterns = [
     path('account/', include('django.contrib.auth.urls')),  # <-- Built-in views
 
     path('login/', CustomLoginView.as_view(), name='login'),
+    path('otp/', OTPVerificationView.as_view(), name='otp-verification'),
+    path('otp/resend/', OTPResendView.as_view(), name='otp-resend'),
+    path('ratelimit/stats/', RateLimitStatsView.as_view(), name='ratelimit-stats'),
     path('register/', RegisterView.as_view(), name='signup_register'),
     path('password_reset/', auth_views.PasswordResetView.as_view(), name='password_reset'),
     path('password_reset/done/', auth_views.PasswordResetDoneView.as_view(), name='password_reset_done'),
     path('reset/<uidb64>/<token>/', auth_views.PasswordResetConfirmView.as_view(), name='password_reset_confirm'),
     path('reset/done/', auth_views.PasswordResetCompleteView.as_view(), name='password_reset_complete'),
+    path('uploads/', include('filestore.urls')),
+    path('thumbnails/<str:size>/<path:path>', serve_thumbnail, name='thumbnail'),
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", serve_media, name='media'),
     path("", include("system.urls"))
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
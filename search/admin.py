@@ -0,0 +1,48 @@
+from django.contrib import admin
+from django.urls import NoReverseMatch, reverse
+from django.utils.html import format_html
+
+from search.models import DocumentText
+
+
+@admin.register(DocumentText)
+class DocumentTextAdmin(admin.ModelAdmin):
+    list_display = ("file_name", "source", "content_type", "status", "excerpt", "extracted_at")
+    list_filter = ("status", "content_type")
+    search_fields = ("file_name",)
+    date_hierarchy = "extracted_at"
+    readonly_fields = ("content_type", "object_id", "field_name", "file_name", "fingerprint", "status",
+                       "text", "error", "extracted_at", "updated_at")
+    exclude = ("locked_at",)
+    actions = ["reindex"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("content_type")
+
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text hits must stay within the changelist filters applied to the incoming queryset
+        original = queryset
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            queryset |= original.filter(pk__in=self.model.objects.search(search_term).values("pk"))
+        return queryset, may_have_duplicates
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description="Record")
+    def source(self, obj):
+        try:
+            url = reverse(f"admin:{obj.content_type.app_label}_{obj.content_type.model}_change", args=[obj.object_id])
+        except NoReverseMatch:
+            return obj.object_id
+        return format_html('<a href="{}">Open record</a>', url)
+
+    @admin.display(description="Text")
+    def excerpt(self, obj):
+        return obj.text[:150]
+
+    @admin.action(description="Extract text again")
+    def reindex(self, request, queryset):
+        updated = queryset.update(status=DocumentText.Status.PENDING, fingerprint="", text="", locked_at=None)
+        self.message_user(request, f"{updated} document(s) queued for extraction.")
@@ -0,0 +1,54 @@
+import os
+import zipfile
+from xml.etree import ElementTree
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class UnsupportedFile(Exception):
+    pass
+
+
+def extract_txt(fileobj):
+    return fileobj.read().decode("utf-8", errors="replace")
+
+
+def extract_docx(fileobj):
+    """Paragraph text from word/document.xml, parsed incrementally."""
+    paragraphs, current = [], []
+    with zipfile.ZipFile(fileobj) as archive, archive.open("word/document.xml") as xml:
+        for event, element in ElementTree.iterparse(xml, events=("end",)):
+            if element.tag == f"{WORD_NS}t" and element.text:
+                current.append(element.text)
+            elif element.tag == f"{WORD_NS}tab":
+                current.append("\t")
+            elif element.tag == f"{WORD_NS}p":
+                paragraphs.append("".join(current))
+                current = []
+                element.clear()
+    return "\n".join(paragraphs)
+
+
+def extract_pdf(fileobj):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise UnsupportedFile("PDF extraction requires the pypdf package")
+    return "\n".join(page.extract_text() or "" for page in PdfReader(fileobj).pages)
+
+
+EXTRACTORS = {
+    ".txt": extract_txt,
+    ".csv": extract_txt,
+    ".md": extract_txt,
+    ".docx": extract_docx,
+    ".pdf": extract_pdf,
+}
+
+
+def extract_text(fileobj, name):
+    """Return the plain text of an open binary file, chosen by its extension."""
+    extractor = EXTRACTORS.get(os.path.splitext(name)[1].lower())
+    if extractor is None:
+        raise UnsupportedFile(f"No text extractor for '{os.path.basename(name)}'")
+    return extractor(fileobj)
@@ -0,0 +1,149 @@
+import logging
+import os
+from datetime import timedelta
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from search.extract import UnsupportedFile, extract_text
+from search.models import DocumentText
+
+logger = logging.getLogger(__name__)
+
+# Prefix of fingerprints taken from file metadata rather than a content hash
+STAT_FINGERPRINT = "stat:"
+
+
+@lru_cache(maxsize=None)
+def tracked_fields():
+    """{model: [file field names]} from TEXT_EXTRACTION_FIELDS ('app.Model.field')."""
+    fields = {}
+    for path in settings.TEXT_EXTRACTION_FIELDS:
+        app_label, model_name, field_name = path.split(".")
+        fields.setdefault(apps.get_model(app_label, model_name), []).append(field_name)
+    return fields
+
+
+def file_fingerprint(fieldfile):
+    """Blob digest for deduplicated files, otherwise modification time and size."""
+    storage = fieldfile.storage
+    if hasattr(storage, "locate"):
+        full_path, digest = storage.locate(fieldfile.name)
+        if digest:
+            return digest
+    else:
+        full_path = storage.path(fieldfile.name)
+    stat = os.stat(full_path)
+    return f"{STAT_FINGERPRINT}{int(stat.st_mtime):x}-{stat.st_size:x}"
+
+
+def queue_instance(instance):
+    """
+    Queue extraction for the tracked files of a saved record. A row is only
+    reset to pending when the stored file name has changed, so ordinary edits
+    to the record cost a single query.
+    """
+    content_type = ContentType.objects.get_for_model(instance)
+    existing = dict(
+        DocumentText.objects.filter(content_type=content_type, object_id=instance.pk)
+        .values_list("field_name", "file_name")
+    )
+    for field_name in tracked_fields()[type(instance)]:
+        name = getattr(instance, field_name).name or ""
+        if existing.get(field_name) == name:
+            continue
+        if not name:
+            DocumentText.objects.filter(content_type=content_type, object_id=instance.pk, field_name=field_name).delete()
+            continue
+        DocumentText.objects.update_or_create(
+            content_type=content_type, object_id=instance.pk, field_name=field_name,
+            defaults={"file_name": name, "status": DocumentText.Status.PENDING, "locked_at": None, "error": ""},
+        )
+
+
+def queue_all(model):
+    """Queue every record of `model` that has no index row yet. Returns the number queued."""
+    content_type = ContentType.objects.get_for_model(model)
+    queued = 0
+    for field_name in tracked_fields()[model]:
+        indexed = DocumentText.objects.filter(content_type=content_type, field_name=field_name).values("object_id")
+        rows = [
+            DocumentText(content_type=content_type, object_id=pk, field_name=field_name, file_name=name)
+            for pk, name in model._default_manager.exclude(pk__in=indexed)
+            .exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+            .values_list("pk", field_name).iterator()
+        ]
+        DocumentText.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+        queued += len(rows)
+    return queued
+
+
+def claim_batch(batch_size):
+    """Mark up to batch_size pending rows as EXTRACTING and return them, reclaiming stale ones."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TEXT_EXTRACTION_LOCK_TIMEOUT)
+    with transaction.atomic():
+        ids = list(
+            DocumentText.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=DocumentText.Status.PENDING) | Q(status=DocumentText.Status.EXTRACTING, locked_at__lt=stale))
+            .order_by("updated_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        DocumentText.objects.filter(id__in=ids).update(status=DocumentText.Status.EXTRACTING, locked_at=now)
+    return list(DocumentText.objects.filter(id__in=ids).select_related("content_type"))
+
+
+def _extract(row):
+    """Return (status, fingerprint, text, error) for a claimed row."""
+    instance = row.content_object
+    fieldfile = getattr(instance, row.field_name, None) if instance is not None else None
+    if not fieldfile or fieldfile.name != row.file_name:
+        # Record or file is gone; the save that replaced it queued a new row
+        return None
+    try:
+        fingerprint = file_fingerprint(fieldfile)
+    except OSError as e:
+        return DocumentText.Status.FAILED, "", "", str(e)
+    if fingerprint == row.fingerprint and row.text:
+        return DocumentText.Status.DONE, fingerprint, row.text, ""
+    if not fingerprint.startswith(STAT_FINGERPRINT):
+        # The same content indexed elsewhere does not need extracting again
+        known = (
+            DocumentText.objects.filter(fingerprint=fingerprint, status=DocumentText.Status.DONE)
+            .values_list("text", flat=True).first()
+        )
+        if known is not None:
+            return DocumentText.Status.DONE, fingerprint, known, ""
+    try:
+        with fieldfile.storage.open(fieldfile.name, "rb") as fileobj:
+            text = extract_text(fileobj, fieldfile.name)
+    except UnsupportedFile as e:
+        return DocumentText.Status.UNSUPPORTED, fingerprint, "", str(e)
+    except Exception as e:
+        logger.warning("Text extraction of %s failed: %s", row.file_name, e)
+        return DocumentText.Status.FAILED, fingerprint, "", str(e)
+    return DocumentText.Status.DONE, fingerprint, text[:settings.TEXT_EXTRACTION_MAX_CHARS], ""
+
+
+def process(rows):
+    """Extract and store text for claimed rows. Returns the number indexed."""
+    indexed = 0
+    for row in rows:
+        result = _extract(row)
+        claimed = DocumentText.objects.filter(pk=row.pk, status=DocumentText.Status.EXTRACTING, file_name=row.file_name)
+        if result is None:
+            claimed.delete()
+            continue
+        status, fingerprint, text, error = result
+        # The guard leaves the row alone if the file was replaced while we worked on it
+        claimed.update(
+            status=status, fingerprint=fingerprint, text=text, error=error,
+            locked_at=None, extracted_at=timezone.now(), updated_at=timezone.now(),
+        )
+        indexed += status == DocumentText.Status.DONE
+    return indexed
@@ -0,0 +1,62 @@
+import multiprocessing
+import signal
+import time
+
+from django import db
+from django.core.management.base import BaseCommand
+
+from search.indexer import claim_batch, process, queue_all, tracked_fields
+
+
+def run_worker(batch_size, poll_interval, once=False):
+    while True:
+        rows = claim_batch(batch_size)
+        if rows:
+            process(rows)
+            continue
+        if once:
+            break
+        time.sleep(poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Extract searchable text from uploaded documents using a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=2)
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument("--poll-interval", type=float, default=5)
+        parser.add_argument("--once", action="store_true", help="Drain pending documents in this process and exit.")
+        parser.add_argument("--rescan", action="store_true", help="First queue existing files that have never been indexed.")
+
+    def handle(self, *args, **options):
+        if options["rescan"]:
+            for model in tracked_fields():
+                self.stdout.write(f"{model._meta.label}: {queue_all(model)} file(s) queued")
+
+        if options["once"]:
+            run_worker(options["batch_size"], options["poll_interval"], once=True)
+            return
+
+        # Children must open their own database connections
+        db.connections.close_all()
+        workers = [
+            multiprocessing.Process(
+                target=run_worker, args=(options["batch_size"], options["poll_interval"]), daemon=True,
+            )
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} text extraction workers")
+
+        def stop(signum, frame):
+            for worker in workers:
+                worker.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            stop(None, None)
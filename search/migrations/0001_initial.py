@@ -0,0 +1,43 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('field_name', models.CharField(max_length=100)),
+                ('file_name', models.CharField(max_length=255)),
+                ('fingerprint', models.CharField(blank=True, help_text='Content hash of the file the text came from', max_length=64)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('EXTRACTING', 'Extracting'), ('DONE', 'Indexed'), ('UNSUPPORTED', 'Unsupported'), ('FAILED', 'Failed')], default='PENDING', max_length=12)),
+                ('text', models.TextField(blank=True)),
+                ('error', models.TextField(blank=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('extracted_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Document Text',
+                'verbose_name_plural': 'Document Search',
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='document_text_status_idx'), models.Index(fields=['fingerprint'], name='document_text_fingerprint_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='documenttext',
+            constraint=models.UniqueConstraint(fields=('content_type', 'object_id', 'field_name'), name='document_text_unique_file'),
+        ),
+    ]
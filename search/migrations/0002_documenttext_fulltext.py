@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def create_fulltext_index(apps, schema_editor):
+    # Only MySQL has FULLTEXT; other databases fall back to icontains in DocumentTextQuerySet.search()
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute("CREATE FULLTEXT INDEX document_text_fulltext_idx ON search_documenttext (text)")
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute("DROP INDEX document_text_fulltext_idx ON search_documenttext")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,74 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, models
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+
+class DocumentTextQuerySet(models.QuerySet):
+    def search(self, terms):
+        """Rows whose text matches every word of `terms`, using the FULLTEXT index on MySQL."""
+        words = terms.split()
+        if not words:
+            return self
+        if connection.vendor == "mysql":
+            table = connection.ops.quote_name(self.model._meta.db_table)
+            # Quoted, each word is a phrase: + - ( ) * ~ @ < > inside it are not boolean
+            # operators, so user input cannot change the query or make it invalid
+            phrases = [word.replace('"', "") for word in words]
+            phrases = [phrase for phrase in phrases if any(char.isalnum() for char in phrase)]
+            if not phrases:
+                return self.none()
+            query = " ".join(f'+"{phrase}"' for phrase in phrases)
+            return self.alias(
+                relevance=RawSQL(f"MATCH({table}.`text`) AGAINST (%s IN BOOLEAN MODE)", [query], output_field=FloatField())
+            ).filter(relevance__gt=0)
+        queryset = self
+        for word in words:
+            queryset = queryset.filter(text__icontains=word)
+        return queryset
+
+
+class DocumentText(models.Model):
+    """
+    Text extracted from a file attached to a document record, kept for
+    full text search. One row per record and file field; the extraction
+    worker fills it in after the upload request has returned.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        EXTRACTING = 'EXTRACTING', 'Extracting'
+        DONE = 'DONE', 'Indexed'
+        UNSUPPORTED = 'UNSUPPORTED', 'Unsupported'
+        FAILED = 'FAILED', 'Failed'
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+    field_name = models.CharField(max_length=100)
+    file_name = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64, blank=True, help_text="Content hash of the file the text came from")
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.PENDING)
+    text = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = DocumentTextQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Document Text"
+        verbose_name_plural = "Document Search"
+        ordering = ["-updated_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["content_type", "object_id", "field_name"], name="document_text_unique_file"),
+        ]
+        indexes = [
+            models.Index(fields=["status", "updated_at"], name="document_text_status_idx"),
+            models.Index(fields=["fingerprint"], name="document_text_fingerprint_idx"),
+        ]
+
+    def __str__(self):
+        return self.file_name
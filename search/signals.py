@@ -0,0 +1,19 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+
+from search.indexer import queue_instance, tracked_fields
+from search.models import DocumentText
+
+
+def document_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        queue_instance(instance)
+
+
+def document_deleted(sender, instance, **kwargs):
+    DocumentText.objects.filter(content_type=ContentType.objects.get_for_model(instance), object_id=instance.pk).delete()
+
+
+for model in tracked_fields():
+    post_save.connect(document_saved, sender=model, dispatch_uid=f"search_saved_{model._meta.label_lower}")
+    post_delete.connect(document_deleted, sender=model, dispatch_uid=f"search_deleted_{model._meta.label_lower}")
@@ -0,0 +1,124 @@
+/*
+ * Resumable chunked uploads for filestore.widgets.ChunkedFileInput.
+ *
+ * The selected file is sent in chunks to the upload session endpoint; the
+ * session id is remembered in localStorage so an interrupted upload resumes
+ * from the server's offset. Once complete the file input is cleared and only
+ * the session id is submitted with the form.
+ */
+(function () {
+    "use strict";
+
+    function csrfToken(form) {
+        var input = form && form.querySelector("input[name=csrfmiddlewaretoken]");
+        return input ? input.value : "";
+    }
+
+    function sha256Hex(buffer) {
+        if (!window.crypto || !window.crypto.subtle) {
+            return Promise.resolve(null);  // checksums need a secure context
+        }
+        return window.crypto.subtle.digest("SHA-256", buffer).then(function (digest) {
+            return Array.from(new Uint8Array(digest)).map(function (b) {
+                return b.toString(16).padStart(2, "0");
+            }).join("");
+        });
+    }
+
+    function request(method, url, token, body, headers) {
+        headers = Object.assign({"X-CSRFToken": token}, headers || {});
+        return fetch(url, {method: method, body: body, headers: headers, credentials: "same-origin"})
+            .then(function (response) {
+                return response.json().then(function (data) {
+                    if (!response.ok && response.status !== 409) {
+                        throw new Error(data.error || response.statusText);
+                    }
+                    return data;
+                });
+            });
+    }
+
+    function startSession(createUrl, file, token) {
+        var key = "chunked-upload:" + [file.name, file.size, file.lastModified].join(":");
+        var existing = window.localStorage.getItem(key);
+        var resume = existing
+            ? request("GET", createUrl + existing + "/", token).catch(function () { return null; })
+            : Promise.resolve(null);
+        return resume.then(function (session) {
+            if (session) {
+                return session;
+            }
+            var body = new FormData();
+            body.append("filename", file.name);
+            body.append("size", file.size);
+            return request("POST", createUrl, token, body).then(function (created) {
+                window.localStorage.setItem(key, created.id);
+                return created;
+            });
+        }).then(function (session) {
+            session.storageKey = key;
+            return session;
+        });
+    }
+
+    function sendChunks(createUrl, file, session, token, onProgress) {
+        if (session.offset >= file.size) {
+            return Promise.resolve(session);
+        }
+        var start = session.offset;
+        var end = Math.min(start + session.chunk_size, file.size);
+        var chunk = file.slice(start, end);
+        return chunk.arrayBuffer().then(sha256Hex).then(function (checksum) {
+            var headers = {"Content-Range": "bytes " + start + "-" + (end - 1) + "/" + file.size};
+            if (checksum) {
+                headers["X-Chunk-SHA256"] = checksum;
+            }
+            return request("PUT", createUrl + session.id + "/", token, chunk, headers);
+        }).then(function (state) {
+            state.storageKey = session.storageKey;
+            onProgress(state.offset, file.size);
+            return sendChunks(createUrl, file, state, token, onProgress);
+        });
+    }
+
+    function setSubmitting(form, busy) {
+        form.querySelectorAll("[type=submit]").forEach(function (button) {
+            button.disabled = busy;
+        });
+    }
+
+    function upload(input) {
+        var file = input.files[0];
+        var form = input.form;
+        var container = input.parentNode;
+        var hidden = container.querySelector("input[type=hidden][name='" + input.name + "__upload']");
+        var status = container.querySelector(".chunked-upload-status");
+        var createUrl = input.dataset.chunkedUpload;
+        var token = csrfToken(form);
+        if (!file || !hidden) {
+            return;
+        }
+        hidden.value = "";
+        setSubmitting(form, true);
+        startSession(createUrl, file, token).then(function (session) {
+            return sendChunks(createUrl, file, session, token, function (done, total) {
+                status.textContent = Math.floor(done * 100 / Math.max(total, 1)) + "%";
+            });
+        }).then(function (session) {
+            window.localStorage.removeItem(session.storageKey);
+            hidden.value = session.id;
+            input.value = "";  // the file is already on the server
+            status.textContent = file.name + " uploaded";
+        }).catch(function (error) {
+            status.textContent = "Upload interrupted (" + error.message + "), select the file again to resume.";
+        }).then(function () {
+            setSubmitting(form, false);
+        });
+    }
+
+    document.addEventListener("change", function (event) {
+        if (event.target.matches && event.target.matches("input[type=file][data-chunked-upload]")) {
+            upload(event.target);
+        }
+    });
+})();
@@ -0,0 +1,63 @@
+/*
+ * Loads conf.inlineAdmin paginated inline sections into the change form.
+ *
+ * Each section is fetched one page at a time from the admin's
+ * inline/<prefix>/ endpoint, optionally filtered by the section's search
+ * box, and dropped into the form, so only the pages shown are posted.
+ * Switching page discards unsaved edits on the current one, after asking.
+ */
+(function ($) {
+    "use strict";
+
+    function initFormsets(container) {
+        // Same wiring as admin/js/inlines.js does on page load
+        container.find(".js-inline-admin-formset").each(function () {
+            var data = $(this).data(), inlineOptions = data.inlineFormset, selector;
+            switch (data.inlineType) {
+            case "stacked":
+                selector = inlineOptions.name + "-group .inline-related";
+                $(selector).stackedFormset(selector, inlineOptions.options);
+                break;
+            case "tabular":
+                selector = inlineOptions.name + "-group .tabular.inline-related tbody:first > tr.form-row";
+                $(selector).tabularFormset(selector, inlineOptions.options);
+                break;
+            }
+        });
+        if (window.DateTimeShortcuts) {
+            $(".datetimeshortcuts").remove();
+            window.DateTimeShortcuts.init();
+        }
+    }
+
+    function load(section, params) {
+        section.addClass("loading");
+        return $.get(section.data("url"), params).done(function (html) {
+            section.html(html).data("dirty", false);
+            initFormsets(section);
+        }).always(function () {
+            section.removeClass("loading");
+        });
+    }
+
+    $(document).on("click", ".js-paginated-inline-page", function (event) {
+        event.preventDefault();
+        var section = $(this).closest(".js-paginated-inline");
+        if (section.data("dirty") && !window.confirm(gettext("Unsaved changes in this section will be lost. Continue?"))) {
+            return;
+        }
+        load(section, {page: $(this).data("page"), q: section.find(".js-paginated-inline-search").val() || ""});
+    });
+
+    $(document).on("keydown", ".js-paginated-inline-search", function (event) {
+        if (event.key === "Enter") {
+            // Enter would otherwise submit the whole change form
+            event.preventDefault();
+            $(this).closest(".input-group").find(".js-paginated-inline-page").trigger("click");
+        }
+    });
+
+    $(document).on("change", ".js-paginated-inline :input:not(.js-paginated-inline-search)", function () {
+        $(this).closest(".js-paginated-inline").data("dirty", true);
+    });
+})(django.jQuery);
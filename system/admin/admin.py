@@ -1,7 +1,11 @@
 from django.apps import apps
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.core.exceptions import PermissionDenied
 from django.db import models
+from django.http import StreamingHttpResponse
 from django.urls import reverse
+from django.utils.http import content_disposition_header
 from django.utils.html import format_html
 from django.template.response import TemplateResponse
 from django.contrib.auth import views as auth_views
@@ -11,6 +15,15 @@ from django import forms
 from django.urls import path
 from django.shortcuts import render
 
+from account.forms import ProvisionUsersForm
+from account.models import CustomUser
+from filestore.admin import ChunkedUploadAdminMixin
+from filestore.bundle import bundle_filename, iter_bundle
+from filestore.models import AuditBundle
+from account.provisioning import provision_users, read_users_csv
+from conf.inlineAdmin import LazyInlineMixin, PaginatedInlineAdminMixin, PaginatedInlineMixin
+from system.heatmap import HeatmapFilterForm, get_matrix
+
 from system.models import OrganisationUser, ChangeControlRecord, QMSChange, JobDescription, Role, OrganizationChart
 from system.models.organisation import Organisation, OrganisationLocation, OrganisationDepartment, \
     SWOTEntry, PESTLEEntry, ScopeStatement, StakeholderRequirement, Stakeholder
@@ -28,23 +41,74 @@ from system.models import (
     Risk,
     Opportunity,
     RiskOpportunityResponse,
+    RiskHistory,
+    TimelineEvent,
 )
 from system.models.support import ResourcePlan, TrainingRecord, AwarenessRecord, CommunicationPlan, DocumentRegister
 
 
-class OrganisationLocationInline(admin.StackedInline):
+class OrganisationLocationInline(LazyInlineMixin, admin.StackedInline):
     model = OrganisationLocation
     extra = 1
 
 
-class DepartmentInline(admin.StackedInline):
+class DepartmentInline(LazyInlineMixin, admin.StackedInline):
     model = OrganisationDepartment
     extra = 1
 
 
-class OrganisationAdmin(admin.ModelAdmin):
+class OrganisationAdmin(PaginatedInlineAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'address', 'tin_number', 'region', 'phone', 'sector', 'action_button']
     inlines = [OrganisationLocationInline, DepartmentInline]
+    actions = ["provision_users", "download_audit_bundle", "queue_audit_bundle"]
+
+    def has_add_user_permission(self, request):
+        return request.user.has_perm(f"{CustomUser._meta.app_label}.add_{CustomUser._meta.model_name}")
+
+    @admin.action(description="Provision users from CSV", permissions=["add_user"])
+    def provision_users(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, "Select exactly one organisation to provision users for.", messages.WARNING)
+            return None
+        organisation = queryset.get()
+
+        form = ProvisionUsersForm(request.POST, request.FILES) if request.POST.get("post") else ProvisionUsersForm()
+        if form.is_valid():
+            result = provision_users(
+                organisation, read_users_csv(form.cleaned_data["csv_file"]),
+                base_url=request.build_absolute_uri("/") if form.cleaned_data["send_links"] else None,
+                is_staff=form.cleaned_data["is_staff"],
+            )
+            for line, error in result.errors[:20]:
+                self.message_user(request, f"Line {line}: {error}", messages.WARNING)
+            self.message_user(request, f"{organisation}: {result}", messages.SUCCESS)
+            return None
+
+        return TemplateResponse(request, "admin/system/organisation/provision_users.html", {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "organisation": organisation,
+            "form": form,
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+            "title": "Provision users",
+        })
+
+    @admin.action(description="Download audit bundle (ZIP)")
+    def download_audit_bundle(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, "Select exactly one organisation to export.", messages.WARNING)
+            return None
+        organisation = queryset.get()
+        response = StreamingHttpResponse(iter_bundle(organisation), content_type="application/zip")
+        response["Content-Disposition"] = content_disposition_header(True, bundle_filename(organisation))
+        return response
+
+    @admin.action(description="Prepare audit bundle in the background")
+    def queue_audit_bundle(self, request, queryset):
+        AuditBundle.objects.bulk_create([
+            AuditBundle(organisation=organisation, requested_by=request.user) for organisation in queryset
+        ])
+        self.message_user(request, "Audit bundles queued; they will be listed under Audit Bundles when ready.")
 
     def action_button(self, obj):
         url = reverse('organisation-detail', args=[obj.pk])  # or your custom URL
@@ -87,13 +151,14 @@ class DepartmentAdmin(admin.ModelAdmin):
         return qs
 
 
-class StakeholderRequirementInline(admin.StackedInline):
+class StakeholderRequirementInline(LazyInlineMixin, admin.StackedInline):
     model = StakeholderRequirement
     extra = 1
+    search_fields = ("requirement", "compliance_method", "monitoring_method", "status")
 
 
 @admin.register(Stakeholder)
-class StakeholderAdmin(admin.ModelAdmin):
+class StakeholderAdmin(PaginatedInlineAdminMixin, admin.ModelAdmin):
     list_display = ("name", "category", "contact_person", "contact_info", "created_by", "created_at")
     list_filter = ("category",)
     search_fields = ("name", "contact_person", "relevance_to_qms")
@@ -121,7 +186,7 @@ class EmployeeAdmin(admin.ModelAdmin):
 #Leadership UI
 # ---------- INLINE ADMIN CLASSES ----------
 
-class AccountabilityAssignmentInline(admin.StackedInline):
+class AccountabilityAssignmentInline(LazyInlineMixin, admin.StackedInline):
     model = AccountabilityAssignment
     extra = 1
     # autocomplete_fields = ["user"]
@@ -129,22 +194,23 @@ class AccountabilityAssignmentInline(admin.StackedInline):
     show_change_link = True
 
 
-class CommitmentObjectiveInline(admin.StackedInline):
+class CommitmentObjectiveInline(LazyInlineMixin, admin.StackedInline):
     model = CommitmentObjective
     extra = 1
     fields = ("description", "metric", "baseline", "target", "unit", "start_date", "end_date", "is_active")
     show_change_link = True
 
 
-class CommitmentActionInline(admin.StackedInline):
+class CommitmentActionInline(LazyInlineMixin, admin.StackedInline):
     model = CommitmentAction
     extra = 1
+    search_fields = ("title", "description", "progress_notes", "status")
     # autocomplete_fields = ["owner"]
     fields = ("title", "status", "due_date", "completed_at")
     show_change_link = True
 
 
-class CommitmentReviewInline(admin.StackedInline):
+class CommitmentReviewInline(LazyInlineMixin, admin.StackedInline):
     model = CommitmentReview
     extra = 0
     # autocomplete_fields = ["reviewer"]
@@ -152,14 +218,14 @@ class CommitmentReviewInline(admin.StackedInline):
     show_change_link = True
 
 
-class CommunicationRecordInline(admin.StackedInline):
+class CommunicationRecordInline(LazyInlineMixin, admin.StackedInline):
     model = CommunicationRecord
     extra = 0
     fields = ("method", "audience", "date", "notes")
     show_change_link = True
 
 
-class CommitmentAttachmentInline(admin.StackedInline):
+class CommitmentAttachmentInline(LazyInlineMixin, admin.StackedInline):
     model = CommitmentAttachment
     extra = 0
     fields = ("file", "description", "uploaded_by", "uploaded_at")
@@ -169,10 +235,37 @@ class CommitmentAttachmentInline(admin.StackedInline):
 
 # ---------- MAIN ADMIN MODELS ----------
 
+class CommitmentProgressFilter(admin.SimpleListFilter):
+    title = "progress"
+    parameter_name = "progress"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("overdue", "Has overdue actions"),
+            ("blocked", "Has blocked actions"),
+            ("not_started", "No actions done"),
+            ("complete", "All actions done"),
+            ("no_actions", "No actions"),
+        )
+
+    def queryset(self, request, queryset):
+        filters = {
+            "overdue": {"progress__actions_overdue__gt": 0},
+            "blocked": {"progress__actions_blocked__gt": 0},
+            "not_started": {"progress__actions_total__gt": 0, "progress__actions_done": 0},
+            "complete": {"progress__actions_total__gt": 0, "progress__percent_done": 100},
+            "no_actions": {"progress__actions_total": 0},
+        }.get(self.value())
+        return queryset.filter(**filters) if filters else queryset
+
+
 @admin.register(LeadershipCommitment)
-class LeadershipCommitmentAdmin(admin.ModelAdmin):
-    list_display = ("title", "commitment_type", "leader", "effective_date", "expiry_date", "is_active")
-    list_filter = ("commitment_type", "is_active", "effective_date")
+class LeadershipCommitmentAdmin(PaginatedInlineAdminMixin, admin.ModelAdmin):
+    list_display = ("title", "commitment_type", "leader", "effective_date", "expiry_date", "is_active",
+                    "actions_progress", "actions_overdue", "objectives_active", "last_review", "next_review")
+    list_filter = ("commitment_type", "is_active", CommitmentProgressFilter, "effective_date")
+    # Progress columns read the CommitmentSummary row joined here (see system.rollups)
+    list_select_related = ("leader", "progress")
     search_fields = ("title", "summary", "leader__username")
     date_hierarchy = "effective_date"
     # autocomplete_fields = ["leader", "organisation"]
@@ -208,6 +301,34 @@ class LeadershipCommitmentAdmin(admin.ModelAdmin):
     )
     readonly_fields = ("created_at", "updated_at")
 
+    def _progress(self, obj, field):
+        # None until refresh_commitment_summaries has run for older commitments
+        summary = getattr(obj, "progress", None)
+        return getattr(summary, field) if summary else None
+
+    @admin.display(description="Actions done", ordering="progress__percent_done")
+    def actions_progress(self, obj):
+        summary = getattr(obj, "progress", None)
+        if summary is None:
+            return None
+        return f"{summary.actions_done}/{summary.actions_total} ({summary.percent_done}%)"
+
+    @admin.display(description="Overdue", ordering="progress__actions_overdue")
+    def actions_overdue(self, obj):
+        return self._progress(obj, "actions_overdue")
+
+    @admin.display(description="Active objectives", ordering="progress__objectives_active")
+    def objectives_active(self, obj):
+        return self._progress(obj, "objectives_active")
+
+    @admin.display(description="Last review", ordering="progress__last_review_date")
+    def last_review(self, obj):
+        return self._progress(obj, "last_review_date")
+
+    @admin.display(description="Next review", ordering="progress__next_review_date")
+    def next_review(self, obj):
+        return self._progress(obj, "next_review_date")
+
 
 # @admin.register(QualityPolicyCommunication)
 # class QualityPolicyCommunicationAdmin(admin.ModelAdmin):
@@ -225,14 +346,14 @@ class LeadershipCommitmentAdmin(admin.ModelAdmin):
 #     date_hierarchy = "submitted_at"
 
 
-class QualityPolicyCommunicationInline(admin.StackedInline):
+class QualityPolicyCommunicationInline(LazyInlineMixin, admin.StackedInline):
     model = QualityPolicyCommunication
     extra = 1
     fields = ("method", "audience", "date", "notes", "evidence_file")
     show_change_link = True
 
 
-class QualityPolicyEvidenceInline(admin.StackedInline):
+class QualityPolicyEvidenceInline(LazyInlineMixin, admin.StackedInline):
     model = QualityPolicyEvidence
     extra = 1
     fields = ("description", "file", "submitted_by", "submitted_at")
@@ -241,7 +362,7 @@ class QualityPolicyEvidenceInline(admin.StackedInline):
 
 
 @admin.register(QualityPolicy)
-class QualityPolicyAdmin(admin.ModelAdmin):
+class QualityPolicyAdmin(PaginatedInlineAdminMixin, admin.ModelAdmin):
     list_display = ("title", "developed_by", "approved_by", "effective_date", "is_active")
     list_filter = ("is_active", "effective_date")
     search_fields = ("title", "content")
@@ -260,7 +381,8 @@ class JobDescriptionInline(admin.StackedInline):
 
 @admin.register(Role)
 class RoleAdmin(admin.ModelAdmin):
-    list_display = ("title", "department", "reports_to", "is_active")
+    list_display = ("title", "department", "reports_to", "depth", "is_active")
+    list_select_related = ("department", "reports_to__department")
     list_filter = ("department", "is_active")
     search_fields = ("title", "purpose")
     inlines = [JobDescriptionInline]
@@ -276,8 +398,35 @@ class OrganizationChartAdmin(admin.ModelAdmin):
 
 
 # Planning
+class HeatmapAdminMixin:
+    """Adds a heatmap/ page to the changelist; cells link back to the filtered changelist."""
+    heatmap_kind = None
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path("heatmap/", self.admin_site.admin_view(self.heatmap_view), name="%s_%s_heatmap" % info),
+        ] + super().get_urls()
+
+    def heatmap_view(self, request):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        form = HeatmapFilterForm(request.GET or None, user=request.user)
+        matrix = get_matrix(self.heatmap_kind, **form.matrix_kwargs()) if form.is_valid() else None
+        if matrix is None and not request.GET and request.user.is_superuser:
+            matrix = get_matrix(self.heatmap_kind)
+        return TemplateResponse(request, "admin/system/heatmap.html", {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "form": form,
+            "matrix": matrix,
+            "title": f"{self.model._meta.verbose_name.capitalize()} heat map",
+        })
+
+
 @admin.register(Risk)
-class RiskAdmin(admin.ModelAdmin):
+class RiskAdmin(HeatmapAdminMixin, admin.ModelAdmin):
+    heatmap_kind = "risk"
     list_display = ("title", "identified_by", "identified_date", "likelihood", "impact", "score", "status")
     list_filter = ("status", "identified_date")
     search_fields = ("title", "description")
@@ -287,7 +436,8 @@ class RiskAdmin(admin.ModelAdmin):
 
 
 @admin.register(Opportunity)
-class OpportunityAdmin(admin.ModelAdmin):
+class OpportunityAdmin(HeatmapAdminMixin, admin.ModelAdmin):
+    heatmap_kind = "opportunity"
     list_display = ("title", "identified_by", "identified_date", "benefit", "feasibility", "score", "status")
     list_filter = ("status", "identified_date")
     search_fields = ("title", "description")
@@ -323,13 +473,52 @@ class RiskOpportunityResponseAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at", "updated_at")
 
 
-class ChangeControlRecordInline(admin.StackedInline):
+@admin.register(RiskHistory)
+class RiskHistoryAdmin(admin.ModelAdmin):
+    """Read-only: rows are appended by signals and `record_risk_history`."""
+    list_display = ("kind", "entity_id", "organisation", "x", "y", "score", "status", "deleted", "valid_from")
+    list_filter = ("kind", "deleted", "status")
+    search_fields = ("=entity_id",)
+    date_hierarchy = "valid_from"
+    list_select_related = ("organisation",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TimelineEvent)
+class TimelineEventAdmin(admin.ModelAdmin):
+    """Read-only: events are written by signals and `rebuild_timeline`."""
+    list_display = ("date", "kind", "title", "detail", "organisation", "content_type", "recorded_at")
+    list_filter = ("kind", "content_type")
+    search_fields = ("title", "detail")
+    date_hierarchy = "date"
+    list_select_related = ("organisation", "content_type")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class ChangeControlRecordInline(PaginatedInlineMixin, admin.StackedInline):
     model = ChangeControlRecord
     extra = 1
+    search_fields = ("control_action", "verification", "document_reference", "notes")
 
 
 @admin.register(QMSChange)
-class QMSChangeAdmin(admin.ModelAdmin):
+class QMSChangeAdmin(PaginatedInlineAdminMixin, admin.ModelAdmin):
     list_display = ("title", "requested_by", "department", "status", "planned_date", "approved_by", "implemented_by")
     list_filter = ("status", "department", "planned_date")
     search_fields = ("title", "description", "department")
@@ -372,7 +561,7 @@ class CommunicationPlanAdmin(admin.ModelAdmin):
 
 
 @admin.register(DocumentRegister)
-class DocumentRegisterAdmin(admin.ModelAdmin):
+class DocumentRegisterAdmin(ChunkedUploadAdminMixin, admin.ModelAdmin):
     list_display = ("title", "document_type", "version", "responsible_person", "issue_date")
     search_fields = ("title", "document_type")
     date_hierarchy = "issue_date"
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from conf.inlineAdmin import PaginatedInlineAdminMixin, PaginatedInlineMixin
+from filestore.admin import ChunkedUploadAdminMixin
 from system.models.operation import DesignRecord
 from system.models.operation import (
     SOP,
@@ -15,9 +17,10 @@ from system.models.operation import (
 # --------------------
 # Inline for Design Records
 # --------------------
-class DesignRecordInline(admin.StackedInline):
+class DesignRecordInline(ChunkedUploadAdminMixin, PaginatedInlineMixin, admin.StackedInline):
     model = DesignRecord
     extra = 1
+    search_fields = ("record_type", "description", "notes", "document_file")
     # autocomplete_fields = ["created_by"]
 
 
@@ -25,7 +28,7 @@ class DesignRecordInline(admin.StackedInline):
 # Admins
 # --------------------
 @admin.register(SOP)
-class SOPAdmin(admin.ModelAdmin):
+class SOPAdmin(ChunkedUploadAdminMixin, admin.ModelAdmin):
     list_display = ("title", "department", "created_by", "created_at", "is_active")
     list_filter = ("department", "is_active")
     search_fields = ("title", "description")
@@ -43,7 +46,7 @@ class ContractReviewAdmin(admin.ModelAdmin):
 
 
 @admin.register(DesignProject)
-class DesignProjectAdmin(admin.ModelAdmin):
+class DesignProjectAdmin(ChunkedUploadAdminMixin, PaginatedInlineAdminMixin, admin.ModelAdmin):
     list_display = ("title", "department", "owner", "start_date", "planned_end_date", "status")
     list_filter = ("department", "status")
     search_fields = ("title", "notes")
@@ -53,7 +56,7 @@ class DesignProjectAdmin(admin.ModelAdmin):
 
 
 @admin.register(DesignRecord)
-class DesignRecordAdmin(admin.ModelAdmin):
+class DesignRecordAdmin(ChunkedUploadAdminMixin, admin.ModelAdmin):
     list_display = ("project", "record_type", "created_by", "created_at")
     list_filter = ("record_type",)
     search_fields = ("description",)
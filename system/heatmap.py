@@ -0,0 +1,139 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.urls import reverse
+
+from system import history
+from system.models.organisation import Organisation
+from system.models.planning import Opportunity, Risk
+
+SCALE = range(1, 6)
+
+# kind -> (model, x axis field, y axis field)
+HEATMAPS = {
+    "risk": (Risk, "likelihood", "impact"),
+    "opportunity": (Opportunity, "benefit", "feasibility"),
+}
+
+VERSION_KEY = "system:heatmap:version:%s:%s"
+
+
+def _version(kind, organisation_id):
+    key = VERSION_KEY % (kind, organisation_id or "all")
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(kind, organisation_id):
+    """Drop cached matrices for one organisation and the all-organisations view."""
+    for scope in {organisation_id or "all", "all"}:
+        key = VERSION_KEY % (kind, scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def _filtered(kind, organisation_id=None, status=None, date_from=None, date_to=None, as_of=None):
+    model, x_field, y_field = HEATMAPS[kind]
+    if as_of:
+        # Historic states come from the history table, which names the axes x and y
+        queryset = history.as_of(kind, as_of).filter(x__in=SCALE, y__in=SCALE)
+    else:
+        queryset = model.objects.filter(**{f"{x_field}__in": SCALE, f"{y_field}__in": SCALE})
+    filters = {}
+    if organisation_id:
+        filters["organisation__id__exact"] = organisation_id
+    if status:
+        filters["status"] = status
+    if date_from:
+        filters["identified_date__gte"] = date_from
+    if date_to:
+        filters["identified_date__lte"] = date_to
+    return queryset.filter(**filters), filters
+
+
+def build_matrix(kind, organisation_id=None, status=None, date_from=None, date_to=None, as_of=None):
+    """
+    Count records per (x, y) cell with one GROUP BY query. Rows run from the
+    highest y value down so the matrix reads like the printed heat map.
+
+    With `as_of` the counts describe the register at that date; its cells
+    have no changelist link since the records may have changed since.
+    """
+    model, x_field, y_field = HEATMAPS[kind]
+    queryset, filters = _filtered(kind, organisation_id, status, date_from, date_to, as_of)
+    x_column, y_column = ("x", "y") if as_of else (x_field, y_field)
+    counts = {
+        (row[x_column], row[y_column]): row["count"]
+        for row in queryset.values(x_column, y_column).annotate(count=Count("pk")).order_by()
+    }
+    changelist = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+    rows = []
+    for y in reversed(SCALE):
+        cells = []
+        for x in SCALE:
+            params = {**filters, x_field: x, y_field: y}
+            cells.append({
+                "x": x, "y": y, "score": x * y, "count": counts.get((x, y), 0),
+                "url": None if as_of else f"{changelist}?{urlencode({key: str(value) for key, value in params.items()})}",
+            })
+        rows.append({"y": y, "cells": cells})
+    return {
+        "kind": kind, "x": x_field, "y": y_field, "columns": list(SCALE), "total": sum(counts.values()),
+        "filters": {key: str(value) for key, value in filters.items()}, "rows": rows,
+        "as_of": as_of.isoformat() if as_of else None,
+    }
+
+
+def get_matrix(kind, organisation_id=None, status=None, date_from=None, date_to=None, as_of=None):
+    """
+    build_matrix() through the cache. Saves and deletes bump the tenant's
+    version; queryset.update() sends no signals, so entries also expire
+    after HEATMAP_CACHE_TIMEOUT.
+    """
+    filters = f"{status}:{date_from}:{date_to}:{as_of}"
+    key = "system:heatmap:%s:%s:%s:%s" % (
+        kind, organisation_id or "all", _version(kind, organisation_id), hashlib.md5(filters.encode()).hexdigest(),
+    )
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = build_matrix(kind, organisation_id, status, date_from, date_to, as_of)
+        cache.set(key, matrix, settings.HEATMAP_CACHE_TIMEOUT)
+    return matrix
+
+
+class HeatmapFilterForm(forms.Form):
+    """Filters for the risk/opportunity heat map, limited to the user's organisations."""
+    organisation = forms.ModelChoiceField(queryset=Organisation.objects.none(), required=False, empty_label="All organisations")
+    status = forms.CharField(max_length=50, required=False)
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    as_of = forms.DateField(required=False, label="As of", widget=forms.DateInput(attrs={"type": "date"}))
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        organisations = Organisation.objects.all() if user.is_superuser else Organisation.objects.for_user(user)
+        self.fields["organisation"].queryset = organisations.order_by("name")
+        if not user.is_superuser:
+            self.fields["organisation"].required = True
+            self.fields["organisation"].empty_label = None
+
+    def matrix_kwargs(self):
+        data = self.cleaned_data
+        return {
+            "organisation_id": data["organisation"].pk if data["organisation"] else None,
+            "status": data["status"] or None,
+            "date_from": data["date_from"],
+            "date_to": data["date_to"],
+            "as_of": data["as_of"],
+        }
@@ -0,0 +1,112 @@
+from datetime import datetime, time
+
+from django.db.models import Avg, Count, Exists, OuterRef, Subquery
+from django.utils import timezone
+
+from system.models.planning import Opportunity, Risk, RiskHistory
+
+# model -> (history kind, x axis field, y axis field)
+TRACKED = {
+    Risk: (RiskHistory.Kind.RISK, "likelihood", "impact"),
+    Opportunity: (RiskHistory.Kind.OPPORTUNITY, "benefit", "feasibility"),
+}
+
+# History columns compared to decide whether a save changed the rating
+STATE_FIELDS = ("organisation_id", "x", "y", "score", "status", "identified_date")
+
+
+def state(instance):
+    """The tracked values of a Risk or Opportunity, in STATE_FIELDS order."""
+    _, x_field, y_field = TRACKED[type(instance)]
+    return (
+        instance.organisation_id, getattr(instance, x_field), getattr(instance, y_field),
+        instance.score, instance.status, instance.identified_date,
+    )
+
+
+def history_row(instance, deleted=False, valid_from=None):
+    kind = TRACKED[type(instance)][0]
+    return RiskHistory(
+        kind=kind, entity_id=instance.pk, deleted=deleted, valid_from=valid_from or timezone.now(),
+        **dict(zip(STATE_FIELDS, state(instance))),
+    )
+
+
+def moment(when):
+    """Dates mean the end of that day, so an as-of date includes its own changes."""
+    if isinstance(when, datetime):
+        return when
+    return timezone.make_aware(datetime.combine(when, time.max))
+
+
+def as_of(kind, when, organisation_id=None):
+    """
+    History rows giving each live record's state at `when`: the latest row
+    per entity with valid_from at or before it, skipping deleted records.
+    The correlated subquery is answered from risk_history_entity_idx.
+    """
+    when = moment(when)
+    latest = (
+        RiskHistory.objects.filter(kind=kind, entity_id=OuterRef("entity_id"), valid_from__lte=when)
+        .order_by("-valid_from", "-pk").values("pk")[:1]
+    )
+    rows = RiskHistory.objects.filter(kind=kind, valid_from__lte=when, deleted=False)
+    if organisation_id:
+        rows = rows.filter(organisation_id=organisation_id)
+    # Filtering on the organisation before picking the latest row would find
+    # records that have since moved away, so the subquery ignores it
+    return rows.filter(pk=Subquery(latest))
+
+
+def trend(kind, dates, organisation_id=None, status=None):
+    """Count and average score of the register at each of `dates`."""
+    points = []
+    for date in dates:
+        rows = as_of(kind, date, organisation_id)
+        if status:
+            rows = rows.filter(status=status)
+        summary = rows.aggregate(count=Count("pk"), average_score=Avg("score"))
+        points.append({"date": date.isoformat(), **summary})
+    return points
+
+
+def latest_rows(kind):
+    """The most recent history row of every entity of `kind`, deleted or not."""
+    latest = (
+        RiskHistory.objects.filter(kind=kind, entity_id=OuterRef("entity_id"))
+        .order_by("-valid_from", "-pk").values("pk")[:1]
+    )
+    return RiskHistory.objects.filter(kind=kind, pk=Subquery(latest))
+
+
+def catch_up(model, batch_size=1000):
+    """
+    Append history for changes that bypassed the signals, such as
+    queryset.update() or raw SQL. Returns the number of rows written.
+    """
+    kind = TRACKED[model][0]
+    now = timezone.now()
+    written, last_pk = 0, 0
+    while True:
+        batch = list(model.objects.filter(pk__gt=last_pk).order_by("pk")[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        recorded = {
+            row[0]: (row[1], row[2:])
+            for row in latest_rows(kind).filter(entity_id__in=[instance.pk for instance in batch])
+            .values_list("entity_id", "deleted", *STATE_FIELDS)
+        }
+        rows = [
+            history_row(instance, valid_from=now) for instance in batch
+            if instance.pk not in recorded or recorded[instance.pk] != (False, state(instance))
+        ]
+        written += len(RiskHistory.objects.bulk_create(rows))
+
+    gone = latest_rows(kind).filter(deleted=False).exclude(Exists(model.objects.filter(pk=OuterRef("entity_id"))))
+    rows = []
+    for row in gone.iterator():
+        row.pk, row.deleted, row.valid_from = None, True, now
+        rows.append(row)
+    written += len(RiskHistory.objects.bulk_create(rows, batch_size=batch_size))
+    return written
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from system.timeline import SOURCES, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rewrite the timeline's dated events from the records, for backfills and changes made without signals."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        for source in SOURCES:
+            written = rebuild(source, batch_size=options["batch_size"])
+            self.stdout.write(f"{source.model.__name__}: {written} event(s) written")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Max, Q
+
+from system.models.planning import Opportunity, Risk
+
+SCORED_MODELS = [
+    (Risk, "likelihood", "impact"),
+    (Opportunity, "benefit", "feasibility"),
+]
+
+
+class Command(BaseCommand):
+    help = "Recompute risk and opportunity scores in primary key batches, only touching stale rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model, first, second in SCORED_MODELS:
+            expected = F(first) * F(second)
+            last_pk = model.objects.aggregate(last=Max("pk"))["last"] or 0
+            updated = 0
+            for start in range(0, last_pk, batch_size):
+                updated += (
+                    model.objects.filter(pk__gt=start, pk__lte=start + batch_size)
+                    .filter(Q(score__isnull=True) | ~Q(score=expected))
+                    .update(score=expected)
+                )
+            self.stdout.write(f"{model.__name__}: {updated} score(s) updated")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from system.history import TRACKED, catch_up
+
+
+class Command(BaseCommand):
+    help = "Append risk/opportunity history for changes made without signals (queryset.update(), raw SQL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for model in TRACKED:
+            written = catch_up(model, batch_size=options["batch_size"])
+            self.stdout.write(f"{model.__name__}: {written} history row(s) added")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from system.rollups import refresh
+
+
+class Command(BaseCommand):
+    help = "Recompute every commitment's progress summary. Run daily so overdue counts follow the calendar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        written = refresh(batch_size=options["batch_size"])
+        self.stdout.write(f"{written} commitment summary(ies) refreshed")
@@ -0,0 +1,24 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from system.models.organisation import Organisation
+from system.simulation import run_simulation
+
+
+class Command(BaseCommand):
+    help = "Run the Monte Carlo risk exposure simulation for an organisation and print the result as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("organisation_id", type=int)
+        parser.add_argument("--trials", type=int)
+        parser.add_argument("--seed", type=int)
+
+    def handle(self, *args, **options):
+        if not Organisation.objects.filter(pk=options["organisation_id"]).exists():
+            raise CommandError(f"Organisation {options['organisation_id']} does not exist")
+        started = time.perf_counter()
+        result = run_simulation(options["organisation_id"], trials=options["trials"], seed=options["seed"])
+        self.stdout.write(json.dumps(result, indent=2))
+        self.stderr.write(f"Finished in {time.perf_counter() - started:.2f}s")
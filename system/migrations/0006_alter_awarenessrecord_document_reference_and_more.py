@@ -0,0 +1,109 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:07
+
+from django.db import migrations, models
+import filestore.paths
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0005_designproject_supplierevaluation_sop_servicereport_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='awarenessrecord',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/awareness_records')),
+        ),
+        migrations.AlterField(
+            model_name='changecontrolrecord',
+            name='evidence',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/change_evidence')),
+        ),
+        migrations.AlterField(
+            model_name='commitmentattachment',
+            name='file',
+            field=models.FileField(upload_to=filestore.paths.ShardedUploadTo('qms/commitments')),
+        ),
+        migrations.AlterField(
+            model_name='communicationplan',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/communication_plans')),
+        ),
+        migrations.AlterField(
+            model_name='contractreview',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/contract_reviews')),
+        ),
+        migrations.AlterField(
+            model_name='designrecord',
+            name='document_file',
+            field=models.FileField(upload_to=filestore.paths.ShardedUploadTo('qms/design_records')),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='file',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/document')),
+        ),
+        migrations.AlterField(
+            model_name='documentregister',
+            name='file',
+            field=models.FileField(upload_to=filestore.paths.ShardedUploadTo('qms/document_registers')),
+        ),
+        migrations.AlterField(
+            model_name='jobdescription',
+            name='attachment',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/job_descriptions')),
+        ),
+        migrations.AlterField(
+            model_name='ncrregister',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/ncr')),
+        ),
+        migrations.AlterField(
+            model_name='organizationchart',
+            name='file',
+            field=models.FileField(upload_to=filestore.paths.ShardedUploadTo('qms/org_charts')),
+        ),
+        migrations.AlterField(
+            model_name='productrelease',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/product_approvals')),
+        ),
+        migrations.AlterField(
+            model_name='qualitypolicycommunication',
+            name='evidence_file',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/quality_policy/communications')),
+        ),
+        migrations.AlterField(
+            model_name='qualitypolicyevidence',
+            name='file',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/quality_policy/evidence')),
+        ),
+        migrations.AlterField(
+            model_name='resourceplan',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/resource_plans')),
+        ),
+        migrations.AlterField(
+            model_name='servicereport',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/service_reports')),
+        ),
+        migrations.AlterField(
+            model_name='sop',
+            name='file',
+            field=models.FileField(upload_to=filestore.paths.ShardedUploadTo('qms/sops')),
+        ),
+        migrations.AlterField(
+            model_name='supplierevaluation',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/supplier_evaluations')),
+        ),
+        migrations.AlterField(
+            model_name='trainingrecord',
+            name='document_reference',
+            field=models.FileField(blank=True, null=True, upload_to=filestore.paths.ShardedUploadTo('qms/training_records')),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0006_alter_awarenessrecord_document_reference_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='opportunity',
+            name='score',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='benefit x feasibility, kept by a database trigger', null=True),
+        ),
+        migrations.AlterField(
+            model_name='risk',
+            name='score',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='likelihood x impact, kept by a database trigger', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='opportunity',
+            index=models.Index(fields=['organisation', 'score'], name='opportunity_org_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='opportunity',
+            index=models.Index(fields=['score'], name='opportunity_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='risk',
+            index=models.Index(fields=['organisation', 'score'], name='risk_org_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='risk',
+            index=models.Index(fields=['score'], name='risk_score_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# table -> (first factor, second factor); score = first * second
+SCORED_TABLES = {
+    "system_risk": ("likelihood", "impact"),
+    "system_opportunity": ("benefit", "feasibility"),
+}
+
+
+def trigger_statements(vendor, table, first, second):
+    if vendor == "mysql":
+        return [
+            f"CREATE TRIGGER {table}_score_insert BEFORE INSERT ON {table} "
+            f"FOR EACH ROW SET NEW.score = NEW.{first} * NEW.{second}",
+            f"CREATE TRIGGER {table}_score_update BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW SET NEW.score = NEW.{first} * NEW.{second}",
+        ]
+    if vendor == "postgresql":
+        return [
+            f"CREATE OR REPLACE FUNCTION {table}_score() RETURNS trigger AS $$ "
+            f"BEGIN NEW.score := NEW.{first} * NEW.{second}; RETURN NEW; END; $$ LANGUAGE plpgsql",
+            f"CREATE TRIGGER {table}_score BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_score()",
+        ]
+    if vendor == "sqlite":
+        # SQLite cannot assign to NEW, so correct the row after it is written
+        return [
+            f"CREATE TRIGGER {table}_score_insert AFTER INSERT ON {table} BEGIN "
+            f"UPDATE {table} SET score = NEW.{first} * NEW.{second} WHERE id = NEW.id; END",
+            f"CREATE TRIGGER {table}_score_update AFTER UPDATE OF {first}, {second}, score ON {table} BEGIN "
+            f"UPDATE {table} SET score = NEW.{first} * NEW.{second} WHERE id = NEW.id; END",
+        ]
+    return []
+
+
+def drop_statements(vendor, table):
+    if vendor == "postgresql":
+        return [
+            f"DROP TRIGGER IF EXISTS {table}_score ON {table}",
+            f"DROP FUNCTION IF EXISTS {table}_score()",
+        ]
+    if vendor in ("mysql", "sqlite"):
+        return [f"DROP TRIGGER IF EXISTS {table}_score_insert", f"DROP TRIGGER IF EXISTS {table}_score_update"]
+    return []
+
+
+def create_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, (first, second) in SCORED_TABLES.items():
+        schema_editor.execute(f"UPDATE {table} SET score = {first} * {second}")
+        for statement in trigger_statements(vendor, table, first, second):
+            schema_editor.execute(statement)
+
+
+def drop_triggers(apps, schema_editor):
+    for table in SCORED_TABLES:
+        for statement in drop_statements(schema_editor.connection.vendor, table):
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0007_risk_opportunity_score_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def seed_history(apps, schema_editor):
+    """Start every existing record's history at its last update."""
+    RiskHistory = apps.get_model("system", "RiskHistory")
+    for kind, model_name, x, y in (("risk", "Risk", "likelihood", "impact"),
+                                   ("opportunity", "Opportunity", "benefit", "feasibility")):
+        model = apps.get_model("system", model_name)
+        rows = model.objects.values_list("pk", "organisation_id", x, y, "score", "status", "identified_date", "updated_at")
+        RiskHistory.objects.bulk_create([
+            RiskHistory(kind=kind, entity_id=pk, organisation_id=organisation_id, x=x_value, y=y_value, score=score,
+                        status=status, identified_date=identified_date, valid_from=updated_at)
+            for pk, organisation_id, x_value, y_value, score, status, identified_date, updated_at in rows.iterator()
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0008_risk_opportunity_score_triggers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiskHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('risk', 'Risk'), ('opportunity', 'Opportunity')], max_length=12)),
+                ('entity_id', models.BigIntegerField()),
+                ('x', models.PositiveSmallIntegerField(help_text='Likelihood or benefit')),
+                ('y', models.PositiveSmallIntegerField(help_text='Impact or feasibility')),
+                ('score', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('status', models.CharField(max_length=50)),
+                ('identified_date', models.DateField(blank=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('valid_from', models.DateTimeField(default=django.utils.timezone.now)),
+                ('organisation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='system.organisation')),
+            ],
+            options={
+                'verbose_name': 'Risk History',
+                'verbose_name_plural': 'Risk History',
+                'indexes': [models.Index(fields=['kind', 'entity_id', 'valid_from'], name='risk_history_entity_idx'), models.Index(fields=['kind', 'organisation', 'valid_from'], name='risk_history_org_idx')],
+            },
+        ),
+        migrations.RunPython(seed_history, migrations.RunPython.noop),
+    ]
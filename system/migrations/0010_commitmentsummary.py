@@ -0,0 +1,37 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0009_riskhistory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommitmentSummary',
+            fields=[
+                ('commitment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress', serialize=False, to='system.leadershipcommitment')),
+                ('actions_open', models.PositiveIntegerField(default=0)),
+                ('actions_in_progress', models.PositiveIntegerField(default=0)),
+                ('actions_done', models.PositiveIntegerField(default=0)),
+                ('actions_blocked', models.PositiveIntegerField(default=0)),
+                ('actions_total', models.PositiveIntegerField(default=0)),
+                ('actions_overdue', models.PositiveIntegerField(default=0)),
+                ('percent_done', models.PositiveSmallIntegerField(default=0)),
+                ('objectives_active', models.PositiveIntegerField(default=0)),
+                ('accountabilities', models.PositiveIntegerField(default=0)),
+                ('last_review_date', models.DateField(blank=True, null=True)),
+                ('next_review_date', models.DateField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Commitment Summary',
+                'verbose_name_plural': 'Commitment Summaries',
+                'indexes': [models.Index(fields=['percent_done'], name='commitment_progress_idx'), models.Index(fields=['actions_overdue'], name='commitment_overdue_idx'), models.Index(fields=['next_review_date'], name='commitment_next_review_idx')],
+            },
+        ),
+    ]
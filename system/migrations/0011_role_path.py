@@ -0,0 +1,54 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:25
+
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    """Compute path/depth for existing roles; a reporting cycle is broken where it is found."""
+    Role = apps.get_model("system", "Role")
+    parents = dict(Role.objects.values_list("pk", "reports_to_id"))
+    paths = {}
+    cut = set()
+
+    def path_for(pk, seen=()):
+        if pk not in paths:
+            parent = parents.get(pk)
+            seen += (pk,)
+            if parent in seen:
+                # Role.save() refuses cyclic reporting lines, so the cut must be stored too
+                cut.add(pk)
+            prefix = "" if parent is None or parent in seen or parent not in parents else path_for(parent, seen)
+            paths[pk] = prefix + f"{pk:08x}/"
+        return paths[pk]
+
+    roles = []
+    for pk in parents:
+        path = path_for(pk)
+        roles.append(Role(pk=pk, path=path, depth=path.count("/") - 1))
+    Role.objects.bulk_update(roles, ["path", "depth"], batch_size=1000)
+    Role.objects.filter(pk__in=cut).update(reports_to=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0010_commitmentsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='role',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='role',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=700),
+        ),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(fields=['organisation', 'path'], name='role_org_path_idx'),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
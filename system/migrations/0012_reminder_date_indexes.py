@@ -0,0 +1,48 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0011_role_path'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='commitmentaction',
+            name='due_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='commitmentreview',
+            name='next_review_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='qualitypolicy',
+            name='review_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='resourceplan',
+            name='review_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='riskopportunityresponse',
+            name='due_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='sop',
+            name='review_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='stakeholderrequirement',
+            name='next_review_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+    ]
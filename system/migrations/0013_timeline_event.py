@@ -0,0 +1,37 @@
+# Generated by Django 4.2.22 on 2026-10-19 00:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('system', '0012_reminder_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('kind', models.CharField(choices=[('created', 'Created'), ('status', 'Status change'), ('due', 'Due date'), ('review', 'Review'), ('communication', 'Communication'), ('milestone', 'Milestone')], max_length=15)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('field_name', models.CharField(blank=True, help_text='Date field the event mirrors', max_length=100)),
+                ('title', models.CharField(max_length=255)),
+                ('detail', models.CharField(blank=True, max_length=255)),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('organisation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='system.organisation')),
+            ],
+            options={
+                'verbose_name': 'Timeline Event',
+                'verbose_name_plural': 'Timeline',
+                'ordering': ('-date', '-pk'),
+                'indexes': [models.Index(fields=['organisation', 'date'], name='timeline_org_date_idx'), models.Index(fields=['content_type', 'object_id'], name='timeline_object_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,4 @@
 from system.models.organisation import *
 from system.models.leadership import *
-from system.models.planning import *
\ No newline at end of file
+from system.models.planning import *
+from system.models.timeline import *
\ No newline at end of file
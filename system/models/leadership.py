@@ -1,9 +1,13 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.conf import settings
 from django.utils import timezone
 from system.models import TimeStampMixin, Organisation
 
 from django.contrib.auth import get_user_model
+from filestore.paths import ShardedUploadTo
 
 User = get_user_model()
 
@@ -102,7 +106,7 @@ class CommitmentAction(models.Model):
     owner = models.ForeignKey("account.CustomUser", on_delete=models.PROTECT, related_name="qms_actions")
     status = models.CharField(max_length=30, choices=STATUS_CHOICES, default="open")
     progress_notes = models.TextField(blank=True)
-    due_date = models.DateField(blank=True, null=True)
+    due_date = models.DateField(blank=True, null=True, db_index=True)
     completed_at = models.DateTimeField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -123,7 +127,7 @@ class CommitmentReview(models.Model):
     findings = models.TextField(blank=True)
     conclusions = models.TextField(blank=True)
     recommendations = models.TextField(blank=True)
-    next_review_date = models.DateField(blank=True, null=True)
+    next_review_date = models.DateField(blank=True, null=True, db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -152,7 +156,7 @@ class CommunicationRecord(models.Model):
 # Optional lightweight helper model for attachments if you want file storage
 class CommitmentAttachment(models.Model):
     commitment = models.ForeignKey(LeadershipCommitment, on_delete=models.CASCADE, related_name="attachments")
-    file = models.FileField(upload_to="qms/commitments/%Y/%m/%d/")
+    file = models.FileField(upload_to=ShardedUploadTo("qms/commitments"))
     description = models.CharField(max_length=255, blank=True)
     uploaded_by = models.ForeignKey("account.CustomUser", on_delete=models.SET_NULL, null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -161,6 +165,40 @@ class CommitmentAttachment(models.Model):
         return self.file.name
 
 
+class CommitmentSummary(models.Model):
+    """
+    Denormalised progress of a commitment, refreshed by signals when its
+    actions, objectives, reviews or accountabilities change (see
+    system.rollups) so the changelist can sort and filter on it.
+    """
+    commitment = models.OneToOneField(LeadershipCommitment, on_delete=models.CASCADE, primary_key=True, related_name="progress")
+    actions_open = models.PositiveIntegerField(default=0)
+    actions_in_progress = models.PositiveIntegerField(default=0)
+    actions_done = models.PositiveIntegerField(default=0)
+    actions_blocked = models.PositiveIntegerField(default=0)
+    actions_total = models.PositiveIntegerField(default=0)
+    # Depends on the date as well, refresh_commitment_summaries recounts it daily
+    actions_overdue = models.PositiveIntegerField(default=0)
+    percent_done = models.PositiveSmallIntegerField(default=0)
+    objectives_active = models.PositiveIntegerField(default=0)
+    accountabilities = models.PositiveIntegerField(default=0)
+    last_review_date = models.DateField(blank=True, null=True)
+    next_review_date = models.DateField(blank=True, null=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Commitment Summary"
+        verbose_name_plural = "Commitment Summaries"
+        indexes = [
+            models.Index(fields=["percent_done"], name="commitment_progress_idx"),
+            models.Index(fields=["actions_overdue"], name="commitment_overdue_idx"),
+            models.Index(fields=["next_review_date"], name="commitment_next_review_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.commitment.title}: {self.actions_done}/{self.actions_total} actions done"
+
+
 class QualityPolicy(TimeStampMixin):
     """Represents the organisation's Quality Policy and its lifecycle."""
     organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE, null=True, blank=True)
@@ -170,7 +208,7 @@ class QualityPolicy(TimeStampMixin):
     approved_by = models.ForeignKey("account.CustomUser", on_delete=models.PROTECT, related_name="approved_policies", null=True, blank=True)
     approval_date = models.DateField(blank=True, null=True)
     effective_date = models.DateField(default=timezone.now)
-    review_date = models.DateField(blank=True, null=True)
+    review_date = models.DateField(blank=True, null=True, db_index=True)
     is_active = models.BooleanField(default=True)
 
     class Meta:
@@ -187,7 +225,7 @@ class QualityPolicyCommunication(TimeStampMixin):
     audience = models.TextField(blank=True, help_text="Who received the policy communication")
     date = models.DateField(default=timezone.now)
     notes = models.TextField(blank=True)
-    evidence_file = models.FileField(upload_to="qms/quality_policy/communications/%Y/%m/%d/", blank=True, null=True)
+    evidence_file = models.FileField(upload_to=ShardedUploadTo("qms/quality_policy/communications"), blank=True, null=True)
 
     def __str__(self):
         return f"{self.method} on {self.date} for {self.policy.title}"
@@ -197,7 +235,7 @@ class QualityPolicyEvidence(models.Model):
     """Evidence records to demonstrate that the Quality Policy is communicated and displayed."""
     policy = models.ForeignKey(QualityPolicy, on_delete=models.CASCADE, related_name="evidences")
     description = models.CharField(max_length=255, help_text="Description of the evidence, e.g. 'Photo of policy on notice board'")
-    file = models.FileField(upload_to="qms/quality_policy/evidence/%Y/%m/%d/", blank=True, null=True)
+    file = models.FileField(upload_to=ShardedUploadTo("qms/quality_policy/evidence"), blank=True, null=True)
     submitted_by = models.ForeignKey("account.CustomUser", on_delete=models.SET_NULL, null=True, blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
 
@@ -206,9 +244,49 @@ class QualityPolicyEvidence(models.Model):
 
 
 
+# Hex digits per level of Role.path; fixed width so ordering by path walks the tree depth first
+ROLE_PATH_WIDTH = 8
+
+
+def role_path_segment(pk):
+    return f"{pk:0{ROLE_PATH_WIDTH}x}/"
+
+
+def move_role_subtree(old_path, new_path):
+    """Re-prefix every role under `old_path` with `new_path` in one UPDATE."""
+    depth_change = new_path.count("/") - old_path.count("/")
+    Role.objects.filter(path__startswith=old_path).update(
+        path=Concat(Value(new_path), Substr("path", len(old_path) + 1), output_field=models.CharField()),
+        depth=F("depth") + depth_change,
+    )
+
+
+class RoleQuerySet(models.QuerySet):
+    def subtree(self, role, include_self=True, max_depth=None):
+        """`role` and everyone reporting to it directly or indirectly, as one path prefix scan."""
+        queryset = self.filter(path__startswith=role.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=role.pk)
+        if max_depth is not None:
+            queryset = queryset.filter(depth__lte=role.depth + max_depth)
+        return queryset
+
+    def ancestors(self, role, include_self=False):
+        """The reporting line above `role`, top first."""
+        return self.filter(pk__in=role.ancestor_ids(include_self)).order_by("depth")
+
+    def chart(self, organisation):
+        """An organisation's roles in depth-first order, ready to be drawn as a tree."""
+        return self.filter(organisation=organisation).select_related("department").order_by("path")
+
+
 class Role(models.Model):
     """
     Defines a role or position within the organization.
+
+    `path` lists the primary keys from the top of the reporting line down to
+    this role and `depth` is its level (0 for the top); both are kept by
+    save() so subtree and ancestor lookups are single queries.
     """
     organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE, null=True, blank=True)
     title = models.CharField(max_length=150)
@@ -216,16 +294,57 @@ class Role(models.Model):
     reports_to = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="subordinates")
     purpose = models.TextField(blank=True, null=True, help_text="Brief purpose or summary of this role.")
     is_active = models.BooleanField(default=True)
+    path = models.CharField(max_length=700, blank=True, default="", editable=False, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    objects = RoleQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Role"
         verbose_name_plural = "Roles"
         ordering = ["department", "title"]
         unique_together = ("title", "department")
+        indexes = [
+            models.Index(fields=["organisation", "path"], name="role_org_path_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.department.name})"
 
+    def ancestor_ids(self, include_self=False):
+        ids = [int(segment, 16) for segment in self.path.split("/") if segment]
+        return ids if include_self else ids[:-1]
+
+    def clean(self):
+        super().clean()
+        if self.reports_to_id and self.pk:
+            if self.reports_to_id == self.pk or self.pk in self.reports_to.ancestor_ids():
+                raise ValidationError({"reports_to": "A role cannot report to itself or to one of its subordinates."})
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "reports_to" not in update_fields:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            old_path = Role.objects.filter(pk=self.pk).values_list("path", flat=True).first() if self.pk else None
+            parent_path = ""
+            if self.reports_to_id:
+                parent_path = Role.objects.values_list("path", flat=True).get(pk=self.reports_to_id)
+                if old_path and parent_path.startswith(old_path):
+                    raise ValueError("A role cannot report to itself or to one of its subordinates.")
+            # The stored path and depth only change through move_role_subtree() below;
+            # an instance loaded before an ancestor moved must not write its stale values back
+            self.path = old_path or ""
+            self.depth = self.path.count("/") - 1 if old_path else 0
+            super().save(*args, **kwargs)
+            new_path = parent_path + role_path_segment(self.pk)
+            if old_path:
+                if new_path != old_path:
+                    move_role_subtree(old_path, new_path)
+            else:
+                Role.objects.filter(pk=self.pk).update(path=new_path, depth=new_path.count("/") - 1)
+            self.path, self.depth = new_path, new_path.count("/") - 1
+
 
 class JobDescription(models.Model):
     """
@@ -240,7 +359,7 @@ class JobDescription(models.Model):
     effective_date = models.DateField()
     last_review_date = models.DateField(blank=True, null=True)
     document_reference = models.CharField(max_length=100, blank=True, null=True)
-    attachment = models.FileField(upload_to="qms/job_descriptions/", blank=True, null=True)
+    attachment = models.FileField(upload_to=ShardedUploadTo("qms/job_descriptions"), blank=True, null=True)
 
     class Meta:
         verbose_name = "Job Description"
@@ -260,7 +379,7 @@ class OrganizationChart(models.Model):
     version = models.CharField(max_length=50, blank=True, null=True)
     date_issued = models.DateField()
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
-    file = models.FileField(upload_to="qms/org_charts/")
+    file = models.FileField(upload_to=ShardedUploadTo("qms/org_charts"))
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
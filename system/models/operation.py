@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from system.models import Organisation
+from filestore.paths import ShardedUploadTo
 
 User = get_user_model()
 
@@ -18,10 +19,10 @@ class SOP(models.Model):
     title = models.CharField(max_length=255)
     department = models.CharField(max_length=150, choices=[("operations", "Operations"), ("QA", "Quality Assurance")])
     description = models.TextField(blank=True, null=True)
-    file = models.FileField(upload_to="qms/sops/%Y/%m/%d/")
+    file = models.FileField(upload_to=ShardedUploadTo("qms/sops"))
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="created_sops")
     created_at = models.DateTimeField(auto_now_add=True)
-    review_date = models.DateField(blank=True, null=True)
+    review_date = models.DateField(blank=True, null=True, db_index=True)
     is_active = models.BooleanField(default=True)
 
     class Meta:
@@ -47,7 +48,7 @@ class ContractReview(models.Model):
     reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="contract_reviews")
     review_date = models.DateField(default=timezone.now)
     findings = models.TextField(blank=True, null=True)
-    document_reference = models.FileField(upload_to="qms/contract_reviews/%Y/%m/%d/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/contract_reviews"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -98,7 +99,7 @@ class DesignRecord(models.Model):
         choices=[("plan", "Plan"), ("review", "Review"), ("verification", "Verification"), ("validation", "Validation"), ("other", "Other")]
     )
     description = models.TextField(blank=True, null=True)
-    document_file = models.FileField(upload_to="qms/design_records/%Y/%m/%d/")
+    document_file = models.FileField(upload_to=ShardedUploadTo("qms/design_records"))
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="created_design_records")
     created_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True, null=True)
@@ -127,7 +128,7 @@ class SupplierEvaluation(models.Model):
     evaluation_date = models.DateField(default=timezone.now)
     evaluator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="evaluated_suppliers")
     evaluation_result = models.TextField(blank=True, null=True)
-    document_reference = models.FileField(upload_to="qms/supplier_evaluations/%Y/%m/%d/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/supplier_evaluations"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -152,7 +153,7 @@ class ServiceReport(models.Model):
     service_date = models.DateField(default=timezone.now)
     description = models.TextField(blank=True, null=True)
     compliance_with_requirements = models.BooleanField(default=True)
-    document_reference = models.FileField(upload_to="qms/service_reports/%Y/%m/%d/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/service_reports"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -176,7 +177,7 @@ class ProductRelease(models.Model):
     release_date = models.DateField(default=timezone.now)
     approved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="product_approvals")
     description = models.TextField(blank=True, null=True)
-    document_reference = models.FileField(upload_to="qms/product_approvals/%Y/%m/%d/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/product_approvals"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
     status = models.CharField(
         max_length=50,
@@ -212,7 +213,7 @@ class NCRRegister(models.Model):
         choices=[("open", "Open"), ("in_progress", "In Progress"), ("closed", "Closed")],
         default="open"
     )
-    document_reference = models.FileField(upload_to="qms/ncr/%Y/%m/%d/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/ncr"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
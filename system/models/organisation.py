@@ -3,9 +3,17 @@ from django.db import models
 from account.models import CustomUser
 from system.models.modelmixin import TimeStampMixin
 from django.contrib.auth import get_user_model
+from filestore.paths import ShardedUploadTo
 
 User = get_user_model()
 
+
+class OrganisationQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Organisations the user represents or is a member of."""
+        return self.filter(models.Q(representative=user) | models.Q(organisationuser__user=user)).distinct()
+
+
 class Organisation(TimeStampMixin):
 
     class StatusChoices(models.TextChoices):
@@ -28,6 +36,8 @@ class Organisation(TimeStampMixin):
     status = models.CharField(max_length=120, choices=StatusChoices.choices, default=StatusChoices.PENDING)
     notes = models.TextField(null=True, blank=True)
 
+    objects = OrganisationQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name}"
 
@@ -115,7 +125,7 @@ class StakeholderRequirement(TimeStampMixin):
     compliance_method = models.TextField(blank=True, null=True, help_text="How the organization ensures compliance with this requirement.")
     monitoring_method = models.TextField(blank=True, null=True, help_text="How the organization monitors or reviews this requirement.")
     last_review_date = models.DateField(blank=True, null=True)
-    next_review_date = models.DateField(blank=True, null=True)
+    next_review_date = models.DateField(blank=True, null=True, db_index=True)
     responsible_person = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="stakeholder_requirements_responsible")
     status = models.CharField(max_length=50, choices=[
         ("active", "Active"),
@@ -242,7 +252,7 @@ class Document(models.Model):
     )
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    file = models.FileField(upload_to='qms/document/', blank=True, null=True)
+    file = models.FileField(upload_to=ShardedUploadTo("qms/document"), blank=True, null=True)
     url = models.URLField(blank=True, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
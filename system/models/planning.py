@@ -4,6 +4,7 @@ from django.utils import timezone
 from system.models import TimeStampMixin, Organisation
 
 from django.contrib.auth import get_user_model
+from filestore.paths import ShardedUploadTo
 
 User = get_user_model()
 
@@ -17,10 +18,17 @@ class Risk(TimeStampMixin):
     identified_date = models.DateField(default=timezone.now)
     likelihood = models.PositiveSmallIntegerField(help_text="Scale 1 (Low) - 5 (High)")
     impact = models.PositiveSmallIntegerField(help_text="Scale 1 (Low) - 5 (High)")
-    score = models.PositiveSmallIntegerField(blank=True, null=True)
+    score = models.PositiveSmallIntegerField(blank=True, null=True, help_text="likelihood x impact, kept by a database trigger")
     status = models.CharField(max_length=50, default="open", help_text="e.g. open, mitigated, closed")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["organisation", "score"], name="risk_org_score_idx"),
+            models.Index(fields=["score"], name="risk_score_idx"),
+        ]
+
     def save(self, *args, **kwargs):
+        # Mirrors the database trigger so the instance has its score without a refresh
         if self.likelihood and self.impact:
             self.score = self.likelihood * self.impact
         super().save(*args, **kwargs)
@@ -38,10 +46,17 @@ class Opportunity(TimeStampMixin):
     identified_date = models.DateField(default=timezone.now)
     benefit = models.PositiveSmallIntegerField(help_text="Scale 1 (Low) - 5 (High)")
     feasibility = models.PositiveSmallIntegerField(help_text="Scale 1 (Low) - 5 (High)")
-    score = models.PositiveSmallIntegerField(blank=True, null=True)
+    score = models.PositiveSmallIntegerField(blank=True, null=True, help_text="benefit x feasibility, kept by a database trigger")
     status = models.CharField(max_length=50, default="open", help_text="e.g. open, implemented, closed")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["organisation", "score"], name="opportunity_org_score_idx"),
+            models.Index(fields=["score"], name="opportunity_score_idx"),
+        ]
+
     def save(self, *args, **kwargs):
+        # Mirrors the database trigger so the instance has its score without a refresh
         if self.benefit and self.feasibility:
             self.score = self.benefit * self.feasibility
         super().save(*args, **kwargs)
@@ -50,6 +65,41 @@ class Opportunity(TimeStampMixin):
         return f"Opportunity: {self.title} (Score {self.score})"
 
 
+class RiskHistory(models.Model):
+    """
+    Append-only log of a risk's or opportunity's rating. A row is added when
+    the record is created, when likelihood/impact (benefit/feasibility),
+    score or status change, and when it is deleted; the state at any moment
+    is the latest row with valid_from at or before it.
+    """
+
+    class Kind(models.TextChoices):
+        RISK = 'risk', 'Risk'
+        OPPORTUNITY = 'opportunity', 'Opportunity'
+
+    kind = models.CharField(max_length=12, choices=Kind.choices)
+    entity_id = models.BigIntegerField()
+    organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    x = models.PositiveSmallIntegerField(help_text="Likelihood or benefit")
+    y = models.PositiveSmallIntegerField(help_text="Impact or feasibility")
+    score = models.PositiveSmallIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=50)
+    identified_date = models.DateField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+    valid_from = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Risk History"
+        verbose_name_plural = "Risk History"
+        indexes = [
+            models.Index(fields=["kind", "entity_id", "valid_from"], name="risk_history_entity_idx"),
+            models.Index(fields=["kind", "organisation", "valid_from"], name="risk_history_org_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.entity_id} at {self.valid_from:%Y-%m-%d %H:%M}"
+
+
 class RiskOpportunityResponse(models.Model):
     """Plans and actions in response to risks or opportunities."""
     RESPONSE_TYPES = [
@@ -67,7 +117,7 @@ class RiskOpportunityResponse(models.Model):
     response_type = models.CharField(max_length=50, choices=RESPONSE_TYPES)
     description = models.TextField()
     owner = models.ForeignKey("account.CustomUser", on_delete=models.PROTECT, related_name="risk_opportunity_responses")
-    due_date = models.DateField(blank=True, null=True)
+    due_date = models.DateField(blank=True, null=True, db_index=True)
     status = models.CharField(max_length=50, default="open")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -122,7 +172,7 @@ class ChangeControlRecord(models.Model):
     control_date = models.DateField()
     verification = models.TextField(blank=True, null=True, help_text="Describe verification or validation of the change.")
     document_reference = models.CharField(max_length=255, blank=True, null=True)
-    evidence = models.FileField(upload_to="qms/change_evidence/", blank=True, null=True)
+    evidence = models.FileField(upload_to=ShardedUploadTo("qms/change_evidence"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from system.models import Organisation, TimeStampMixin
+from filestore.paths import ShardedUploadTo
 
 User = get_user_model()
 
@@ -27,10 +28,10 @@ class ResourcePlan(TimeStampMixin):
     description = models.TextField(blank=True, null=True)
     responsible = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="resource_plans")
     planned_date = models.DateField(default=timezone.now)
-    review_date = models.DateField(blank=True, null=True)
+    review_date = models.DateField(blank=True, null=True, db_index=True)
     status = models.CharField(max_length=50, default="planned", choices=[("planned", "Planned"), ("provided", "Provided"), ("reviewed", "Reviewed")])
     notes = models.TextField(blank=True, null=True)
-    document_reference = models.FileField(upload_to="qms/resource_plans/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/resource_plans"), blank=True, null=True)
 
     class Meta:
         verbose_name = "Resource Plan"
@@ -55,7 +56,7 @@ class TrainingRecord(TimeStampMixin):
     date_conducted = models.DateField(default=timezone.now)
     effectiveness = models.TextField(blank=True, null=True, help_text="Assessment of training effectiveness")
     trainer = models.CharField(max_length=150, blank=True, null=True)
-    document_reference = models.FileField(upload_to="qms/training_records/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/training_records"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -80,7 +81,7 @@ class AwarenessRecord(TimeStampMixin):
     method = models.CharField(max_length=150, help_text="e.g., Meeting, Email, Poster, Training")
     date = models.DateField(default=timezone.now)
     communicator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="awareness_communicated")
-    document_reference = models.FileField(upload_to="qms/awareness_records/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/awareness_records"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -107,7 +108,7 @@ class CommunicationPlan(TimeStampMixin):
     frequency = models.CharField(max_length=100, blank=True, null=True, help_text="e.g., Weekly, Monthly")
     start_date = models.DateField(default=timezone.now)
     review_date = models.DateField(blank=True, null=True)
-    document_reference = models.FileField(upload_to="qms/communication_plans/", blank=True, null=True)
+    document_reference = models.FileField(upload_to=ShardedUploadTo("qms/communication_plans"), blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -133,7 +134,7 @@ class DocumentRegister(TimeStampMixin):
     issue_date = models.DateField(default=timezone.now)
     revision_date = models.DateField(blank=True, null=True)
     version = models.CharField(max_length=50, blank=True, null=True)
-    file = models.FileField(upload_to="qms/document_registers/")
+    file = models.FileField(upload_to=ShardedUploadTo("qms/document_registers"))
     notes = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -0,0 +1,54 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+
+from system.models.organisation import Organisation
+
+
+class TimelineEvent(models.Model):
+    """
+    Denormalised read model behind the timeline and calendar (see
+    system.timeline). Dated events mirror a date field of their record and
+    are rewritten whenever it is saved; status changes are appended and
+    kept as the record's history.
+    """
+
+    class Kind(models.TextChoices):
+        CREATED = 'created', 'Created'
+        STATUS = 'status', 'Status change'
+        DUE = 'due', 'Due date'
+        REVIEW = 'review', 'Review'
+        COMMUNICATION = 'communication', 'Communication'
+        MILESTONE = 'milestone', 'Milestone'
+
+    organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    date = models.DateField()
+    kind = models.CharField(max_length=15, choices=Kind.choices)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    item = GenericForeignKey("content_type", "object_id")
+    field_name = models.CharField(max_length=100, blank=True, help_text="Date field the event mirrors")
+    title = models.CharField(max_length=255)
+    detail = models.CharField(max_length=255, blank=True)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Timeline Event"
+        verbose_name_plural = "Timeline"
+        ordering = ("-date", "-pk")
+        indexes = [
+            models.Index(fields=["organisation", "date"], name="timeline_org_date_idx"),
+            models.Index(fields=["content_type", "object_id"], name="timeline_object_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.get_kind_display()}: {self.title}"
+
+    def get_admin_url(self):
+        content_type = ContentType.objects.get_for_id(self.content_type_id)
+        try:
+            return reverse(f"admin:{content_type.app_label}_{content_type.model}_change", args=[self.object_id])
+        except NoReverseMatch:
+            return None
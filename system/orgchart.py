@@ -0,0 +1,139 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.html import escape
+
+from system.models.leadership import Role
+
+
+def role_tree(roles):
+    """
+    Nest roles fetched in path order. Each parent comes before its
+    subordinates, so one pass with a pk lookup builds the tree; roles whose
+    manager is in another organisation (or filtered out) start a new root.
+    """
+    nodes, roots = {}, []
+    for role in roles:
+        node = nodes[role.pk] = {
+            "id": role.pk,
+            "title": role.title,
+            "department": role.department.name,
+            "is_active": role.is_active,
+            "depth": role.depth,
+            "children": [],
+        }
+        parent = nodes.get(role.reports_to_id)
+        (parent["children"] if parent else roots).append(node)
+    return roots
+
+
+# Box size and spacing of the generated chart, in SVG user units
+NODE_WIDTH, NODE_HEIGHT = 180, 48
+H_GAP, V_GAP = 16, 40
+MARGIN = 10
+
+VERSION_KEY = "system:orgchart:version:%s"
+
+
+def layout(roots):
+    """
+    Tidy top-down layout: leaves take the next free column left to right and
+    each parent is centred over its first and last child. Sets "x" and "y"
+    (box top-left) on every node and returns the chart's width and height.
+    """
+    next_column, max_depth = 0, 0
+
+    def place(node, level):
+        nonlocal next_column, max_depth
+        max_depth = max(max_depth, level)
+        node["y"] = MARGIN + level * (NODE_HEIGHT + V_GAP)
+        for child in node["children"]:
+            place(child, level + 1)
+        if node["children"]:
+            node["x"] = (node["children"][0]["x"] + node["children"][-1]["x"]) / 2
+        else:
+            node["x"] = MARGIN + next_column * (NODE_WIDTH + H_GAP)
+            next_column += 1
+
+    for root in roots:
+        place(root, 0)
+    width = 2 * MARGIN + max(next_column, 1) * (NODE_WIDTH + H_GAP) - H_GAP
+    height = 2 * MARGIN + (max_depth + 1) * (NODE_HEIGHT + V_GAP) - V_GAP
+    return width, height
+
+
+def _truncate(text, length):
+    return text if len(text) <= length else text[:length - 1] + "…"
+
+
+def render_svg(roots):
+    """Draw laid out role nodes as a standalone SVG document."""
+    width, height = layout(roots)
+    changelist = reverse("admin:system_role_changelist")
+    edges, boxes = [], []
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        x, y = node["x"], node["y"]
+        for child in node["children"]:
+            middle = y + NODE_HEIGHT + V_GAP / 2
+            edges.append(
+                f'<path d="M{x + NODE_WIDTH / 2:g},{y + NODE_HEIGHT:g}V{middle:g}'
+                f'H{child["x"] + NODE_WIDTH / 2:g}V{child["y"]:g}"/>'
+            )
+            stack.append(child)
+        boxes.append(
+            f'<a href="{changelist}{node["id"]}/change/">'
+            f'<g class="role{"" if node["is_active"] else " inactive"}" transform="translate({x:g},{y:g})">'
+            f'<title>{escape(node["title"])} ({escape(node["department"])})</title>'
+            f'<rect width="{NODE_WIDTH}" height="{NODE_HEIGHT}" rx="4"/>'
+            f'<text x="{NODE_WIDTH / 2:g}" y="20">{escape(_truncate(node["title"], 26))}</text>'
+            f'<text class="department" x="{NODE_WIDTH / 2:g}" y="37">{escape(_truncate(node["department"], 30))}</text>'
+            f'</g></a>'
+        )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" class="org-chart" width="{width:g}" height="{height:g}" '
+        f'viewBox="0 0 {width:g} {height:g}">'
+        '<style>'
+        '.edges{fill:none;stroke:#adb5bd;stroke-width:1.5}'
+        '.role rect{fill:#fff;stroke:#007bff;stroke-width:1.5}'
+        '.role.inactive rect{stroke:#ced4da;fill:#f8f9fa}'
+        '.role text{font:13px sans-serif;text-anchor:middle;fill:#212529}'
+        '.role text.department{font-size:11px;fill:#6c757d}'
+        '</style>'
+        f'<g class="edges">{"".join(edges)}</g>{"".join(boxes)}</svg>'
+    )
+
+
+def _version(organisation_id):
+    key = VERSION_KEY % organisation_id
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(organisation_id):
+    key = VERSION_KEY % organisation_id
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def get_chart_svg(organisation):
+    """
+    The organisation's chart through the cache. Role and department saves
+    bump the version; queryset.update() does not, so entries also expire
+    after ORG_CHART_CACHE_TIMEOUT.
+    """
+    key = "system:orgchart:svg:%s:%s" % (organisation.pk, _version(organisation.pk))
+    svg = cache.get(key)
+    if svg is None:
+        svg = render_svg(role_tree(Role.objects.chart(organisation)))
+        cache.set(key, svg, settings.ORG_CHART_CACHE_TIMEOUT)
+    return svg
@@ -0,0 +1,95 @@
+import threading
+
+from django.db import connections, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from system.models.leadership import (
+    AccountabilityAssignment, CommitmentAction, CommitmentObjective, CommitmentReview, CommitmentSummary,
+    LeadershipCommitment,
+)
+
+ACTION_STATUSES = [status for status, _ in CommitmentAction.STATUS_CHOICES]
+
+SUMMARY_FIELDS = [
+    *(f"actions_{status}" for status in ACTION_STATUSES),
+    "actions_total", "actions_overdue", "percent_done", "objectives_active", "accountabilities",
+    "last_review_date", "next_review_date", "refreshed_at",
+]
+
+
+def _count(model, **filters):
+    """Correlated COUNT per commitment; separate subqueries keep the joins from multiplying rows."""
+    counted = (
+        model.objects.filter(commitment=OuterRef("pk"), **filters)
+        .order_by().values("commitment").annotate(count=Count("pk")).values("count")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def with_rollups(queryset, today=None):
+    """Annotate commitments with their progress figures, one query for the lot."""
+    today = today or timezone.localdate()
+    latest_review = CommitmentReview.objects.filter(commitment=OuterRef("pk")).order_by("-review_date", "-pk")
+    return queryset.annotate(
+        **{f"rollup_actions_{status}": _count(CommitmentAction, status=status) for status in ACTION_STATUSES},
+        rollup_actions_overdue=_count(CommitmentAction, due_date__lt=today, status__in=["open", "in_progress", "blocked"]),
+        rollup_objectives_active=_count(CommitmentObjective, is_active=True),
+        rollup_accountabilities=_count(AccountabilityAssignment),
+        rollup_last_review_date=Subquery(latest_review.values("review_date")[:1]),
+        rollup_next_review_date=Subquery(latest_review.values("next_review_date")[:1]),
+    )
+
+
+def refresh(commitment_ids=None, batch_size=500):
+    """Recompute summaries for the given commitments (all when None). Returns how many were written."""
+    commitments = LeadershipCommitment.objects.order_by("pk")
+    if commitment_ids is not None:
+        commitments = commitments.filter(pk__in=commitment_ids)
+    written, last_pk = 0, 0
+    while True:
+        batch = list(with_rollups(commitments.filter(pk__gt=last_pk)).values(
+            "pk", *(f"rollup_{field}" for field in SUMMARY_FIELDS if field not in ("actions_total", "percent_done", "refreshed_at")),
+        )[:batch_size])
+        if not batch:
+            return written
+        last_pk = batch[-1]["pk"]
+        summaries = []
+        for row in batch:
+            values = {key[len("rollup_"):]: value for key, value in row.items() if key.startswith("rollup_")}
+            values["actions_total"] = sum(values[f"actions_{status}"] for status in ACTION_STATUSES)
+            values["percent_done"] = round(100 * values["actions_done"] / values["actions_total"]) if values["actions_total"] else 0
+            summaries.append(CommitmentSummary(commitment_id=row["pk"], **values))
+        # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target and rejects one
+        features = connections[CommitmentSummary.objects.db].features
+        CommitmentSummary.objects.bulk_create(
+            summaries, update_conflicts=True, update_fields=SUMMARY_FIELDS,
+            unique_fields=["commitment"] if features.supports_update_conflicts_with_target else None,
+        )
+        written += len(summaries)
+
+
+# Commitments waiting for a refresh, per thread as each thread has its own connection
+_pending = threading.local()
+
+
+def _refresh_pending():
+    ids = getattr(_pending, "ids", None)
+    if ids:
+        _pending.ids = set()
+        refresh(ids)
+
+
+def schedule_refresh(commitment_id):
+    """
+    Refresh a commitment's summary once the current transaction commits.
+    Ids are collected so saving many inline rows refreshes each commitment
+    once: the first callback to run takes them all and the rest find none.
+    Ids left behind by a rollback are refreshed by the next commit.
+    """
+    if commitment_id:
+        if getattr(_pending, "ids", None) is None:
+            _pending.ids = set()
+        _pending.ids.add(commitment_id)
+        transaction.on_commit(_refresh_pending)
@@ -0,0 +1,138 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from conf.models import Department
+from system import orgchart, timeline
+from system.heatmap import invalidate
+from system.history import history_row, state
+from system.models.leadership import (
+    AccountabilityAssignment, CommitmentAction, CommitmentObjective, CommitmentReview, LeadershipCommitment, Role,
+    move_role_subtree, role_path_segment,
+)
+from system.models.planning import Opportunity, Risk
+from system.rollups import schedule_refresh
+
+
+@receiver(post_save, sender=Risk)
+@receiver(post_delete, sender=Risk)
+def risk_changed(sender, instance, **kwargs):
+    invalidate("risk", instance.organisation_id)
+
+
+@receiver(post_save, sender=Opportunity)
+@receiver(post_delete, sender=Opportunity)
+def opportunity_changed(sender, instance, **kwargs):
+    invalidate("opportunity", instance.organisation_id)
+
+
+@receiver(post_init, sender=Risk)
+@receiver(post_init, sender=Opportunity)
+def remember_rating(sender, instance, **kwargs):
+    # Reading deferred fields would cost a query each; such instances always record on save
+    if not instance.get_deferred_fields():
+        instance._history_state = state(instance)
+
+
+@receiver(post_save, sender=Risk)
+@receiver(post_save, sender=Opportunity)
+def record_rating(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = state(instance)
+    if created or getattr(instance, "_history_state", None) != current:
+        history_row(instance).save()
+    instance._history_state = current
+
+
+@receiver(post_delete, sender=Risk)
+@receiver(post_delete, sender=Opportunity)
+def record_deletion(sender, instance, **kwargs):
+    history_row(instance, deleted=True).save()
+
+
+@receiver(post_save, sender=LeadershipCommitment)
+def commitment_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        schedule_refresh(instance.pk)
+
+
+@receiver(post_save, sender=CommitmentAction)
+@receiver(post_delete, sender=CommitmentAction)
+@receiver(post_save, sender=CommitmentObjective)
+@receiver(post_delete, sender=CommitmentObjective)
+@receiver(post_save, sender=CommitmentReview)
+@receiver(post_delete, sender=CommitmentReview)
+@receiver(post_save, sender=AccountabilityAssignment)
+@receiver(post_delete, sender=AccountabilityAssignment)
+def commitment_part_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_refresh(instance.commitment_id)
+
+
+@receiver(pre_delete, sender=Role)
+def detach_subordinates(sender, instance, **kwargs):
+    # reports_to is SET_NULL, which the collector applies with a plain UPDATE; re-root the subtrees first
+    for child_id, child_path in Role.objects.filter(reports_to=instance).values_list("pk", "path"):
+        if child_path:
+            move_role_subtree(child_path, role_path_segment(child_id))
+
+
+@receiver(post_init, sender=Role)
+def remember_role_organisation(sender, instance, **kwargs):
+    if "organisation_id" not in instance.get_deferred_fields():
+        instance._chart_organisation_id = instance.organisation_id
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def role_changed(sender, instance, **kwargs):
+    # A role moved to another organisation leaves the old chart too
+    for organisation_id in {instance.organisation_id, getattr(instance, "_chart_organisation_id", None)}:
+        if organisation_id:
+            orgchart.invalidate(organisation_id)
+    instance._chart_organisation_id = instance.organisation_id
+
+
+@receiver(post_save, sender=Department)
+def department_changed(sender, instance, **kwargs):
+    # Chart boxes show the department name
+    for organisation_id in Role.objects.filter(department=instance).values_list("organisation_id", flat=True).distinct():
+        if organisation_id:
+            orgchart.invalidate(organisation_id)
+
+
+def remember_timeline_state(sender, instance, **kwargs):
+    source = timeline.source_for(sender)
+    deferred = instance.get_deferred_fields()
+    # Deferred fields would cost a query to read; such instances record no status change
+    # and are treated as moved on save
+    if source.status_field and source.status_field not in deferred:
+        instance._timeline_status = source.status(instance)
+    if deferred.isdisjoint(source.anchors()):
+        instance._timeline_anchor = source.anchor(instance)
+
+
+def timeline_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    source = timeline.source_for(sender)
+    status_change = None
+    if source.status_field and not created and hasattr(instance, "_timeline_status"):
+        if instance._timeline_status != source.status(instance):
+            status_change = (instance._timeline_status, source.status(instance))
+    timeline.record(source, instance, created=created, status_change=status_change)
+    if not created and getattr(instance, "_timeline_anchor", None) != source.anchor(instance):
+        timeline.move(source, instance)
+    if source.status_field:
+        instance._timeline_status = source.status(instance)
+    instance._timeline_anchor = source.anchor(instance)
+
+
+def timeline_deleted(sender, instance, **kwargs):
+    timeline.forget(timeline.source_for(sender), instance)
+
+
+for _source in timeline.SOURCES:
+    post_init.connect(remember_timeline_state, sender=_source.model_label, dispatch_uid=f"timeline-init-{_source.model_label}")
+    post_save.connect(timeline_saved, sender=_source.model_label, dispatch_uid=f"timeline-save-{_source.model_label}")
+    post_delete.connect(timeline_deleted, sender=_source.model_label, dispatch_uid=f"timeline-delete-{_source.model_label}")
@@ -0,0 +1,151 @@
+import hashlib
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+
+from system.models.planning import Risk, RiskOpportunityResponse
+
+PERCENTILES = [50, 75, 90, 95, 99]
+UNTREATED = "untreated"
+
+
+def open_risks(organisation_id):
+    return Risk.objects.filter(organisation_id=organisation_id).exclude(status__iexact="closed")
+
+
+def register_version(organisation_id):
+    """
+    Fingerprint of the organisation's open risks and their responses, in one
+    query each. The sums catch queryset.update(), which leaves updated_at alone.
+    """
+    risks = open_risks(organisation_id).aggregate(
+        count=Count("pk"), changed=Max("updated_at"), likelihood=Sum("likelihood"), impact=Sum("impact"),
+    )
+    responses = RiskOpportunityResponse.objects.filter(risk__in=open_risks(organisation_id)).aggregate(
+        count=Count("pk"), changed=Max("updated_at"),
+    )
+    return hashlib.md5(repr((risks, responses)).encode()).hexdigest()
+
+
+def load_register(organisation_id):
+    """
+    Return (probability, log median loss, category index) arrays and the
+    category names for the organisation's open risks. A risk's category is
+    its strongest response type, or 'untreated'.
+    """
+    effects = settings.RISK_RESPONSE_EFFECTS
+    probabilities = settings.RISK_LIKELIHOOD_PROBABILITIES
+    losses = settings.RISK_IMPACT_LOSSES
+
+    risks = {
+        pk: [probabilities.get(likelihood, 0.0), losses.get(impact, 0.0), UNTREATED]
+        for pk, likelihood, impact in open_risks(organisation_id).values_list("pk", "likelihood", "impact")
+    }
+    # Strongest treatment first so it names the category
+    for risk_id, response_type in (
+            RiskOpportunityResponse.objects.filter(risk_id__in=risks).values_list("risk_id", "response_type")):
+        probability_factor, loss_factor = effects.get(response_type, (1.0, 1.0))
+        risk = risks[risk_id]
+        if risk[2] == UNTREATED or probability_factor * loss_factor < np.prod(effects.get(risk[2], (1.0, 1.0))):
+            risk[2] = response_type
+        risk[0] *= probability_factor
+        risk[1] *= loss_factor
+
+    categories = sorted({risk[2] for risk in risks.values()})
+    index = {name: i for i, name in enumerate(categories)}
+    rows = [risk for risk in risks.values() if risk[0] > 0 and risk[1] > 0]
+    probability = np.array([row[0] for row in rows], dtype=np.float64)
+    log_median = np.log(np.array([row[1] for row in rows], dtype=np.float64))
+    category = np.array([index[row[2]] for row in rows], dtype=np.intp)
+    return probability, log_median, category, categories
+
+
+def binomial_tables(sizes, probabilities):
+    """
+    Cumulative binomial distribution of each class, computed in log space so
+    large classes do not underflow. Sampling by table lookup is several
+    times faster than Generator.binomial for many small draws.
+    """
+    tables = []
+    for n, p in zip(sizes, probabilities):
+        p = min(p, 1 - 1e-12)
+        k = np.arange(n)
+        log_pmf = n * np.log1p(-p) + np.concatenate([[0.0], np.cumsum(np.log((n - k) / (k + 1)) + np.log(p / (1 - p)))])
+        cdf = np.cumsum(np.exp(log_pmf - log_pmf.max()))
+        tables.append(cdf / cdf[-1])
+    return tables
+
+
+def simulate(probability, log_median, category, n_categories, trials, sigma, seed=None, chunk=5000):
+    """
+    Annual loss of a register over `trials` simulated years.
+
+    Risks sharing the same probability, loss and category are simulated as
+    one class: a binomial draw gives how many of them occur in each trial
+    and their combined loss is drawn in one step, so the work grows with
+    trials x distinct classes (at most a few hundred), not with the number
+    of risks. Returns the total
+    loss per trial and the summed loss per category.
+    """
+    rng = np.random.default_rng(seed)
+    classes, sizes = np.unique(
+        np.column_stack([probability, log_median, category]), axis=0, return_counts=True,
+    )
+    class_probability, class_mu, class_category = classes[:, 0], classes[:, 1], classes[:, 2].astype(np.intp)
+    n_classes = len(classes)
+
+    tables = binomial_tables(sizes, class_probability)
+    class_median = np.exp(class_mu)
+    # Mean and variance of one lognormal loss with median 1
+    mean_one = np.exp(sigma ** 2 / 2)
+    var_one = (np.exp(sigma ** 2) - 1) * np.exp(sigma ** 2)
+    totals = np.zeros(trials)
+    by_category = np.zeros(n_categories)
+    for start in range(0, trials, chunk):
+        n = min(chunk, trials - start)
+        uniforms = rng.random((n, n_classes))
+        counts = np.empty((n, n_classes), dtype=np.int64)
+        for j, table in enumerate(tables):
+            counts[:, j] = np.minimum(np.searchsorted(table, uniforms[:, j], side="right"), sizes[j])
+        # The sum of k losses is drawn as one lognormal with the same mean and
+        # variance (Fenton-Wilkinson); exact for k = 1
+        k = np.maximum(counts, 1)
+        s2 = np.log1p(var_one / (k * mean_one ** 2))
+        mu = np.log(k * mean_one) - s2 / 2
+        draws = np.exp(mu + np.sqrt(s2) * rng.standard_normal((n, n_classes)))
+        cell_losses = np.where(counts > 0, draws, 0.0) * class_median
+        totals[start:start + n] = cell_losses.sum(axis=1)
+        by_category += np.bincount(class_category, weights=cell_losses.sum(axis=0), minlength=n_categories)
+    return totals, by_category
+
+
+def run_simulation(organisation_id, trials=None, seed=None):
+    """Exposure distribution for an organisation's open risks, cached per register version."""
+    trials = trials or settings.RISK_SIMULATION_TRIALS
+    key = f"system:simulation:{organisation_id}:{register_version(organisation_id)}:{trials}:{seed}"
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    probability, log_median, category, categories = load_register(organisation_id)
+    if len(probability):
+        totals, by_category = simulate(
+            probability, log_median, category, len(categories), trials, settings.RISK_LOSS_SIGMA, seed=seed,
+        )
+    else:
+        totals, by_category = np.zeros(trials), np.zeros(len(categories))
+    counts, edges = np.histogram(totals, bins=20)
+    result = {
+        "organisation": organisation_id,
+        "risks": int(len(probability)),
+        "trials": trials,
+        "expected_loss": float(totals.mean()),
+        "std_dev": float(totals.std()),
+        "percentiles": {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(totals, PERCENTILES))},
+        "expected_loss_by_category": {name: float(total / trials) for name, total in zip(categories, by_category)},
+        "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+    }
+    cache.set(key, result, settings.RISK_SIMULATION_CACHE_TIMEOUT)
+    return result
@@ -0,0 +1,309 @@
+from datetime import timedelta
+
+from django import forms
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+from system.models.timeline import TimelineEvent
+
+Kind = TimelineEvent.Kind
+
+
+class TimelineSource:
+    """A model feeding the timeline: where its organisation is, which dates it shows and its status field."""
+
+    def __init__(self, model, organisation, dates, status_field=None, select_related=()):
+        self.model_label = model
+        # Lookup paths to the organisation id, the first one set wins
+        self.organisation = (organisation,) if isinstance(organisation, str) else organisation
+        # (date field, kind, label)
+        self.dates = dates
+        self.status_field = status_field
+        # Relations the model's __str__ reads, so describing a batch stays one query
+        self.select_related = select_related
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def has_created_at(self):
+        return any(field.name == "created_at" for field in self.model._meta.concrete_fields)
+
+    def related(self):
+        """select_related() arguments for describing instances without a query each."""
+        through = ("__".join(path.split("__")[:-1]) for path in self.organisation)
+        return (*self.select_related, *(relation for relation in through if relation))
+
+    def organisation_id(self, instance):
+        for path in self.organisation:
+            value = instance
+            for part in path.split("__"):
+                value = getattr(value, part)
+                if value is None:
+                    break
+            if value is not None:
+                return value
+        return None
+
+    def anchors(self):
+        """Attribute names the organisation is read through: the organisation id or a foreign key's id."""
+        return tuple(path.split("__")[0] + ("_id" if "__" in path else "") for path in self.organisation)
+
+    def anchor(self, instance):
+        return tuple(getattr(instance, attname) for attname in self.anchors())
+
+    def status(self, instance):
+        return getattr(instance, self.status_field) if self.status_field else None
+
+    def status_label(self, value):
+        choices = dict(self.model._meta.get_field(self.status_field).flatchoices)
+        return str(choices.get(value, value))
+
+
+SOURCES = [
+    # Leadership
+    TimelineSource("system.LeadershipCommitment", "organisation_id", [
+        ("effective_date", Kind.MILESTONE, "Commitment effective"),
+        ("expiry_date", Kind.DUE, "Commitment expires"),
+    ]),
+    TimelineSource("system.CommitmentAction", "commitment__organisation_id", [
+        ("due_date", Kind.DUE, "Action due"),
+    ], status_field="status"),
+    TimelineSource("system.CommitmentReview", "commitment__organisation_id", [
+        ("review_date", Kind.REVIEW, "Commitment reviewed"),
+        ("next_review_date", Kind.DUE, "Next commitment review"),
+    ], select_related=("commitment",)),
+    TimelineSource("system.CommunicationRecord", "commitment__organisation_id", [
+        ("date", Kind.COMMUNICATION, "Commitment communicated"),
+    ], select_related=("commitment",)),
+    TimelineSource("system.QualityPolicy", "organisation_id", [
+        ("approval_date", Kind.MILESTONE, "Policy approved"),
+        ("effective_date", Kind.MILESTONE, "Policy effective"),
+        ("review_date", Kind.DUE, "Policy review due"),
+    ]),
+    TimelineSource("system.QualityPolicyCommunication", "policy__organisation_id", [
+        ("date", Kind.COMMUNICATION, "Policy communicated"),
+    ], select_related=("policy",)),
+    # Planning
+    TimelineSource("system.Risk", "organisation_id", [
+        ("identified_date", Kind.MILESTONE, "Risk identified"),
+    ], status_field="status"),
+    TimelineSource("system.Opportunity", "organisation_id", [
+        ("identified_date", Kind.MILESTONE, "Opportunity identified"),
+    ], status_field="status"),
+    TimelineSource("system.RiskOpportunityResponse", ("risk__organisation_id", "opportunity__organisation_id"), [
+        ("due_date", Kind.DUE, "Response due"),
+    ], status_field="status"),
+    TimelineSource("system.QMSChange", "organisation_id", [
+        ("planned_date", Kind.DUE, "Change planned"),
+        ("approved_date", Kind.MILESTONE, "Change approved"),
+        ("implemented_date", Kind.MILESTONE, "Change implemented"),
+    ], status_field="status"),
+    # Support
+    TimelineSource("system.ResourcePlan", "organisation_id", [
+        ("planned_date", Kind.MILESTONE, "Resource planned"),
+        ("review_date", Kind.DUE, "Resource plan review due"),
+    ], status_field="status"),
+    TimelineSource("system.TrainingRecord", "organisation_id", [
+        ("date_conducted", Kind.MILESTONE, "Training conducted"),
+    ], select_related=("employee",)),
+    TimelineSource("system.AwarenessRecord", "organisation_id", [
+        ("date", Kind.COMMUNICATION, "Awareness communicated"),
+    ]),
+    TimelineSource("system.CommunicationPlan", "organisation_id", [
+        ("start_date", Kind.COMMUNICATION, "Communication starts"),
+        ("review_date", Kind.DUE, "Communication plan review due"),
+    ]),
+    TimelineSource("system.DocumentRegister", "organisation_id", [
+        ("issue_date", Kind.MILESTONE, "Document issued"),
+        ("revision_date", Kind.DUE, "Document revision due"),
+    ]),
+    # Operation
+    TimelineSource("system.SOP", "organisation_id", [
+        ("review_date", Kind.DUE, "SOP review due"),
+    ]),
+    TimelineSource("system.ContractReview", "organisation_id", [
+        ("review_date", Kind.REVIEW, "Contract reviewed"),
+    ]),
+    TimelineSource("system.DesignProject", "organisation_id", [
+        ("start_date", Kind.MILESTONE, "Design project started"),
+        ("planned_end_date", Kind.DUE, "Design project due"),
+    ], status_field="status"),
+    TimelineSource("system.SupplierEvaluation", "organisation_id", [
+        ("evaluation_date", Kind.REVIEW, "Supplier evaluated"),
+    ]),
+    TimelineSource("system.ServiceReport", "organisation_id", [
+        ("service_date", Kind.MILESTONE, "Service delivered"),
+    ]),
+    TimelineSource("system.ProductRelease", "organisation_id", [
+        ("release_date", Kind.MILESTONE, "Product released"),
+    ], status_field="status"),
+    TimelineSource("system.NCRRegister", "organisation_id", [
+        ("detected_date", Kind.MILESTONE, "Nonconformity detected"),
+    ], status_field="status"),
+]
+
+SOURCE_BY_LABEL = {source.model_label.lower(): source for source in SOURCES}
+
+
+def source_for(model):
+    return SOURCE_BY_LABEL.get(model._meta.label_lower)
+
+
+def _title(instance):
+    return str(instance)[:255]
+
+
+def dated_events(source, instance, content_type=None):
+    """The events mirroring the instance's dates: its creation and every date field that is set."""
+    content_type = content_type or ContentType.objects.get_for_model(source.model)
+    common = {
+        "organisation_id": source.organisation_id(instance), "content_type": content_type,
+        "object_id": instance.pk, "title": _title(instance),
+    }
+    events = []
+    if source.has_created_at and instance.created_at:
+        events.append(TimelineEvent(
+            date=timezone.localdate(instance.created_at), kind=Kind.CREATED, field_name="created_at",
+            detail=f"{source.model._meta.verbose_name.capitalize()} created", **common,
+        ))
+    for field, kind, label in source.dates:
+        value = getattr(instance, field)
+        if value:
+            events.append(TimelineEvent(date=value, kind=kind, field_name=field, detail=label, **common))
+    return events
+
+
+def status_event(source, instance, old, new):
+    return TimelineEvent(
+        organisation_id=source.organisation_id(instance), content_type=ContentType.objects.get_for_model(source.model),
+        object_id=instance.pk, title=_title(instance), date=timezone.localdate(), kind=Kind.STATUS,
+        detail=f"Status: {source.status_label(old)} → {source.status_label(new)}",
+    )
+
+
+def record(source, instance, created=False, status_change=None):
+    """
+    Rewrite the instance's dated events, plus an (old, new) status change
+    when given, in one transaction.
+    """
+    content_type = ContentType.objects.get_for_model(source.model)
+    events = dated_events(source, instance, content_type)
+    if status_change:
+        events.append(status_event(source, instance, *status_change))
+    with transaction.atomic():
+        if not created:
+            TimelineEvent.objects.filter(content_type=content_type, object_id=instance.pk).exclude(kind=Kind.STATUS).delete()
+        TimelineEvent.objects.bulk_create(events)
+
+
+def move(source, instance):
+    """
+    Point the events still filed under the instance's former organisation at
+    its current one: its own status events, which record() keeps, and every
+    event of the sources reading their organisation through it.
+    """
+    content_type = ContentType.objects.get_for_model(source.model)
+    with transaction.atomic():
+        TimelineEvent.objects.filter(content_type=content_type, object_id=instance.pk, kind=Kind.STATUS) \
+            .update(organisation_id=source.organisation_id(instance))
+        for child in SOURCES:
+            for index, path in enumerate(child.organisation):
+                relation, _, rest = path.partition("__")
+                if not rest or child.model._meta.get_field(relation).related_model is not source.model:
+                    continue
+                organisation_id = instance
+                for part in rest.split("__"):
+                    organisation_id = getattr(organisation_id, part) if organisation_id is not None else None
+                rows = child.model._default_manager.filter(**{relation: instance})
+                # Rows with an earlier path set take their organisation from it instead
+                for earlier in child.organisation[:index]:
+                    rows = rows.filter(**{f"{earlier.split('__')[0]}__isnull": True})
+                TimelineEvent.objects.filter(
+                    content_type=ContentType.objects.get_for_model(child.model), object_id__in=rows.values("pk"),
+                ).update(organisation_id=organisation_id)
+
+
+def forget(source, instance):
+    TimelineEvent.objects.filter(content_type=ContentType.objects.get_for_model(source.model), object_id=instance.pk).delete()
+
+
+def rebuild(source, batch_size=500):
+    """
+    Rewrite the dated events of every row of a source, for backfills and
+    changes that bypassed the signals (queryset.update(), raw SQL). Status
+    history cannot be reconstructed and is kept; events of deleted rows are
+    dropped. Returns the number of events written.
+    """
+    model = source.model
+    content_type = ContentType.objects.get_for_model(model)
+    queryset = model._default_manager.select_related(*source.related()).order_by("pk")
+    written, last_pk = 0, 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        events = [event for instance in batch for event in dated_events(source, instance, content_type)]
+        with transaction.atomic():
+            TimelineEvent.objects.filter(content_type=content_type, object_id__in=[instance.pk for instance in batch]) \
+                .exclude(kind=Kind.STATUS).delete()
+            written += len(TimelineEvent.objects.bulk_create(events))
+    orphans = TimelineEvent.objects.filter(content_type=content_type).exclude(
+        object_id__in=model._default_manager.values("pk"),
+    )
+    orphans.delete()
+    return written
+
+
+def events_between(organisation_id, start=None, end=None, kind=None):
+    """An organisation's events, newest first, answered from timeline_org_date_idx."""
+    events = TimelineEvent.objects.filter(organisation_id=organisation_id)
+    if start:
+        events = events.filter(date__gte=start)
+    if end:
+        events = events.filter(date__lte=end)
+    if kind:
+        events = events.filter(kind=kind)
+    return events.order_by("-date", "-pk")
+
+
+def month_range(day):
+    """First and last day of the month containing `day`."""
+    start = day.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+class TimelineFilterForm(forms.Form):
+    """Date range and kind filters shared by the timeline page and the calendar API."""
+    start = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    end = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    kind = forms.ChoiceField(choices=[("", "All events"), *Kind.choices], required=False)
+
+    def clean(self):
+        data = super().clean()
+        if data.get("start") and data.get("end") and data["start"] > data["end"]:
+            raise forms.ValidationError("The start date must not be after the end date.")
+        return data
+
+    def calendar_range(self):
+        """
+        The requested range, closed at the month's end (or opened at its
+        start) when one bound is missing and the current month when both are;
+        None when it exceeds TIMELINE_CALENDAR_MAX_DAYS.
+        """
+        start, end = self.cleaned_data["start"], self.cleaned_data["end"]
+        if start and not end:
+            end = month_range(start)[1]
+        elif end and not start:
+            start = month_range(end)[0]
+        elif not start:
+            start, end = month_range(timezone.localdate())
+        if (end - start).days >= settings.TIMELINE_CALENDAR_MAX_DAYS:
+            return None
+        return start, end
@@ -1,5 +1,6 @@
 from django.urls import path, include
-from system.views import HomeView, OrganisationView, LeadershipView, PlanningView, SupportView
+from system.views import HomeView, OrganisationView, LeadershipView, PlanningView, SupportView, HeatmapView, \
+    OrgChartSvgView, OrgChartView, RiskExposureView, TimelineCalendarView, TimelineView, TrendView
 
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
@@ -7,5 +8,12 @@ urlpatterns = [
     path("leadership", LeadershipView.as_view(), name="leadership-menu"),
     path("planning", PlanningView.as_view(), name="planning-menu"),
     path("support", SupportView.as_view(), name="support-menu"),
-    path("organisation/detail/<int:pk>/", OrganisationView.as_view(), name="organisation-detail")
+    path("organisation/detail/<int:pk>/", OrganisationView.as_view(), name="organisation-detail"),
+    path("heatmap/<str:kind>/", HeatmapView.as_view(), name="heatmap"),
+    path("heatmap/<str:kind>/trend/", TrendView.as_view(), name="heatmap-trend"),
+    path("risk-exposure/", RiskExposureView.as_view(), name="risk-exposure"),
+    path("org-chart/<int:organisation_id>/", OrgChartView.as_view(), name="org-chart"),
+    path("org-chart/<int:organisation_id>/chart.svg", OrgChartSvgView.as_view(), name="org-chart-svg"),
+    path("timeline/<int:organisation_id>/", TimelineView.as_view(), name="timeline"),
+    path("timeline/<int:organisation_id>/calendar/", TimelineCalendarView.as_view(), name="timeline-calendar"),
 ]
\ No newline at end of file
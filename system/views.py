@@ -1,9 +1,19 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.views import View
+from django import forms
+from django.core.exceptions import ValidationError
 from django.contrib import admin, messages
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse, JsonResponse
 from django.views.generic import TemplateView, DetailView
 
-from system.models import Organisation
+from system.heatmap import HEATMAPS, HeatmapFilterForm, get_matrix
+from system.history import trend
+from system.orgchart import get_chart_svg, role_tree
+from system.timeline import TimelineFilterForm, events_between
+from system.models import Organisation, Role
 
 
 class HomeView(TemplateView):
@@ -29,4 +39,145 @@ class OrganisationDetailView(DetailView):
         context = super(OrganisationDetailView, self).get_context_data(**kwargs)
         context['available_apps'] = admin.site.get_app_list(self.request)
         context['title'] = "Home"
-        return context
\ No newline at end of file
+        return context
+
+class HeatmapView(LoginRequiredMixin, View):
+    """5x5 risk or opportunity matrix as JSON, e.g. /heatmap/risk/?organisation=1&status=open."""
+
+    def get(self, request, kind):
+        if kind not in HEATMAPS:
+            raise Http404("Unknown heat map")
+        form = HeatmapFilterForm(request.GET, user=request.user)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        return JsonResponse(get_matrix(kind, **form.matrix_kwargs()))
+
+
+class TrendView(LoginRequiredMixin, View):
+    """Register size and average score at each ?date=, e.g. /heatmap/risk/trend/?organisation=1&date=2024-03-31."""
+
+    def get(self, request, kind):
+        if kind not in HEATMAPS:
+            raise Http404("Unknown heat map")
+        form = HeatmapFilterForm(request.GET, user=request.user)
+        dates = forms.DateField()
+        try:
+            points = sorted(dates.clean(value) for value in request.GET.getlist("date")[:settings.RISK_TREND_MAX_POINTS])
+        except ValidationError as e:
+            return JsonResponse({"errors": {"date": e.messages}}, status=400)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        filters = form.matrix_kwargs()
+        return JsonResponse({"kind": kind, "points": trend(kind, points, filters["organisation_id"], filters["status"])})
+
+
+class OrganisationScopedMixin(LoginRequiredMixin):
+    """Views of one organisation from the URL, limited to the user's organisations."""
+
+    def get_organisation(self):
+        organisations = Organisation.objects.all() if self.request.user.is_superuser else Organisation.objects.for_user(self.request.user)
+        return get_object_or_404(organisations, pk=self.kwargs["organisation_id"])
+
+
+class OrgChartView(OrganisationScopedMixin, TemplateView):
+    """An organisation's reporting lines, built from one query over Role.path; ?format=json for a nested tree."""
+    template_name = "system/org_chart.html"
+
+    def get(self, request, *args, **kwargs):
+        self.organisation = self.get_organisation()
+        if request.GET.get("format") == "json":
+            roles = Role.objects.chart(self.organisation)
+            return JsonResponse({"organisation": self.organisation.pk, "roles": role_tree(roles)})
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # The chart comes from the cache; the table below it only loads one page of roles
+        page_obj = Paginator(Role.objects.chart(self.organisation), settings.ORG_CHART_PAGE_SIZE).get_page(
+            self.request.GET.get("page"),
+        )
+        context.update(admin.site.each_context(self.request))
+        context["organisation"] = self.organisation
+        context["page_obj"] = page_obj
+        context["roles"] = page_obj.object_list
+        context["chart_svg"] = get_chart_svg(self.organisation) if page_obj.paginator.count else ""
+        context["title"] = f"{self.organisation} organisation chart"
+        return context
+
+
+class OrgChartSvgView(OrgChartView):
+    """The generated chart alone, as an SVG document (cached per organisation)."""
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(get_chart_svg(self.get_organisation()), content_type="image/svg+xml")
+
+
+class TimelineView(OrganisationScopedMixin, TemplateView):
+    """An organisation's events across the QMS, newest first, e.g. /timeline/1/?kind=due&start=2024-01-01."""
+    template_name = "system/timeline.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        organisation = self.get_organisation()
+        form = TimelineFilterForm(self.request.GET)
+        filters = form.cleaned_data if form.is_valid() else {}
+        events = events_between(organisation.pk, filters.get("start"), filters.get("end"), filters.get("kind"))
+        page_obj = Paginator(events, settings.TIMELINE_PAGE_SIZE).get_page(self.request.GET.get("page"))
+        query = self.request.GET.copy()
+        query.pop("page", None)
+        context.update(admin.site.each_context(self.request))
+        context.update({
+            "organisation": organisation,
+            "form": form,
+            "page_obj": page_obj,
+            "events": page_obj.object_list,
+            "query": query.urlencode(),
+            "title": f"{organisation} timeline",
+        })
+        return context
+
+
+class TimelineCalendarView(OrganisationScopedMixin, View):
+    """Events of an organisation between ?start= and ?end= (the current month by default), as JSON."""
+
+    def get(self, request, organisation_id):
+        organisation = self.get_organisation()
+        form = TimelineFilterForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        dates = form.calendar_range()
+        if dates is None:
+            message = f"Ask for at most {settings.TIMELINE_CALENDAR_MAX_DAYS} days at a time."
+            return JsonResponse({"errors": {"end": [message]}}, status=400)
+        start, end = dates
+        events = events_between(organisation.pk, start, end, form.cleaned_data["kind"]).order_by("date", "pk")
+        return JsonResponse({
+            "organisation": organisation.pk,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "events": [
+                {
+                    "id": event.pk, "date": event.date.isoformat(), "kind": event.kind, "title": event.title,
+                    "detail": event.detail, "url": event.get_admin_url(),
+                }
+                for event in events
+            ],
+        })
+
+
+class RiskExposureView(LoginRequiredMixin, View):
+    """Monte Carlo annual loss distribution of an organisation's open risks, as JSON."""
+
+    def get(self, request):
+        # NumPy is only needed here, keep it out of the import path of every other view
+        from system.simulation import run_simulation
+
+        form = HeatmapFilterForm(request.GET, user=request.user)
+        if not form.is_valid() or not form.cleaned_data["organisation"]:
+            return JsonResponse({"errors": form.errors or {"organisation": ["This field is required."]}}, status=400)
+        trials = forms.IntegerField(min_value=1, max_value=settings.RISK_SIMULATION_MAX_TRIALS, required=False)
+        try:
+            trials = trials.clean(request.GET.get("trials"))
+        except ValidationError as e:
+            return JsonResponse({"errors": {"trials": e.messages}}, status=400)
+        return JsonResponse(run_simulation(form.cleaned_data["organisation"].pk, trials=trials))